@@ -0,0 +1,74 @@
+"""
+Script checking the capacity needs of the DSO on a data folder with random baselines.
+The capacity needs of all the periods solved at once with the multi-period model are compared
+to the ones of the periods solved separately, both with the in-process HiGHS solver, and to the
+closed-form capacity needs of the radial networks.
+Usage: python checkDsoNeeds.py [data folder] [number of trials]
+"""
+
+import sys, os, random, tempfile, shutil
+
+## Folder of the simulator.
+SIMULATOR_FOLDER=os.path.join(os.path.dirname(os.path.abspath(__file__)),'..','simulator')
+sys.path.insert(0,SIMULATOR_FOLDER)
+
+import src.options as options
+from src.system import System
+
+## Tolerance on the differences between the capacity needs.
+TOLERANCE=1e-6
+
+## Compute the flows and the capacity needs of the DSO.
+# @param system System.
+# @param settings Dictionary "option - value" set before the computation.
+# @return Dictionary "variable - dictionary line - list of values for each period" for the variables f^b and dC.
+def capacityNeeds(system,settings):
+	for option,value in settings.items():
+		setattr(options,option,value)
+	system._dso._capacityNeeds(system.data)
+	personal=system.data.personal[system._dso.name]
+	return dict((variable,dict((l,list(values)) for l,values in personal[variable].items())) for variable in ['f^b','dC'])
+
+## Get the largest difference between two results of capacityNeeds.
+# @param a First result.
+# @param b Second result.
+# @return Largest absolute difference.
+def difference(a,b):
+	return max(abs(x-y) for variable in a for l in a[variable] for x,y in zip(a[variable][l],b[variable][l]))
+
+## Check the capacity needs for random baselines.
+# @param dataFolder Data folder.
+# @param trials Number of random baselines.
+# @return True if all the results are identical up to TOLERANCE.
+def check(dataFolder,trials):
+	system=System(os.path.abspath(dataFolder))
+	system._prepareOperationFolder()
+	system.initializeAgents()
+	data=system.data
+	N,T=data.general['N'],data.general['T']
+
+	rng=random.Random(0)
+	success=True
+	for trial in range(trials):
+		for n in range(N):
+			data.general['p^b'][n]=[rng.uniform(-20,20) for t in range(T)]
+		reference=capacityNeeds(system,{'DSO_WORKERS':0,'RADIAL_FLOWS':False})
+		for name,settings in [('periods solved separately',{'DSO_WORKERS':2,'RADIAL_FLOWS':False}),('closed form',{'DSO_WORKERS':0,'RADIAL_FLOWS':True})]:
+			gap=difference(reference,capacityNeeds(system,settings))
+			print("Trial %s, %s: largest difference %s" % (trial,name,gap))
+			success=success and gap <= TOLERANCE
+	return success
+
+if __name__ == "__main__":
+	dataFolder=sys.argv[1] if len(sys.argv) > 1 else os.path.join(SIMULATOR_FOLDER,'exampleData')
+	trials=int(sys.argv[2]) if len(sys.argv) > 2 else 3
+	options.SOLVER='highs'
+	options.FOLDER=tempfile.mkdtemp()
+	options.PRINT_TO_SCREEN=False
+	os.chdir(SIMULATOR_FOLDER)
+	try:
+		success=check(dataFolder,trials)
+	finally:
+		shutil.rmtree(options.FOLDER,ignore_errors=True)
+	print("Capacity needs identical." if success else "Capacity needs differ.")
+	sys.exit(0 if success else 1)
@@ -24,7 +24,7 @@ def main(argv):
 	maximumIterations=20
 	convergenceTolerance=None
 	try:
-	   	opts, args = getopt.getopt(argv[0:-1],"dlm:o:t:f:",["im=","gamma=","maxiterations=","operationfolder=","cplex"])
+	   	opts, args = getopt.getopt(argv[0:-1],"dlm:o:t:f:",["im=","gamma=","maxiterations=","operationfolder=","cplex","cplexpersistent","scippool","highs","cache=","cachesize=","warmstart","dsoworkers=","noradial","nosensitivities","agentworkers=","ramfs","profile","profilecsv=","fulltrace","consolidatebids"])
 	except getopt.GetoptError as err:
 		tools.log(err)
 		displayHelp()
@@ -44,15 +44,54 @@ def main(argv):
 			options.FOLDER = arg
 		elif opt in ["--cplex"]:
 			options.SOLVER = 'cplex'
+		elif opt in ["--cplexpersistent"]:
+			options.SOLVER = 'cplex'
+			options.CPLEX_PERSISTENT = True
+		elif opt in ["--scippool"]:
+			options.SOLVER = 'scippool'
+		elif opt in ["--highs"]:
+			options.SOLVER = 'highs'
+		elif opt in ["--cache"]:
+			options.CACHE_FOLDER = arg
+		elif opt in ["--cachesize"]:
+			options.CACHE_SIZE = max(1,int(arg))
+		elif opt in ["--warmstart"]:
+			options.WARM_START = True
+		elif opt in ["--dsoworkers"]:
+			options.DSO_WORKERS = max(0,int(arg))
+		elif opt in ["--noradial"]:
+			options.RADIAL_FLOWS = False
+		elif opt in ["--nosensitivities"]:
+			options.LINEAR_OPF_SENSITIVITIES = False
+		elif opt in ["--agentworkers"]:
+			options.AGENT_WORKERS = max(0,int(arg))
+		elif opt in ["--ramfs"]:
+			options.RAMFS = True
+		elif opt in ["--profile"]:
+			options.PROFILING = True
+		elif opt in ["--profilecsv"]:
+			options.PROFILING = True
+			options.PROFILING_CSV = arg
+		elif opt in ["--fulltrace"]:
+			options.FULL_TRACE = True
+		elif opt in ["--consolidatebids"]:
+			options.CONSOLIDATE_BIDS = True
+
+	# Lock file, specific to the given operation folder in copy mode
+	lockFile='lock.lock'
+	if options.COPY:
+		lockFile='%s.lock'%(options.FOLDER)
+
+	# Memory-backed operation folder, the SCIP binary staying next to the given operation folder
+	if options.RAMFS:
+		if options.SCIP_BIN is None:
+			options.SCIP_BIN=os.path.abspath(options.FOLDER+'/../scip')
+		options.FOLDER=tools.memoryFolder(options.RAMFS_ROOT)
 	
 	# Log file
 	options.log=outputSolutionFile+".log"
 	
     # Create and launch system
-	lockFile='lock.lock'
-	if options.COPY:
-		# If copy mode, the lock file is specific to the operation folder.
-		lockFile='%s.lock'%(options.FOLDER)
 	with tools.fileLock(lockFile):
 		tools.cleanLog(options.LOG)
 		system=System(dataFolder=folderPath,maximumIterations=maximumIterations,outputSolutionFile=outputSolutionFile,convergenceTolerance=convergenceTolerance)
@@ -68,7 +107,22 @@ def displayHelp():
 	text += "\t-t X\t\t\t\tSet the numerical tolerance for the convergence to X.\n"
 	text += "\t-f X\t\t\t\tSet X as the operation folder\n"
 	text += "\t-l\t\t\t\t\tPerform linear AC optimal power flows.\n"
-	text += "\t--cplex\t\t\t\tUse the CPLEX solver."
+	text += "\t--cplex\t\t\t\tUse the CPLEX solver.\n"
+	text += "\t--cplexpersistent\tUse a persistent CPLEX session.\n"
+	text += "\t--scippool\t\t\tKeep SCIP processes alive between the solves.\n"
+	text += "\t--highs\t\t\t\tSolve the models with a Python formulation in-process with HiGHS.\n"
+	text += "\t--cache X\t\t\tCache the solutions in the folder X.\n"
+	text += "\t--cachesize X\t\tSet X MB as the maximum size of the solutions cache.\n"
+	text += "\t--warmstart\t\t\tStart SCIP from the previous solution of each agent problem.\n"
+	text += "\t--dsoworkers X\t\tSolve the periods of the DSO needs separately in X concurrent batches.\n"
+	text += "\t--noradial\t\t\tSolve the DSO capacity needs of radial networks with the solver.\n"
+	text += "\t--nosensitivities\tSolve the DSO capacity needs with the linear AC optimal power flows with the solver.\n"
+	text += "\t--agentworkers X\tOptimize the retailers and producers with X concurrent agents.\n"
+	text += "\t--ramfs\t\t\t\tUse a private operation folder in /dev/shm, removed at exit.\n"
+	text += "\t--profile\t\t\tRecord the solves and export their statistics in the output file.\n"
+	text += "\t--profilecsv X\t\tProfile the solves and write one line per solve in the CSV file X.\n"
+	text += "\t--fulltrace\t\t\tKeep a copy of the data of each iteration.\n"
+	text += "\t--consolidatebids\tMerge the single period bids of the same owner, bus, period and prices."
 	tools.log(text,options.LOG,options.PRINT_TO_SCREEN)
 	
 # Starting point from python #   
@@ -1,6 +1,8 @@
 ##@package data
 #@author Sebastien MATHIEU
 
+import numpy
+
 ## Class handling the data of the system.
 class Data:
     
@@ -15,4 +17,83 @@ class Data:
     ## @var personal
     # Dictionary where the key is the id of the user and the value a dictionary of variables.
     # @see Data.general
+
+## Time series of a set of nodes stored in a contiguous NumPy array of shape (number of nodes, T).
+# The series behaves as a dictionary "node - list of values for each period":
+# series[n] is a view of the row of the node such that series[n][t] reads and writes the array.
+class NodalSeries:
+    
+    ## Constructor.
+    # @param nodes List of nodes.
+    # @param T Number of periods.
+    def __init__(self,nodes,T):
+        self.nodes=list(nodes)
+        self.array=numpy.zeros((len(self.nodes),T))
+        self._rows=dict((n,i) for i,n in enumerate(self.nodes))
+    
+    def __getitem__(self,n):
+        return self.array[self._rows[n]]
+    
+    def __setitem__(self,n,values):
+        self.array[self._rows[n]]=values
+    
+    def __contains__(self,n):
+        return n in self._rows
+    
+    def __iter__(self):
+        return iter(self.nodes)
+    
+    def __len__(self):
+        return len(self.nodes)
+    
+    ## Get the nodes.
+    # @return List of nodes.
+    def keys(self):
+        return list(self.nodes)
+    
+    ## Get the series of each node.
+    # @return List of rows.
+    def values(self):
+        return list(self.array)
+    
+    ## Get the pairs (node, series).
+    # @return List of pairs.
+    def items(self):
+        return list(zip(self.nodes,self.array))
+    
+    ## Get the row indices of nodes in the array.
+    # @param nodes List of nodes.
+    # @return List of row indices.
+    def rows(self,nodes):
+        return [self._rows[n] for n in nodes]
+    
+    ## Get a series of the same nodes and periods filled with zeros.
+    # @return Nodal series.
+    def zeros(self):
+        return NodalSeries(self.nodes,self.array.shape[1])
+    
+    ## Sum the series of nodes for each period.
+    # @param nodes List of nodes, all the nodes if None.
+    # @return Array of the sums, equal to the ones of a loop adding the nodes in their order to 0.0.
+    def total(self,nodes=None):
+        rows=self.array if nodes is None else self.array[self.rows(nodes)]
+        return accumulate(numpy.zeros(self.array.shape[1]),rows)
+    
+    ## @var nodes
+    # List of nodes.
+    ## @var array
+    # NumPy array of the values with one row per node.
+    ## @var _rows
+    # Dictionary "node - row index".
+
+## Add rows of values to initial values for each period, one row after the other.
+# The result is identical to the one of a loop "values[t]+=row[t]" over the rows since the additions are sequential,
+# contrary to sum which may use a pairwise summation.
+# @param initial Initial value for each period.
+# @param rows Array of shape (number of rows, number of periods).
+# @return Array of the values for each period.
+def accumulate(initial,rows):
+    initial=numpy.asarray(initial,dtype=float)
+    rows=numpy.asarray(rows,dtype=float).reshape(-1,len(initial))
+    return numpy.add.accumulate(numpy.vstack((initial,rows)),axis=0)[-1]
     
\ No newline at end of file
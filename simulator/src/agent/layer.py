@@ -1,11 +1,15 @@
 ##@package layer
 #@author Sebastien MATHIEU
 
+import threading
+
 ## Layer of the system.
 # List the agents belonging to one layer.
 class Layer:
       ## Total number of layers.
     _layersNumber=0
+    ## Thread-local layer and agent currently acting.
+    _acting=threading.local()
     
     ## Default constructor.
     # @param agentList Initial list of agents in the layer.
@@ -21,7 +25,25 @@ class Layer:
     # @param data Data needed for the action. 
     def act(self, data):
         for a in self._agentList:
-            a.act(data,self)        
+            self.actAgent(a,data)
+    
+    ## Perform the action of one agent of the layer.
+    # During the action, the layer and the agent are given by Layer.acting in the calling thread.
+    # @param agent Agent.
+    # @param data Data needed for the action. 
+    def actAgent(self, agent, data):
+        previous=Layer.acting()
+        Layer._acting.current=(self,agent)
+        try:
+            agent.act(data,self)
+        finally:
+            Layer._acting.current=previous
+    
+    ## Get the layer and the agent acting in the calling thread.
+    # @return Tuple (layer, agent), (None, None) outside of an action.
+    @staticmethod
+    def acting():
+        return getattr(Layer._acting,'current',(None,None))
     
     ## Add an agent to the agent list.
     # @param agent Agent to add. 
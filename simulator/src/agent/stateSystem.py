@@ -2,29 +2,90 @@
 #@author Sebastien MATHIEU
 
 from abc import ABCMeta, abstractmethod
+from collections import deque
 import copy
 
-from .data import Data
+import numpy
+
 from .abstractSystem import AbstractSystem
 
+## Values of the status variables packed in a single array.
+class StatusSnapshot:
+    
+    ## Constructor.
+    # @param keys List of the status variables as pairs (actor, variable), the actor being None for the global status variables.
+    # @param values List of the values of each status variable, a number or a list of numbers.
+    def __init__(self,keys,values):
+        self.keys=keys
+        arrays=[numpy.ravel(numpy.asarray(v,dtype=float)) for v in values]
+        self.offsets=numpy.zeros(len(arrays)+1,dtype=numpy.intp)
+        numpy.cumsum([len(a) for a in arrays],out=self.offsets[1:])
+        self.values=numpy.concatenate(arrays) if len(arrays) > 0 else numpy.zeros(0)
+    
+    ## Get the values of a status variable.
+    # @param i Index of the status variable in keys.
+    # @return Array of values.
+    def variable(self,i):
+        return self.values[self.offsets[i]:self.offsets[i+1]]
+    
+    ## Check if two snapshots pack the same status variables with the same sizes.
+    # @param other Snapshot.
+    # @return True if the values of the snapshots can be compared element by element.
+    def hasLayout(self,other):
+        return self.keys == other.keys and numpy.array_equal(self.offsets,other.offsets)
+    
+    ## @var keys
+    # List of the status variables as pairs (actor, variable), the actor being None for the global status variables.
+    ## @var offsets
+    # Index in values of the first value of each status variable, followed by the number of values.
+    ## @var values
+    # Array of the values of all the status variables.
+
 ## Abstract agent-based state system.
 # A state system is a system where the convergence is based on status variables.
 # The system check global status variable referenced in a list of variable reference in data.general['statusVariables'].
 # The personal status variable of StateAgent are also checked.
+# Only the status variables of the two last iterations are kept, the full data of each iteration being kept only in full trace mode.
+# The status variables of an iteration are packed in a single array such that the convergence check is a single array operation.
 class StateSystem(AbstractSystem):
     __metaclass__ = ABCMeta
     
-    def __init__(self,maximumIterations=1000, accuracy=0.0001):
+    ## Number of snapshots of the status variables kept in the history.
+    historyLength=2
+    
+    ## Constructor.
+    # @param maximumIterations Maximum number of iterations.
+    # @param accuracy Numerical accuracy of the convergence check.
+    # @param fullTrace True to keep a copy of the whole data of each iteration in trace.
+    def __init__(self,maximumIterations=1000, accuracy=0.0001, fullTrace=False):
         AbstractSystem.__init__(self,maximumIterations)
-        self.history=[]
+        self.history=deque(maxlen=StateSystem.historyLength)
+        self.trace=[]
+        self.fullTrace=fullTrace
         self.eps=accuracy
         self._maxDifference=accuracy
+        self.contributions={}
         self.data.general['statusVariables']=[]
     
     def run(self):
-        self.history=[]
+        self.history.clear()
+        self.trace=[]
         return AbstractSystem.run(self)
     
+    ## Copy the status variables of the data.
+    # @return Snapshot of the global and personal status variables.
+    def snapshot(self):
+        keys=[]
+        values=[]
+        for var in self.data.general['statusVariables']:
+            keys.append((None,var))
+            values.append(self.data.general[var])
+        for actor, dico in self.data.personal.items():
+            for v in dico['statusVariables']:
+                keys.append((actor,v))
+                values.append(dico[v])
+        return StatusSnapshot(keys,values)
+    
     ## Get the maximum deviation between two list of values.
     # @param v1 List of values.
     # @param v2 List of values.
@@ -36,23 +97,14 @@ class StateSystem(AbstractSystem):
     ## Define if the system has converged based on the status variables.
     # @return None if the system has not converged. 
     def hasConverged(self):
-        self.history.append(copy.deepcopy(self.data))
+        self.history.append(self.snapshot())
+        if self.fullTrace:
+            # The solver is shared by the copies since it holds processes and locks
+            solver=self.data.general.get('solver')
+            self.trace.append(copy.deepcopy(self.data,{id(solver):solver}))
         if len(self.history) >= 2:
-            self._maxDifference=0 # Maximum difference
-            
-            # Check the global status variables
-            globalStatusVariables=self.history[-1].general['statusVariables']
-            for var in globalStatusVariables:
-                self._maxDifference=max(self._maxDifference, StateSystem.maxDelta(self.history[-1].general[var],self.history[-2].general[var]))
-                
-            # Check the state variables x of each actors
-            personal1=self.history[-1].personal
-            personal2=self.history[-2].personal
-            for actor, dico1 in personal1.items():
-                dico2=personal2[actor]
-                personalStatusVariables=dico1['statusVariables']
-                for v in personalStatusVariables:
-                    self._maxDifference=max(self._maxDifference, StateSystem.maxDelta(dico1[v],dico2[v]))
+            self.contributions=self._differences(self.history[-1],self.history[-2])
+            self._maxDifference=max([0]+list(self.contributions.values())) # Maximum difference
             
             # Check the maximum difference
             if self._maxDifference > self.eps:
@@ -62,10 +114,44 @@ class StateSystem(AbstractSystem):
         
         return AbstractSystem.hasConverged(self)
     
+    ## Get the maximum deviation of each status variable between two snapshots.
+    # @param snapshot1 Snapshot.
+    # @param snapshot2 Previous snapshot.
+    # @return Dictionary "(actor, variable) - maximum deviation", without the status variables which have no value.
+    # The status variables missing from the previous snapshot have an infinite deviation such that they are not converged.
+    def _differences(self,snapshot1,snapshot2):
+        if not snapshot1.hasLayout(snapshot2):
+            # The status variables changed, compare them one by one
+            previous=dict((k,i) for i,k in enumerate(snapshot2.keys))
+            differences={}
+            for i,k in enumerate(snapshot1.keys):
+                if k not in previous:
+                    differences[k]=float('inf')
+                    continue
+                v1=snapshot1.variable(i)
+                v2=snapshot2.variable(previous[k])
+                if min(len(v1),len(v2)) > 0:
+                    differences[k]=float(StateSystem.maxDelta(v1,v2))
+            return differences
+        
+        # Maximum of each segment of the packed deviations
+        deltas=numpy.abs(snapshot1.values-snapshot2.values)
+        nonEmpty=numpy.nonzero(numpy.diff(snapshot1.offsets) > 0)[0]
+        if len(nonEmpty) == 0:
+            return {}
+        maxima=numpy.maximum.reduceat(deltas,snapshot1.offsets[nonEmpty])
+        return dict((snapshot1.keys[i],float(m)) for i,m in zip(nonEmpty,maxima))
+    
     ## @var eps
     # Numerical accuracy.
     ## @var history
-    # History of the data.
+    # Snapshots of the status variables of the last iterations, see snapshot().
+    ## @var contributions
+    # Dictionary "(actor, variable) - maximum deviation" between the two last iterations, the actor being None for the global status variables.
+    ## @var trace
+    # Copy of the data of each iteration if fullTrace is True.
+    ## @var fullTrace
+    # True to keep a copy of the data of each iteration in trace.
     ## @var _maxDifference
     # Maximum difference between the two last iterations
     
\ No newline at end of file
@@ -0,0 +1,164 @@
+##@package bidbook
+# Bids of the flexibility platform stored by columns.
+#@author Sebastien MATHIEU
+
+import numpy
+
+## Book of bids storing each attribute of the bids in a NumPy array, the bids being accessed through views.
+# The owners and the requests of the bids are kept in lists.
+class BidBook:
+	## Number of bids allocated when the book is created.
+	initialCapacity=64
+
+	## Constructor.
+	# @param columns Dictionary "attribute - (shape of the value of a bid, data type)".
+	def __init__(self,columns):
+		self.size=0
+		self.owners=[]
+		self.requests=[]
+		self._columns=dict((a,numpy.zeros((BidBook.initialCapacity,)+shape,dtype=dtype)) for a,(shape,dtype) in columns.items())
+
+	def __len__(self):
+		return self.size
+
+	def __getitem__(self,id):
+		if id < 0 or id >= self.size:
+			raise IndexError('Bid %s not in the book.'%id)
+		return BidView(self,id)
+
+	def __iter__(self):
+		return (BidView(self,id) for id in range(self.size))
+
+	## Get the values of an attribute for all the bids.
+	# @param attribute Attribute.
+	# @return Array view of the values, the first dimension being the bids.
+	def column(self,attribute):
+		return self._columns[attribute][:self.size]
+
+	## Check if an attribute is stored in a column.
+	# @param attribute Attribute.
+	# @return True if the attribute is a column.
+	def hasColumn(self,attribute):
+		return attribute in self._columns
+
+	## Append a bid to the book.
+	# @param bid Bid object with all the attributes of the columns, an owner and a list of requests.
+	# @return Id of the bid in the book.
+	def append(self,bid):
+		if self.size == len(self._columns['bus']):
+			for a,values in self._columns.items():
+				self._columns[a]=numpy.concatenate((values,numpy.zeros_like(values)))
+		id=self.size
+		for a,values in self._columns.items():
+			values[id]=getattr(bid,a)
+		self.owners.append(bid.owner)
+		self.requests.append(bid.requests)
+		self.size+=1
+		return id
+
+	## @var size
+	# Number of bids.
+	## @var owners
+	# Owner of each bid.
+	## @var requests
+	# List of the requests of each bid.
+	## @var _columns
+	# Dictionary "attribute - array of the values of the bids", with spare rows for the next bids.
+
+## Lightweight view of a bid of a book, reading and writing its attributes in the columns of the book.
+class BidView:
+	__slots__=('book','id')
+
+	## Constructor.
+	# @param book Bid book.
+	# @param id Id of the bid in the book.
+	def __init__(self,book,id):
+		object.__setattr__(self,'book',book)
+		object.__setattr__(self,'id',id)
+
+	def __getattr__(self,name):
+		if name == 'owner':
+			return self.book.owners[self.id]
+		elif name == 'requests':
+			return self.book.requests[self.id]
+		elif self.book.hasColumn(name):
+			value=self.book.column(name)[self.id]
+			return value.item() if value.ndim == 0 else value
+		raise AttributeError(name)
+
+	def __setattr__(self,name,value):
+		if name == 'owner':
+			self.book.owners[self.id]=value
+		elif name == 'requests':
+			self.book.requests[self.id]=value
+		elif self.book.hasColumn(name):
+			self.book.column(name)[self.id]=value
+		else:
+			raise AttributeError(name)
+
+	def __eq__(self,other):
+		return isinstance(other,BidView) and self.book is other.book and self.id == other.id
+
+	def __ne__(self,other):
+		return not self == other
+
+	def __hash__(self):
+		return hash((id(self.book),self.id))
+
+	## @var book
+	# Bid book.
+	## @var id
+	# Id of the bid in the book.
+
+## Requests of the bids of a book, the values used by the clearing being stored by columns in their order of arrival.
+class RequestBook:
+	## Constructor.
+	# @param columns List of the attributes of the requests stored in columns.
+	def __init__(self,columns):
+		self.requests=[]
+		self.accepted=[]
+		self._values=dict((c,[]) for c in columns)
+
+	def __len__(self):
+		return len(self.requests)
+
+	## Append a request.
+	# @param request Request.
+	# @param values Dictionary "column - value of the request".
+	def append(self,request,values):
+		self.requests.append(request)
+		self.accepted.append(False)
+		for c,v in values.items():
+			self._values[c].append(v)
+
+	## Get the values of a column.
+	# @param column Column.
+	# @param dtype Data type.
+	# @return Array of the values of the requests.
+	def column(self,column,dtype=float):
+		return numpy.array(self._values[column],dtype=dtype)
+
+	## @var requests
+	# List of the requests in their order of arrival.
+	## @var accepted
+	# True for each accepted request.
+	## @var _values
+	# Dictionary "column - list of the values of the requests".
+
+## Create the book of the single period bids.
+# @return Bid book.
+def spBidBook():
+	columns=dict((a,((),float)) for a in ['reservationCost','activationCost','dsoReservationCost','dsoActivationCost',
+											'reservationBenefits','activationBenefits','min','max','acceptedMin','acceptedMax','modulation'])
+	columns.update({'t':((),int),'bus':((),int),'obligation':((),bool)})
+	return BidBook(columns)
+
+## Create the book of the energy constrained bids.
+# @param T Number of periods.
+# @return Bid book.
+def ecBidBook(T):
+	columns=dict((a,((),float)) for a in ['reservationCost','activationCost','dsoReservationCost','dsoActivationCost',
+											'reservationBenefits','activationBenefits','reservation'])
+	columns.update(dict((a,((T,),float)) for a in ['min','max','modulation']))
+	columns.update({'t':((),int),'bus':((),int),'obligation':((),bool)})
+	return BidBook(columns)
@@ -1,13 +1,17 @@
 ##@package brp
 #@author Sebastien MATHIEU
 
-from . import tools,options,xmlsolution
+import numpy
+
+from . import tools,options,staging,xmlsolution
+from .agent.data import accumulate
 
 ## Balance Responsible Party
 # Needed to inherit from a state agent and have the following properties:
 #	- name
 #	- 'costs' personal data
 #	-  nodes, a list of nodes to consider
+#	-  operationFolder, the folder where the data files are written and the models solved (@see FSU.operationFolder)
 class BRP:
 
 	# Initialization procedure of the internal data.
@@ -43,20 +47,20 @@ class BRP:
 	# @param data Data.
 	def settlement(self,data):
 		T=data.general['T']
-		data.personal[self.name]['P']=[0.0]*T
+		personal=data.personal[self.name]
+		personal['P']=[0.0]*T
 
-		# Consider shedding effect on imbalance
-		for t in range(T):
-				for n in self.nodes:
-					if data.general['z'][n][t]:
-						data.personal[self.name]['I'][t]-=data.personal[self.name]['p^b'][n][t]+data.personal[self.name]['h'][n][t]+data.personal[self.name]['u'][n][t]
-						data.personal[self.name]['p'][n][t]=0
-					else:
-						data.personal[self.name]['P'][t]+=data.personal[self.name]['p'][n][t]
-						if data.personal[self.name]['p'][n][t] > 0:
-							data.general['Total production'][t]+=data.personal[self.name]['p'][n][t]
-						else:
-							data.general['Total consumption'][t]+=data.personal[self.name]['p'][n][t]
+		# Consider shedding effect on imbalance, the nodes being added in their order with -0.0,
+		# the neutral element of the addition, where a node does not contribute
+		nodal=lambda key: numpy.array([personal[key][n] for n in self.nodes],dtype=float).reshape(-1,T)
+		shed=numpy.array([data.general['z'][n] for n in self.nodes],dtype=bool).reshape(-1,T)
+		p=nodal('p')
+		personal['I']=accumulate(personal['I'],numpy.where(shed,-(nodal('p^b')+nodal('h')+nodal('u')),-0.0)).tolist()
+		personal['P']=accumulate(personal['P'],numpy.where(shed,-0.0,p)).tolist()
+		data.general['Total production'][:]=accumulate(data.general['Total production'],numpy.where(~shed & (p > 0),p,-0.0)).tolist()
+		data.general['Total consumption'][:]=accumulate(data.general['Total consumption'],numpy.where(~shed & ~(p > 0),p,-0.0)).tolist()
+		for i,t in zip(*numpy.nonzero(shed)):
+			personal['p'][self.nodes[i]][t]=0
 
 		# Update general imbalance and add imbalance costs to the total costs
 		for t in range(T):
@@ -86,18 +90,17 @@ class BRP:
 		T=data.general['T']
 		solver=data.general['solver']
 		
-		solutionFile="%s.sol"%model
-		solver.solve("%s.zpl"%model, solutionFile,cwd=options.FOLDER)
+		solutionFile="%s-%s.sol"%(model,self.name)
+		solver.solve("%s.zpl"%model, solutionFile,cwd=self.operationFolder)
 		solver.checkFeasible()
 
 		# Parse the solution
 		data.personal[self.name]['I']=solver.variableVectorValue(T, 'I#', 1)
 		data.personal[self.name]['P^r']=solver.variableVectorValue(T, 'P#', 1)
 	
-		for n in self.nodes:
-			data.personal[self.name]['p'][n]=solver.variableVectorValue(T, 'p#%s#'%n, 1)
-			for t in range(T):
-				data.general['p^r'][n][t]+=data.personal[self.name]['p'][n][t]
+		for n,p in zip(self.nodes,solver.variableMatrixValue(self.nodes, T, 'p#', 1)):
+			data.personal[self.name]['p'][n]=p
+			data.general['p^r'][n]+=p
 
 	## Optimize the baseline.
 	# @param model Baseline optimization model file without the extension.
@@ -109,8 +112,8 @@ class BRP:
 		solver=data.general['solver']
 		
 		# Retrieve the solution
-		solutionFile="%s.sol"%model
-		solver.solve("%s.zpl"%model,solutionFile,cwd=options.FOLDER)
+		solutionFile="%s-%s.sol"%(model,self.name)
+		solver.solve("%s.zpl"%model,solutionFile,cwd=self.operationFolder)
 		solver.checkFeasible()
 
 		# Parse the solution
@@ -125,8 +128,7 @@ class BRP:
 				baseline=solver.variableVectorValue(T, 'pa#%s#'%n, 1)
 				# Announcement of the baseline
 				data.personal[self.name]['p^b'][n]=baseline
-				for t in range(T):
-					data.general['p^b'][n][t]+=baseline[t]
+				data.general['p^b'][n]+=baseline
 
 		elif layer.name == "Baseline proposal":
 			data.personal[self.name]['P^p']=solver.variableVectorValue(T, 'Pa#', 1)
@@ -135,8 +137,7 @@ class BRP:
 				baseline=solver.variableVectorValue(T, 'pa#%s#'%n, 1)
 				# Announcement of the baseline
 				data.personal[self.name]['p^p'][n]=baseline
-				for t in range(T):
-					data.general['p^p'][n][t]+=baseline[t]
+				data.general['p^p'][n]+=baseline
 		else:
 			raise Exception('BRP has no action available for layer \"%s\" in the baseline optimization.'%layer)
 			
@@ -147,7 +148,7 @@ class BRP:
 	def writeBaselines(self,baselinesDataFile,data):
 		T=data.general['T'] 
 		Pa=data.personal[self.name]['P^b']
-		with open(options.FOLDER+'/'+baselinesDataFile, 'w') as file:
+		with staging.manager.write(self.operationFolder+'/'+baselinesDataFile) as file:
 			file.write("# T\n%s\n" % T)
 			file.write("# N set\n%s\n" % ",".join(map(str,self.nodes)))
 			file.write("# T, Pb\n")
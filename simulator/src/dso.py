@@ -2,11 +2,17 @@
 #@author Sebastien MATHIEU
 
 import os, csv, math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
 
 from .agent.stateAgent import StateAgent
+from .agent.data import accumulate
 from .fsu import FSU
-from . import tools,options
+from . import tools,options,staging
 from . import xmlsolution
+from .radialnetwork import RadialNetwork
+from .linearopf import LinearOpfSensitivities
 
 ## Distribution System Operator agent.
 class DSO(StateAgent, FSU):
@@ -30,6 +36,8 @@ class DSO(StateAgent, FSU):
 		self._networkDataFile=networkDataFile
 		self._qualifiedFlexibilityFile=qualifiedFlexibilityFile
 		self._gridUsers=[]
+		self._radialNetwork=None
+		self._sensitivities=None
 	
 	def initialize(self, data):
 		StateAgent.initialize(self,data)
@@ -137,7 +145,7 @@ class DSO(StateAgent, FSU):
 			# Optimize
 			# Move the data file to the operation folder
 			if options.COPY:
-				tools.safeCopy(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
+				staging.manager.stage(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
 			else: # Rename instead of copy if debug
 				os.rename(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
 			
@@ -222,7 +230,7 @@ class DSO(StateAgent, FSU):
 			
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
+			staging.manager.stage(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
 		else: # Rename instead of copy if debug
 			os.rename(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
 		
@@ -247,17 +255,13 @@ class DSO(StateAgent, FSU):
 				z=solver.variableVectorValue(self.T, 'z#%s#'%n, 1)
 				data.general['z'][n]=list(map(lambda x: (x > options.EPS),z))
 				
-				activatedFlex=solver.variableVectorValue(self.T, 'r#%s#'%n, 1) # Activated flex
-				for t in range(self.T):
-					if z[t] > options.EPS:
-						data.general['Number of sheddings'][t]+=1
-					else:
-						data.general['p'][n][t]=data.general['p^r'][n][t]
+				activatedFlex=numpy.array(solver.variableVectorValue(self.T, 'r#%s#'%n, 1)) # Activated flex
+				shed=numpy.array(z) > options.EPS
+				data.general['Number of sheddings']=(numpy.array(data.general['Number of sheddings'])+shed).tolist()
+				data.general['p'][n]=numpy.where(shed,data.general['p'][n],data.general['p^r'][n])
 				
-					if activatedFlex[t] > options.EPS:
-						data.general['U+'][n][t]+=activatedFlex[t]
-					elif activatedFlex[t] < -options.EPS:
-						data.general['U-'][n][t]-=activatedFlex[t]
+				data.general['U+'][n]+=numpy.where(activatedFlex > options.EPS,activatedFlex,0.0)
+				data.general['U-'][n]-=numpy.where(activatedFlex < -options.EPS,activatedFlex,0.0)
 
 				# Voltages
 				if options.OPF_METHOD == "linearOpf":
@@ -277,14 +281,12 @@ class DSO(StateAgent, FSU):
 				if max(z) > options.EPS:
 					if options.DEBUG:
 						tools.log("\t\tz[n=%s] : %s" % (n,z), options.LOG, options.PRINT_TO_SCREEN) 
-					for t in range(self.T):
-						if z[t] > options.EPS:
-							data.general['Shed quantities'][t]+=(data.general['p^r'][n][t])*data.general['dt']
+					data.general['Shed quantities']=accumulate(data.general['Shed quantities'],numpy.where(shed,data.general['p^r'][n]*data.general['dt'],-0.0)).tolist()
 				
 				if options.DEBUG:
 					# Flex activation display
 					if max(activatedFlex) > options.EPS:
-						tools.log("\t\tr[n=%s] : %s" % (n,activatedFlex), options.LOG, options.PRINT_TO_SCREEN)
+						tools.log("\t\tr[n=%s] : %s" % (n,activatedFlex.tolist()), options.LOG, options.PRINT_TO_SCREEN)
 			
 			for l in range(1,self.L):
 				data.personal[self.name]['flow violation'][l]=list(map(lambda a:a*data.personal[self.name]['Sb'], solver.variableVectorValue(self.T, 'flowViolation#%s#'%l, 1)))
@@ -316,7 +318,7 @@ class DSO(StateAgent, FSU):
 
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
+			staging.manager.stage(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
 		else: # Rename instead of copy if debug
 			os.rename(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
 		
@@ -350,7 +352,7 @@ class DSO(StateAgent, FSU):
 
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
+			staging.manager.stage(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
 		else: # Rename instead of copy if debug
 			os.rename(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
 		
@@ -368,8 +370,8 @@ class DSO(StateAgent, FSU):
 	def _flexibilityNeedsAndDynamicRanges(self,data):
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
-			tools.safeCopy(self._qualifiedFlexibilityFile,options.FOLDER+'/'+DSO.qualifiedFlexibilityFile)
+			staging.manager.stage(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
+			staging.manager.stage(self._qualifiedFlexibilityFile,options.FOLDER+'/'+DSO.qualifiedFlexibilityFile)
 		else: # Rename instead of copy if debug
 			os.rename(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
 			os.rename(self._qualifiedFlexibilityFile,options.FOLDER+'/'+DSO.qualifiedFlexibilityFile)
@@ -434,33 +436,27 @@ class DSO(StateAgent, FSU):
 	def _flexibilityNeeds(self,data):
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
-			tools.safeCopy(self._qualifiedFlexibilityFile,options.FOLDER+'/'+DSO.qualifiedFlexibilityFile)
+			staging.manager.stage(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
+			staging.manager.stage(self._qualifiedFlexibilityFile,options.FOLDER+'/'+DSO.qualifiedFlexibilityFile)
 		else: # Rename instead of copy if debug
 			os.rename(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
 			os.rename(self._qualifiedFlexibilityFile,options.FOLDER+'/'+DSO.qualifiedFlexibilityFile)
 
 		# Get the flexibility needs for each period
 		try:
-			for t in range(self.T):
-				# Flexibility needs
-				solver=data.general['solver']
-				self._writeAnnouncedBaselines(data,t)
-				model="DSO-flexNeeds.zpl" if options.OPF_METHOD != "linearOpf" else "DSO-linearOpf-flexNeeds.zpl"
-				solutionFile="DSO-flexNeeds-%s.sol" % t
-				solver.solve(model,solutionFile,cwd=options.FOLDER)
-				solver.checkFeasible()
+			model="DSO-flexNeeds.zpl" if options.OPF_METHOD != "linearOpf" else "DSO-linearOpf-flexNeeds.zpl"
+			values=self._periodsValues(data,model,[('rL',self.nodes),('rU',self.nodes)])
 
-				# Parse the solution
+			# Parse the solution
+			for t in range(self.T):
 				data.personal[self.name]['R+'][t]=0.0 # Total requirement of upward flex
 				data.personal[self.name]['R-'][t]=0.0
-				rL=solver.variableVectorValue(self.N-1, 'rL#', 0)
-				rU=solver.variableVectorValue(self.N-1, 'rU#', 0)
-				for n in self.nodes:
-					data.personal[self.name]['R+'][t]+=rU[n]
-					data.personal[self.name]['R-'][t]+=rL[n]
-					data.general['R+'][n][t]+=rU[n]
-					data.general['R-'][n][t]-=rL[n]
+			rU=numpy.array([values['rU'][n] for n in self.nodes],dtype=float).reshape(-1,self.T)
+			rL=numpy.array([values['rL'][n] for n in self.nodes],dtype=float).reshape(-1,self.T)
+			data.personal[self.name]['R+'][:]=accumulate(data.personal[self.name]['R+'],rU).tolist()
+			data.personal[self.name]['R-'][:]=accumulate(data.personal[self.name]['R-'],rL).tolist()
+			data.general['R+'].array[data.general['R+'].rows(self.nodes)]+=rU
+			data.general['R-'].array[data.general['R-'].rows(self.nodes)]-=rL
 
 		finally: # Move back the data file
 			if not options.COPY:
@@ -471,57 +467,126 @@ class DSO(StateAgent, FSU):
 	# @param data Data.
 	# @param proposals If true, uses the proposal baselines instead of the final baselines.
 	def _capacityNeeds(self, data, proposals=False):
-		# Move the data file to the operation folder
-		if options.COPY:
-			tools.safeCopy(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
-			tools.safeCopy(self._qualifiedFlexibilityFile,options.FOLDER+'/'+DSO.qualifiedFlexibilityFile)
-		else: # Rename instead of copy if debug
-			os.rename(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
-			os.rename(self._qualifiedFlexibilityFile,options.FOLDER+'/'+DSO.qualifiedFlexibilityFile)
-
-		try:
-			# Compute the ideal needs for each periods
-			for t in range(self.T):
-				self._writeAnnouncedBaselines(data,t,proposals)
-
-				solver=data.general['solver']
-				model="DSO-capaNeeds.zpl" if options.OPF_METHOD != "linearOpf" else "DSO-linearOpf-capaNeeds.zpl"
-				solutionFile="DSO-capaNeeds-%s.sol" % t
-				solver.solve(model,solutionFile,cwd=options.FOLDER)
-
-				solver.checkFeasible()
+		lines=range(1,self.L+1)
+		values=self._closedFormCapacityNeeds(data,proposals)
+		if values is None:
+			# Move the data file to the operation folder
+			if options.COPY:
+				staging.manager.stage(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
+				staging.manager.stage(self._qualifiedFlexibilityFile,options.FOLDER+'/'+DSO.qualifiedFlexibilityFile)
+			else: # Rename instead of copy if debug
+				os.rename(self._networkDataFile,options.FOLDER+'/'+DSO.networkFile)
+				os.rename(self._qualifiedFlexibilityFile,options.FOLDER+'/'+DSO.qualifiedFlexibilityFile)
 
-				# parse the solution
-				dC=solver.variableVectorValue(self.L, 'dC#', 1)
-				flow=[]
+			try:
+				# Compute the ideal needs for each periods
 				if options.OPF_METHOD == "linearOpf":
-					e=solver.variableVectorValue(self.N, 'e#', 0)
-					f=solver.variableVectorValue(self.N, 'f#', 0)
-					p=solver.variableVectorValue(self.L, 'p#', 1)
-					q=solver.variableVectorValue(self.L, 'q#', 1)
-					v=list(map(lambda a,b: math.sqrt(a*a+b*b), e, f))
-					phi=list(map(lambda a,b: math.atan(b/a)/math.pi*180 if a > options.EPS else 0, e, f))
-					flow=list(map(lambda a,b:math.sqrt(a*a+b*b)*data.personal[self.name]['Sb']*(1 if a >= 0 else -1),p,q))
-
-					for n in self.nodes:
-						data.personal[self.name]['v^b'][n][t]=v[n]*data.personal[self.name]['Vb']
-						data.personal[self.name]['phi^b'][n][t]=phi[n]
+					values=self._periodsValues(data,"DSO-linearOpf-capaNeeds.zpl",[('e',self.nodes),('f',self.nodes),('p',lines),('q',lines),('dC',lines)],proposals)
 				else:
-					flow=solver.variableVectorValue(self.L, 'f#', 1)
+					values=self._periodsValues(data,"DSO-capaNeeds.zpl",[('f',lines),('dC',lines)],proposals)
+			finally: # Move back the data file
+				if not options.COPY:
+					os.rename(options.FOLDER+'/'+DSO.networkFile,self._networkDataFile)
+					os.rename(options.FOLDER+'/'+DSO.qualifiedFlexibilityFile,self._qualifiedFlexibilityFile)
 
-				for l in range(1,self.L+1):
-					data.personal[self.name]['f^b'][l][t]=flow[l-1]
-					data.personal[self.name]['dC'][l][t]=dC[l-1]
+		# parse the solution
+		if options.OPF_METHOD == "linearOpf":
+			for n in self.nodes:
+				e=values['e'][n]
+				f=values['f'][n]
+				data.personal[self.name]['v^b'][n]=list(map(lambda a,b: math.sqrt(a*a+b*b)*data.personal[self.name]['Vb'], e, f))
+				data.personal[self.name]['phi^b'][n]=list(map(lambda a,b: math.atan(b/a)/math.pi*180 if a > options.EPS else 0, e, f))
+
+		for l in lines:
+			if options.OPF_METHOD == "linearOpf":
+				data.personal[self.name]['f^b'][l]=list(map(lambda a,b:math.sqrt(a*a+b*b)*data.personal[self.name]['Sb']*(1 if a >= 0 else -1),values['p'][l],values['q'][l]))
+			else:
+				data.personal[self.name]['f^b'][l]=values['f'][l]
+			data.personal[self.name]['dC'][l]=values['dC'][l]
 
-		finally: # Move back the data file
-			if not options.COPY:
-				os.rename(options.FOLDER+'/'+DSO.networkFile,self._networkDataFile)
-				os.rename(options.FOLDER+'/'+DSO.qualifiedFlexibilityFile,self._qualifiedFlexibilityFile)
+	## Compute the capacity needs of the network without the solver if possible.
+	# The needs of radial networks follow from the sums of the injections below each line with the network flows, see options.RADIAL_FLOWS,
+	# and from the sensitivities of the linear optimal power flow otherwise, see options.LINEAR_OPF_SENSITIVITIES.
+	# @param data Data.
+	# @param proposals If true, uses the proposal baselines instead of the final baselines.
+	# @return Dictionary "variable prefix - dictionary index - list of values for each period" as DSO._periodsValues, None if the solver is required.
+	def _closedFormCapacityNeeds(self,data,proposals=False):
+		injections=data.general['p^b' if not proposals else 'p^p'].array
+		if options.OPF_METHOD == "linearOpf":
+			if not options.LINEAR_OPF_SENSITIVITIES or self._sensitivities is None:
+				return None
+			lines=self._sensitivities.lines
+			arrays=self._sensitivities.capacityNeeds(injections,[data.personal[self.name]['C'][l] for l in lines])
+			indices={'e':self.nodes,'f':self.nodes,'p':lines,'q':lines,'dC':lines}
+		else:
+			if not options.RADIAL_FLOWS or self._radialNetwork is None:
+				return None
+			lines=self._radialNetwork.lines
+			f,dC=self._radialNetwork.capacityNeeds(injections,[data.personal[self.name]['C'][l] for l in lines])
+			arrays={'f':f,'dC':dC}
+			indices={'f':lines,'dC':lines}
+		return dict((prefix,dict(zip(indices[prefix],arrays[prefix].tolist()))) for prefix in indices)
+
+	## Solve a model whose periods are independent and get the values of its variables for each period.
+	# If options.DSO_WORKERS is 0, all the periods are solved at once with the multi-period variant of the model.
+	# Otherwise, each period is prepared in its own subfolder of the operation folder and the periods are split in
+	# options.DSO_WORKERS batches solved concurrently, each batch with Solver.solveMany.
+	# @param data Data.
+	# @param model Single-period model file, the multi-period variant ending with "-multiperiod.zpl".
+	# @param variables List of pairs (variable prefix, indices).
+	# @param proposals If true, uses the proposal baselines instead of the final baselines.
+	# @return Dictionary "variable prefix - dictionary index - list of values for each period".
+	def _periodsValues(self,data,model,variables,proposals=False):
+		name=os.path.splitext(model)[0]
+		values={}
+		for prefix,indices in variables:
+			values[prefix]={}
+
+		if options.DSO_WORKERS <= 0:
+			self._writeAnnouncedBaselinesFull(data,proposals)
+			solver=data.general['solver']
+			solver.solve("%s-multiperiod.zpl"%name,"%s.sol"%name,cwd=options.FOLDER)
+			solver.checkFeasible()
+			for prefix,indices in variables:
+				values[prefix]=dict(zip(indices,solver.variableMatrixValue(indices,self.T,'%s#'%prefix,1)))
+			return values
+
+		# Solve batches of periods, each period in its own folder, with clones of the solver made in this thread
+		def solvePeriods(periods,solver):
+			problems=[]
+			for t in periods:
+				folder='%s/%s-period-%s'%(options.FOLDER,self.name,t+1)
+				if not os.path.isdir(folder):
+					os.makedirs(folder)
+				for file in [model,DSO.networkFile,DSO.qualifiedFlexibilityFile]:
+					staging.manager.stage(options.FOLDER+'/'+file,folder+'/'+file)
+				self._writeAnnouncedBaselines(data,t,proposals,folder)
+				problems.append((model,"%s-%s.sol"%(name,t),folder))
+
+			results=[]
+			for periodSolver in solver.solveMany(problems):
+				periodSolver.checkFeasible()
+				results.append(dict((prefix,[periodSolver.variableValue('%s#%s'%(prefix,i)) for i in indices]) for prefix,indices in variables))
+			return results
+
+		batches=[list(range(w,self.T,options.DSO_WORKERS)) for w in range(min(options.DSO_WORKERS,self.T))]
+		solvers=[data.general['solver'].clone() for periods in batches]
+		periodsValues=[None]*self.T
+		with ThreadPoolExecutor(max_workers=options.DSO_WORKERS) as executor:
+			for periods,results in zip(batches,executor.map(solvePeriods,batches,solvers)):
+				for t,result in zip(periods,results):
+					periodsValues[t]=result
+
+		# Merge in period order
+		for prefix,indices in variables:
+			for k,i in enumerate(indices):
+				values[prefix][i]=[periodsValues[t][prefix][k] for t in range(self.T)]
+		return values
 
 	## Write the access requests data file.
 	# @param data Data.
 	def _writeAccessRequests(self,data):
-		with open(options.FOLDER+'/'+DSO.accessRequestsFile, 'w') as file:
+		with staging.manager.write(options.FOLDER+'/'+DSO.accessRequestsFile) as file:
 			file.write("# N, minCurtail, EPS\n%s, %s, %s\n" % (self.N, 0.1,options.EPS))
 			file.write("# n, g, G\n")
 			for n in self.nodes:
@@ -530,7 +595,7 @@ class DSO(StateAgent, FSU):
 	## Write real baselines for all periods.
 	# @param data Data.
 	def _writeRealBaselinesFull(self,data):
-		with open(options.FOLDER+'/'+DSO.baselinesFullFile, 'w') as file:
+		with staging.manager.write(options.FOLDER+'/'+DSO.baselinesFullFile) as file:
 			file.write("# N, T, gamma, dt, EPS\n%s,%s,%s,%s,%s\n" % (self.N,self.T,data.general['interaction model'].DSOImbalancePriceRatio/100,data.general['dt'],options.EPS))
 			file.write("# n, t, p^r\n")
 			for n in self.nodes:
@@ -541,7 +606,7 @@ class DSO(StateAgent, FSU):
 	# @param data Data.
 	# @param proposals If true, writes the proposal baselines instead of the final baselines.
 	def _writeAnnouncedBaselinesFull(self,data,proposals=False):
-		with open(options.FOLDER+'/'+DSO.baselinesFullFile, 'w') as file:
+		with staging.manager.write(options.FOLDER+'/'+DSO.baselinesFullFile) as file:
 			file.write("# N, t, gamma, dt, EPS\n%s,%s,%s,%s,%s\n" % (self.N,self.T,data.general['interaction model'].DSOImbalancePriceRatio/100,data.general['dt'],options.EPS))
 			file.write("# n, t, p^b\n")
 			for n in self.nodes:
@@ -603,7 +668,7 @@ class DSO(StateAgent, FSU):
 						data.general['dpU^max'][n][t]+=data.personal[a.name]['dpU^max'][n][t]
 
 		# Write the file
-		with open(options.FOLDER+'/'+DSO.baselinesFile, 'w') as file:
+		with staging.manager.write(options.FOLDER+'/'+DSO.baselinesFile) as file:
 			file.write("# N, T, gamma, dt, EPS\n%s,%s,%s,%s,%s\n" % (self.N,self.T,im.DSOImbalancePriceRatio/100,data.general['dt'],options.EPS))
 
 			file.write("# n, t, pL, pU, dpL max, dpU max\n")
@@ -619,8 +684,9 @@ class DSO(StateAgent, FSU):
 	# @param t Period.
 	# @param data Data.
 	# @param proposals If true, writes the proposal baselines instead of the final baselines.
-	def _writeAnnouncedBaselines(self,data,t,proposals=False):
-		with open(options.FOLDER+'/'+DSO.baselinesFile, 'w') as file:
+	# @param folder Folder of the data file, the operation folder by default.
+	def _writeAnnouncedBaselines(self,data,t,proposals=False,folder=None):
+		with staging.manager.write((folder if folder is not None else options.FOLDER)+'/'+DSO.baselinesFile) as file:
 			file.write("# N, T, gamma, dt, EPS\n%s,%s,%s,%s,%s\n" % (self.N,t+1,data.general['interaction model'].DSOImbalancePriceRatio/100,data.general['dt'],options.EPS))
 			file.write("# n, p^b\n")
 			for n in range(self.N):
@@ -645,8 +711,12 @@ class DSO(StateAgent, FSU):
 			data.personal[self.name]['Sb']=float(row[4]) # Base power
 			data.personal[self.name]['Vb']=float(row[5]) # Base voltage
 			
-			# Get line capacities
+			# Get line capacities and the topology
 			data.personal[self.name]['C']={}
+			fromBus={}
+			toBus={}
+			Yg={}
+			Yb={}
 			for l in range(1, self.L+1):
 				row=[options.COMMENT_CHAR]
 				while row[0].startswith(options.COMMENT_CHAR):
@@ -656,10 +726,17 @@ class DSO(StateAgent, FSU):
 				if lineIndex < 1 or lineIndex > self.L:
 					raise Exception('Invalid line index %s in network data file "%s".' % (lineIndex, self._networkDataFile))
 				data.personal[self.name]['C'][lineIndex]=float(row[5])
+				fromBus[lineIndex]=int(row[1])
+				toBus[lineIndex]=int(row[2])
+				Yg[lineIndex]=float(row[3])
+				Yb[lineIndex]=float(row[4])
+			self._radialNetwork=RadialNetwork.fromLines(self.N,fromBus,toBus)
 
 			# Get node voltages bounds
 			data.personal[self.name]['Vmin']=[0.0]*self.N
 			data.personal[self.name]['Vmax']=[0.0]*self.N
+			QPRatio=[0.0]*self.N
+			V0=None
 			for n in self.nodes:
 				row=[options.COMMENT_CHAR]
 				while row[0].startswith(options.COMMENT_CHAR):
@@ -668,6 +745,14 @@ class DSO(StateAgent, FSU):
 				busIndex=int(row[0])
 				data.personal[self.name]['Vmin'][busIndex]=float(row[2])
 				data.personal[self.name]['Vmax'][busIndex]=float(row[3])
+				if len(row) > 4:
+					QPRatio[busIndex]=float(row[4])
+				if V0 is None:
+					V0=float(row[1]) # Voltage of the slack node as read by the models
+
+		# Sensitivities of the linear optimal power flow, computed once per network
+		if options.OPF_METHOD == "linearOpf":
+			self._sensitivities=LinearOpfSensitivities.fromNetwork(self.N,fromBus,toBus,Yg,Yb,data.personal[self.name]['Sb'],data.personal[self.name]['Vb'],V0,QPRatio)
 		   
 	## Get the data to display.
 	# @param data Data.
@@ -703,4 +788,8 @@ class DSO(StateAgent, FSU):
 	# CSV file with information on the qualified flexibility.
 	## @var _gridUsers
 	# List of grid users with access contract.
+	## @var _radialNetwork
+	# Radial network used to compute the capacity needs in closed form, None if the network is meshed.
+	## @var _sensitivities
+	# Sensitivities of the linear optimal power flow to the injections, None if not used.
 	
\ No newline at end of file
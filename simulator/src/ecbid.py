@@ -21,6 +21,9 @@ class ECBidRequest(BidRequest):
 # Sign convention is positive for production.
 # The reference is 0: min <= 0 <= max.
 class ECBid(Bid):
+    ## True for the obligation bids.
+    obligation=False
+    
     ## Constructor.
     # @param T Number of periods.
     # @param id Identification number of the bid.
@@ -49,6 +52,9 @@ class ECBid(Bid):
     
 ## Energy constrained obligation bid.
 class ECObligationBid(ECBid):
+    ## True for the obligation bids.
+    obligation=True
+    
     ## Constructor.
     # @param T Number of periods.
     # @param id Identification number of the bid.
@@ -21,7 +21,7 @@ class EphemeralLayer(Layer):
 	def act(self, data):
 		if self._it < self.iterationLimit:
 			for a in self._agentList:
-				a.act(data,self)   
+				self.actAgent(a,data)
 			self._it+=1
 			
 	##@var iterationLimit
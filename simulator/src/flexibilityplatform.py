@@ -1,13 +1,47 @@
 ##@package flexibilityplatform
 #@author Sebastien MATHIEU
 
-from .ecbid import ECBid, ECBidRequest, ECObligationBid
-from .spbid import SPBid, SPBidRequest, SPObligationBid
+import numpy
+
+from .ecbid import ECBidRequest
+from .spbid import SPBidRequest
 from .agent.agent import Agent
+from .agent.data import NodalSeries, accumulate
+from .bidbook import spBidBook, ecBidBook, RequestBook
 from .dso import DSO
 from .tso import TSO
 from . import options
-from . import tools
+from . import tools,staging
+
+## Accept the requests of each bid in their order while they fit in the remaining volume of the bid.
+# The tests and the accepted volumes are identical to the ones of a loop over the requests: the volume accepted before a request
+# is the sequential sum of the volumes accepted before it. The bids are processed together, the sums of a bid being restarted
+# after each of its rejected requests.
+# @param capacity Volume of each bid.
+# @param accepted Volume already accepted of each bid.
+# @param volumes Matrix of the requested volumes with one row per bid and one column per request.
+# @param valid Matrix with True for the requests, False for the padding of the rows.
+# @param fits Function of the requested volumes and of the remaining volumes of the bids returning True for the requests which fit.
+# @return Tuple (matrix with True for the accepted requests, accepted volume of each bid).
+def greedyAcceptance(capacity,accepted,volumes,valid,fits):
+	U,K=volumes.shape
+	columns=numpy.arange(K)
+	acceptance=numpy.zeros((U,K),dtype=bool)
+	accepted=numpy.array(accepted,dtype=float)
+	start=numpy.zeros(U,dtype=numpy.intp)
+	rows=numpy.arange(U)
+	while len(rows) > 0:
+		candidates=valid[rows] & (columns >= start[rows,None])
+		# Volume accepted before each request if all the candidates were accepted, -0.0 being the neutral element of the addition
+		prefix=numpy.add.accumulate(numpy.hstack((accepted[rows,None],numpy.where(candidates,volumes[rows],-0.0))),axis=1)
+		failures=candidates & ~fits(volumes[rows],capacity[rows,None]-prefix[:,:-1])
+		failed=failures.any(axis=1)
+		first=numpy.where(failed,failures.argmax(axis=1),K)
+		acceptance[rows]|=candidates & (columns < first[:,None])
+		accepted[rows]=prefix[numpy.arange(len(rows)),first]
+		start[rows]=first+1
+		rows=rows[failed & (first+1 < K)]
+	return acceptance,accepted
 	
 ## Platform to centralize the flexibility.
 class FlexibilityPlatform(Agent):
@@ -39,43 +73,39 @@ class FlexibilityPlatform(Agent):
 	## Clean the flexibility platform of all registration.
 	# @param data Data.
 	def clean(self,data):
-		self._ecBids=[]
-		self._spBids=[]
-		
 		N=data.general['N']
 		T=data.general['T']
-		data.general['U+']={} # Activated upward flex
-		data.general['A+']={} # Upward flexibility reserved
-		data.general['S+']={} # Submitted upward flexibility
-		data.general['R+']={} # Requirement of upward flexibility
-		data.general['U-']={} # Activated downward flex
-		data.general['A-']={} # Downward flexibility reserved
-		data.general['S-']={} # Submitted downward flexibility
-		data.general['R-']={} # Requirement of downward flexibility
+		
+		self._ecBids=ecBidBook(T)
+		self._spBids=spBidBook()
+		self._ecRequests=RequestBook(['bid','priority','reservation','dso'])
+		self._spRequests=RequestBook(['bid','priority','w','W','dso'])
+		self._spSubmittedBids=0
+		self._spBidGroups={}
+		self._spBidParts={}
+		self._ecAcceptedRequests={}
+		self._spAcceptedRequests={}
+		self._ecAcceptedBids={}
+		self._spAcceptedBids={}
+		
+		data.general['U+']=NodalSeries(range(N),T) # Activated upward flex
+		data.general['A+']=NodalSeries(range(N),T) # Upward flexibility reserved
+		data.general['S+']=NodalSeries(range(N),T) # Submitted upward flexibility
+		data.general['R+']=NodalSeries(range(N),T) # Requirement of upward flexibility
+		data.general['U-']=NodalSeries(range(N),T) # Activated downward flex
+		data.general['A-']=NodalSeries(range(N),T) # Downward flexibility reserved
+		data.general['S-']=NodalSeries(range(N),T) # Submitted downward flexibility
+		data.general['R-']=NodalSeries(range(N),T) # Requirement of downward flexibility
 		data.general['I']=[0.0]*T # Total imbalance
 		data.general['O']=[0.0]*T # Opposite usage of flexibility
 		data.general['TU']=[0.0]*T # Usage of flexibility
 		data.general['U']=[0.0]*T #  Flexibility effect
 		data.general['Tripped flex.']= [0.0]*T
-		data.general['p^b']={} # Announced baseline
-		data.general['p^r']={} # Real baseline
-		data.general['p']={} # Real production
+		data.general['p^b']=NodalSeries(range(N),T) # Announced baseline
+		data.general['p^r']=NodalSeries(range(N),T) # Real baseline
+		data.general['p']=NodalSeries(range(N),T) # Real production
 		if data.general['interaction model'].accessRestriction.lower() == "dynamicbaseline":
-			data.general['p^p']={}
-		for n in range(N):
-			data.general['U+'][n]=[0.0]*T
-			data.general['A+'][n]=[0.0]*T
-			data.general['S+'][n]=[0.0]*T
-			data.general['R+'][n]=[0.0]*T
-			data.general['U-'][n]=[0.0]*T
-			data.general['A-'][n]=[0.0]*T
-			data.general['S-'][n]=[0.0]*T
-			data.general['R-'][n]=[0.0]*T
-			data.general['p^b'][n]=[0.0]*T
-			data.general['p^r'][n]=[0.0]*T
-			data.general['p'][n]=[0.0]*T
-			if data.general['interaction model'].accessRestriction.lower() == "dynamicbaseline":
-				data.general['p^p'][n]=[0.0]*T
+			data.general['p^p']=NodalSeries(range(N),T)
 			
 	## Activate a single period bid.
 	# @param request Request of the bid.
@@ -115,12 +145,13 @@ class FlexibilityPlatform(Agent):
 	
 	## Function to get the accepted requests from a bid list.
 	# @param bidList List of bids.
+	# @param index Index "buyer - set of the ids of the bids with an accepted request of the buyer".
 	# @param buyer Buyer.
-	# @return List of requests.
-	def _getAcceptedBidRequests(self,bidList,buyer):
+	# @return List of requests, in the order of the bids and of their requests.
+	def _getAcceptedBidRequests(self,bidList,index,buyer):
 		lr=[]
-		for b in bidList:
-			for r in b.requests:
+		for id in sorted(index.get(buyer,())):
+			for r in bidList[id].requests:
 				if r.buyer == buyer and r.acceptation == True:
 					lr.append(r)		
 		return lr
@@ -129,34 +160,40 @@ class FlexibilityPlatform(Agent):
 	# @param buyer Buyer.
 	# @return List of energy constrained bid requests.
 	def getAcceptedECBidRequests(self,buyer):
-		return self._getAcceptedBidRequests(self._ecBids,buyer)
+		return self._getAcceptedBidRequests(self._ecBids,self._ecAcceptedRequests,buyer)
 	
 	# Get the list of single period requests.
 	# @param buyer Buyer.
 	# @return List of single period requests.
 	def getAcceptedSPBidRequests(self,buyer):
-		return self._getAcceptedBidRequests(self._spBids,buyer)
+		return self._getAcceptedBidRequests(self._spBids,self._spAcceptedRequests,buyer)
 	
 	# Get the accepted energy constrained bids of a seller.
 	# @param owner Seller.
 	# @return List of energy constrained bids.
 	def getAcceptedECBids(self,owner):
-		l=[]
-		for b in self._ecBids:
-			if b.owner == owner and b.reservation > options.EPS:
-				l.append(b)
-		return l
+		return [self._ecBids[id] for id in sorted(self._ecAcceptedBids.get(owner,())) if self._ecBids[id].reservation > options.EPS]
 	
 	# Get the accepted single periods of a seller.
+	# The consolidated bids are split back into the bids submitted by the seller.
 	# @param owner Seller.
 	# @return List of single periods.
 	def getAcceptedSPBids(self,owner):
 		l=[]
-		for b in self._spBids:
-			if b.owner == owner and (b.acceptedMax > options.EPS or b.acceptedMin < -options.EPS):
-				l.append(b)
+		for id in sorted(self._spAcceptedBids.get(owner,())):
+			for b in self.splitSPBid(id):
+				if b.acceptedMax > options.EPS or b.acceptedMin < -options.EPS:
+					l.append(b)
 		return l
 	
+	## Add a bid to an index of the accepted bids or requests.
+	# @param index Index "agent - set of bid ids".
+	# @param agent Buyer or owner.
+	# @param id Bid id.
+	@staticmethod
+	def _index(index,agent,id):
+		index.setdefault(agent,set()).add(id)
+	
 	## Register a flexibility service user.
 	# @param fsu Flexibility service user.
 	def registerFSU(self, fsu):
@@ -166,24 +203,35 @@ class FlexibilityPlatform(Agent):
 	# @param b ECBid.
 	# @param data Data.
 	def registerECBid(self,b,data):
-		# Append the bid to the list
-		b.id=len(self._ecBids)
-		self._ecBids.append(b)
+		# Append the bid to the book
+		b.id=self._ecBids.append(b)
 		
 		# Append to the submitted quantities
 		n=b.bus
-		T=data.general['T']
-		for t in range(T):
-			data.general['S+'][n][t]+=b.max[t]
-			data.general['S-'][n][t]+=b.min[t]
+		data.general['S+'][n]+=b.max
+		data.general['S-'][n]+=b.min
 		
 	## Register a single period.
 	# @param b Classic bid.
 	# @param data Data.
 	def registerSPBid(self,b,data):
-		# Append the bid to the list
-		b.id=len(self._spBids)
-		self._spBids.append(b)
+		self._spSubmittedBids+=1
+		if options.CONSOLIDATE_BIDS:
+			# Merge the bid into the bid of the same owner, bus, period and prices
+			key=(b.owner,b.bus,b.t,b.obligation,b.reservationCost,b.activationCost,b.dsoReservationCost,b.dsoActivationCost)
+			id=self._spBidGroups.get(key)
+			if id is None:
+				id=self._spBids.append(b)
+				self._spBidGroups[key]=id
+				self._spBidParts[id]=[]
+			else:
+				self._spBids.column('min')[id]+=b.min
+				self._spBids.column('max')[id]+=b.max
+			self._spBidParts[id].append(b)
+			b.id=id
+		else:
+			# Append the bid to the book
+			b.id=self._spBids.append(b)
 		
 		# Append to the submitted quantities
 		n=b.bus
@@ -191,6 +239,29 @@ class FlexibilityPlatform(Agent):
 		data.general['S+'][n][t]+=b.max
 		data.general['S-'][n][t]+=b.min
 			
+	## Split a single period bid back into the bids consolidated in it.
+	# The accepted volumes, the modulation and the activation benefits are shared in proportion to the volumes of the bids
+	# in each direction, the reservation benefits in proportion to the accepted volumes.
+	# @param id Id of the bid.
+	# @return List of the bids consolidated in the bid with their accepted volumes, modulation and benefits.
+	def splitSPBid(self,id):
+		b=self._spBids[id]
+		parts=self._spBidParts.get(id)
+		if parts is None:
+			return [b]
+		
+		accepted=abs(b.acceptedMin)+b.acceptedMax
+		for p in parts:
+			down=p.min/b.min if b.min < -options.EPS else 0.0
+			up=p.max/b.max if b.max > options.EPS else 0.0
+			activation=up if b.modulation > 0 else down
+			p.acceptedMin=b.acceptedMin*down
+			p.acceptedMax=b.acceptedMax*up
+			p.modulation=b.modulation*activation
+			p.activationBenefits=b.activationBenefits*activation
+			p.reservationBenefits=b.reservationBenefits*(abs(p.acceptedMin)+p.acceptedMax)/accepted if accepted > options.EPS else 0.0
+		return parts
+	
 	## Request a energy constrained bid.
 	# @param bidId Bid Id.
 	# @param buyer Buyer.
@@ -198,7 +269,9 @@ class FlexibilityPlatform(Agent):
 	def requestECBid(self,bidId,buyer,reservation):
 		if reservation > options.EPS:
 			bid=self._ecBids[bidId] 
-			bid.requests.append(ECBidRequest(bid,buyer,reservation))
+			r=ECBidRequest(bid,buyer,reservation)
+			bid.requests.append(r)
+			self._ecRequests.append(r,{'bid':bidId,'priority':FlexibilityPlatform.fsuToPriorityRequest(r),'reservation':reservation,'dso':isinstance(buyer,DSO)})
 			
 			if options.DEBUG:
 				tools.log("\t\t\tECF request of %s in node %s" % (buyer.name,bid.bus), options.LOG, options.PRINT_TO_SCREEN)   
@@ -211,7 +284,9 @@ class FlexibilityPlatform(Agent):
 	def requestSPBid(self,bidId,buyer,w,W):
 		if W > options.EPS or w < options.EPS:
 			bid=self._spBids[bidId] 
-			bid.requests.append(SPBidRequest(bid, buyer,w,W))
+			r=SPBidRequest(bid, buyer,w,W)
+			bid.requests.append(r)
+			self._spRequests.append(r,{'bid':bidId,'priority':FlexibilityPlatform.fsuToPriorityRequest(r),'w':w,'W':W,'dso':isinstance(buyer,DSO)})
 	
 			if options.DEBUG:
 				tools.log("\t\t\tSPF request of %s in node %s and period %s  [%s,%s]" % (buyer.name,bid.bus,bid.t,w,W), options.LOG, options.PRINT_TO_SCREEN)   
@@ -250,22 +325,25 @@ class FlexibilityPlatform(Agent):
 	
 	## Settlement.
 	# Mainly monitor the opposite usage of flexibility.
+	# The nodes are added in their order with -0.0, the neutral element of the addition, where a node does not contribute.
 	def _settlement(self,data):
-		T=data.general['T']
 		N=data.general['N']
+		up=data.general['U+'].array
+		down=data.general['U-'].array
+		tripped=numpy.array([data.general['z'][n] for n in range(N)],dtype=bool).reshape(up.shape)
 		
-		for t in range(T):
-			for n in range(N):
-				if data.general['U+'][n][t] > options.EPS and -data.general['U-'][n][t] > options.EPS:
-					data.general['O'][t]+=min(data.general['U+'][n][t],-data.general['U-'][n][t])
-				data.general['TU'][t]+=data.general['U+'][n][t]-data.general['U-'][n][t]
-				data.general['U'][t]+=data.general['U+'][n][t]+data.general['U-'][n][t]
-				if data.general['z'][n][t]:
-					data.general['Tripped flex.'][t]+=data.general['U+'][n][t]-data.general['U-'][n][t]
+		opposite=(up > options.EPS) & (-down > options.EPS)
+		data.general['O'][:]=accumulate(data.general['O'],numpy.where(opposite,numpy.minimum(up,-down),-0.0)).tolist()
+		data.general['TU'][:]=accumulate(data.general['TU'],up-down).tolist()
+		data.general['U'][:]=accumulate(data.general['U'],up+down).tolist()
+		data.general['Tripped flex.'][:]=accumulate(data.general['Tripped flex.'],numpy.where(tripped,up-down,-0.0)).tolist()
 				
 	## Clearing of the flexibility platform.
 	# @param data Data.
 	def _clearing(self,data): 
+		if options.CONSOLIDATE_BIDS and options.DEBUG:
+			tools.log("\tSingle period bids: %s submitted, %s after consolidation." % (self._spSubmittedBids,self.spBidsCount()), options.LOG, options.PRINT_TO_SCREEN)
+		
 		self._FSUs.sort(key=FlexibilityPlatform.fsuToPriority)
 		
 		for fsu in self._FSUs:
@@ -284,58 +362,10 @@ class FlexibilityPlatform(Agent):
 			fsu.flexibilityEvaluation(data)
 			
 			# Clear single periods
-			for b in self._spBids:
-				# Sort the requests
-				b.requests.sort(key=FlexibilityPlatform.fsuToPriorityRequest)
-				
-				for r in b.requests:
-					if not r.acceptation:
-						# Downward
-						if r.w+options.EPS >= b.min-b.acceptedMin:
-							r.aw=r.w
-							b.acceptedMin+=r.w
-							data.general['A-'][b.bus][b.t]+=r.w
-							r.acceptation=True
-							
-							if isinstance(r.buyer,DSO):
-								b.reservationBenefits+=b.dsoReservationCost*r.w
-							else:
-								b.reservationBenefits+=b.reservationCost*r.w
-							
-						# Upward
-						if r.W-options.EPS <= b.max-b.acceptedMax:
-							r.aW=r.W
-							b.acceptedMax+=r.W
-							data.general['A+'][b.bus][b.t]+=r.W
-							r.acceptation=True
-							if isinstance(r.buyer,DSO):
-								b.reservationBenefits+=b.dsoReservationCost*r.W
-							else:
-								b.reservationBenefits+=b.reservationCost*r.W
-							
-			# Clear energy constrained bids	   
-			for b in self._ecBids:
-				if b.reservation < options.EPS:
-					# Sort the requests
-					b.requests.sort(key=FlexibilityPlatform.fsuToPriorityRequest)
-					
-					# Take the first request
-					if len(b.requests) > 0:
-						r=b.requests[0]
-						b.reservation=r.reservation
-						if r.reservation > options.EPS:
-							r.acceptation=True
-						if isinstance(r.buyer,DSO):
-							b.reservationBenefits=b.dsoReservationCost
-						else:
-							b.reservationBenefits=b.reservationCost
-						
-						# Append to the accepted quantities
-						n=b.bus
-						T=data.general['T']
-						for t in range(T):
-							data.general['A+'][n][t]+=b.max[t]
-							data.general['A-'][n][t]+=b.min[t]
+			self._clearSPBids(data)
+			
+			# Clear energy constrained bids
+			self._clearECBids(data)
 				 
 		# Display quantities
 		if options.DEBUG:
@@ -343,28 +373,130 @@ class FlexibilityPlatform(Agent):
 			for n in range(N):
 				if sum(data.general['S+'][n])+sum(data.general['S-'][n]) > options.EPS:
 					tools.log("\t\tNode %s :" % n, options.LOG, options.PRINT_TO_SCREEN)
-					tools.log("\t\t\tA+ : %s" % (data.general['A+'][n]), options.LOG, options.PRINT_TO_SCREEN)	
-					tools.log("\t\t\tS+ : %s" % (data.general['S+'][n]), options.LOG, options.PRINT_TO_SCREEN)	
-					tools.log("\t\t\tA- : %s" % (data.general['A-'][n]), options.LOG, options.PRINT_TO_SCREEN)	
-					tools.log("\t\t\tS- : %s" % (data.general['S-'][n]), options.LOG, options.PRINT_TO_SCREEN)	   
+					tools.log("\t\t\tA+ : %s" % (data.general['A+'][n].tolist()), options.LOG, options.PRINT_TO_SCREEN)	
+					tools.log("\t\t\tS+ : %s" % (data.general['S+'][n].tolist()), options.LOG, options.PRINT_TO_SCREEN)	
+					tools.log("\t\t\tA- : %s" % (data.general['A-'][n].tolist()), options.LOG, options.PRINT_TO_SCREEN)	
+					tools.log("\t\t\tS- : %s" % (data.general['S-'][n].tolist()), options.LOG, options.PRINT_TO_SCREEN)	   
+	
+	## Clear the pending requests of the single periods.
+	# The requests of each bid are considered by priority and arrival. Their downward and upward volumes are accepted
+	# while they fit in the remaining volumes of the bid, see greedyAcceptance.
+	# @param data Data.
+	def _clearSPBids(self,data):
+		book=self._spBids
+		requests=self._spRequests
+		pending=numpy.nonzero(~numpy.array(requests.accepted,dtype=bool))[0]
+		if len(pending) == 0:
+			return
+		
+		# Matrices of the requests with one row per bid, the requests being sorted by bid, priority and arrival
+		bidIds=requests.column('bid',int)
+		pending=pending[numpy.lexsort((pending,requests.column('priority',int)[pending],bidIds[pending]))]
+		bids,first,counts=numpy.unique(bidIds[pending],return_index=True,return_counts=True)
+		U,K=len(bids),counts.max()
+		rows=numpy.repeat(numpy.arange(U),counts)
+		ranks=numpy.arange(len(pending))-numpy.repeat(first,counts)
+		valid=numpy.zeros((U,K),dtype=bool)
+		valid[rows,ranks]=True
+		w,W,dso=numpy.zeros((U,K)),numpy.zeros((U,K)),numpy.zeros((U,K),dtype=bool)
+		w[rows,ranks]=requests.column('w')[pending]
+		W[rows,ranks]=requests.column('W')[pending]
+		dso[rows,ranks]=requests.column('dso',bool)[pending]
+		
+		# Downward and upward acceptances
+		down,acceptedMin=greedyAcceptance(book.column('min')[bids],book.column('acceptedMin')[bids],w,valid,lambda v,remaining: v+options.EPS >= remaining)
+		up,acceptedMax=greedyAcceptance(book.column('max')[bids],book.column('acceptedMax')[bids],W,valid,lambda v,remaining: v-options.EPS <= remaining)
+		book.column('acceptedMin')[bids]=acceptedMin
+		book.column('acceptedMax')[bids]=acceptedMax
+		
+		# Reservation benefits summed in the order of the requests, downward before upward
+		costs=numpy.where(dso,book.column('dsoReservationCost')[bids,None],book.column('reservationCost')[bids,None])
+		benefits=numpy.empty((U,2*K+1))
+		benefits[:,0]=book.column('reservationBenefits')[bids]
+		benefits[:,1::2]=numpy.where(down,costs*w,-0.0)
+		benefits[:,2::2]=numpy.where(up,costs*W,-0.0)
+		book.column('reservationBenefits')[bids]=numpy.add.accumulate(benefits,axis=1)[:,-1]
+		
+		# Accepted quantities, added in the order of the bids and of their requests
+		down,up=down[rows,ranks],up[rows,ranks]
+		buses=book.column('bus')[bidIds[pending]]
+		periods=book.column('t')[bidIds[pending]]
+		for key,accepted,volumes in [('A-',down,w[rows,ranks]),('A+',up,W[rows,ranks])]:
+			series=data.general[key]
+			numpy.add.at(series.array,(numpy.array(series.rows(buses[accepted].tolist()),dtype=int),periods[accepted]),volumes[accepted])
+		
+		# Accepted requests
+		for i,d,u in zip(pending.tolist(),down.tolist(),up.tolist()):
+			if d or u:
+				r=requests.requests[i]
+				if d:
+					r.aw=r.w
+				if u:
+					r.aW=r.W
+				r.acceptation=True
+				requests.accepted[i]=True
+				FlexibilityPlatform._index(self._spAcceptedRequests,r.buyer,r.bid.id)
+		for id,m,M in zip(bids.tolist(),acceptedMin.tolist(),acceptedMax.tolist()):
+			if M > options.EPS or m < -options.EPS:
+				FlexibilityPlatform._index(self._spAcceptedBids,book.owners[id],id)
+			if len(book.requests[id]) > 1:
+				book.requests[id].sort(key=FlexibilityPlatform.fsuToPriorityRequest)
+	
+	## Clear the energy constrained bids which are not reserved.
+	# Each of these bids is reserved by its first request by priority and arrival.
+	# @param data Data.
+	def _clearECBids(self,data):
+		book=self._ecBids
+		requests=self._ecRequests
+		if len(requests) == 0:
+			return
+		
+		# First request of each bid
+		bidIds=requests.column('bid',int)
+		order=numpy.lexsort((numpy.arange(len(requests)),requests.column('priority',int),bidIds))
+		bids,first=numpy.unique(bidIds[order],return_index=True)
+		chosen=order[first]
+		free=book.column('reservation')[bids] < options.EPS
+		bids,chosen=bids[free],chosen[free]
+		if len(bids) == 0:
+			return
+		
+		reservation=requests.column('reservation')[chosen]
+		book.column('reservation')[bids]=reservation
+		book.column('reservationBenefits')[bids]=numpy.where(requests.column('dso',bool)[chosen],book.column('dsoReservationCost')[bids],book.column('reservationCost')[bids])
+		
+		# Accepted quantities, added in the order of the bids
+		buses=book.column('bus')[bids].tolist()
+		for key,attribute in [('A+','max'),('A-','min')]:
+			series=data.general[key]
+			numpy.add.at(series.array,series.rows(buses),book.column(attribute)[bids])
+		
+		# Accepted requests
+		for id,i,v in zip(bids.tolist(),chosen.tolist(),reservation.tolist()):
+			r=requests.requests[i]
+			if v > options.EPS:
+				r.acceptation=True
+				requests.accepted[i]=True
+				FlexibilityPlatform._index(self._ecAcceptedRequests,r.buyer,id)
+				FlexibilityPlatform._index(self._ecAcceptedBids,book.owners[id],id)
+			if len(book.requests[id]) > 1:
+				book.requests[id].sort(key=FlexibilityPlatform.fsuToPriorityRequest)
 	
 	## Write the registered single periods to the single periods data file.
 	# @param data Data.
 	# @param dsoCosts Consider DSO costs instead of the normal one. Default: False.
 	# @param allBids If false, write only obligation bids. Default : True
 	def _writeRegisteredSPBids(self,data,dsoCosts=False,allBids=True):
-		with open(options.FOLDER+'/'+FlexibilityPlatform.spBidsDataFile, 'w') as file:
+		with staging.manager.write(options.FOLDER+'/'+FlexibilityPlatform.spBidsDataFile) as file:
 			T=data.general['T']
-			B=len(self._spBids)
+			book=self._spBids
+			B=len(book)
 			file.write("# B, T\n%s,%s\n" % (B+1,T))
 			file.write("# b, n, t, pi^r, pi^a, m, M\n")
-			for b in self._spBids:
-				if not allBids and not isinstance(b, SPObligationBid):
-					file.write("%s,%s,%s,%s,%s,%s,%s\n" % (b.id,b.bus,b.t+1,options.INF,0,0,0))
-				elif dsoCosts:
-					file.write("%s,%s,%s,%s,%s,%s,%s\n" % (b.id,b.bus,b.t+1,b.dsoReservationCost,b.dsoActivationCost,min(b.min-b.acceptedMin,0),max(b.max-b.acceptedMax,0)))
-				else:
-					file.write("%s,%s,%s,%s,%s,%s,%s\n" % (b.id,b.bus,b.t+1,b.reservationCost,b.activationCost,min(b.min-b.acceptedMin,0),max(b.max-b.acceptedMax,0)))
+			costs=['dsoReservationCost','dsoActivationCost'] if dsoCosts else ['reservationCost','activationCost']
+			columns=[book.column(a).tolist() for a in ['bus','t','obligation']+costs+['min','acceptedMin','max','acceptedMax']]
+			file.write("".join("%s,%s,%s,%s,%s,%s,%s\n" % ((id,n,t+1,options.INF,0,0,0) if not allBids and not obligation else (id,n,t+1,rc,ac,min(m-am,0),max(M-aM,0)))
+							   for id,n,t,obligation,rc,ac,m,am,M,aM in zip(range(B),*columns)))
 			file.write("%s,%s,%s,%s,%s,%s,%s\n" % (B,0,1,options.INF,0,0,0))
 			
 	## Write the registered energy constrained bids to the flexible loads data file.
@@ -372,27 +504,26 @@ class FlexibilityPlatform(Agent):
 	# @param dsoCosts Consider DSO costs instead of the normal one. Default: False.
 	# @param allBids If false, write only obligation bids. Default : True
 	def _writeRegisteredECBids(self,data,dsoCosts=False,allBids=True):
-		with open(options.FOLDER+'/'+FlexibilityPlatform.ecBidsDataFile, 'w') as file:
+		with staging.manager.write(options.FOLDER+'/'+FlexibilityPlatform.ecBidsDataFile) as file:
 			T=data.general['T']
-			B=len(self._ecBids)
+			book=self._ecBids
+			B=len(book)
 			file.write("# B, T\n%s,%s\n" % (B+1,T))
 			file.write("# b, n, pi^r, pi^a\n")
-			for b in self._ecBids:
-				if b.reservation > options.EPS or (not allBids and not isinstance(b, ECObligationBid)):
-					file.write("%s,%s,%s,%s\n" % (b.id,b.bus,options.INF,0))
-				elif dsoCosts:
-					file.write("%s,%s,%s,%s\n" % (b.id,b.bus,b.dsoReservationCost, b.dsoActivationCost))
-				else:
-					file.write("%s,%s,%s,%s\n" % (b.id,b.bus,b.reservationCost, b.activationCost))
+			costs=['dsoReservationCost','dsoActivationCost'] if dsoCosts else ['reservationCost','activationCost']
+			columns=[book.column(a).tolist() for a in ['bus','reservation','obligation']+costs]
+			file.write("".join("%s,%s,%s,%s\n" % ((id,n,options.INF,0) if reservation > options.EPS or (not allBids and not obligation) else (id,n,rc,ac))
+							   for id,n,reservation,obligation,rc,ac in zip(range(B),*columns)))
 			file.write("%s,%s,%s,%s\n" % (B,0,options.INF,0)) # Dummy bid
 			
 			file.write("# b, t, m, M\n")
-			for b in self._ecBids:
-				for t in range(T):
-					if allBids:
-						file.write("%s,%s,%s,%s\n" % (b.id,t+1,min(b.min[t]*(1-b.reservation),0),max(b.max[t]*(1-b.reservation),0)))
-					else:
-						file.write("%s,%s,%s,%s\n" % (b.id,t+1,0,0))
+			if allBids:
+				remaining=(1-book.column('reservation')).reshape(-1,1)
+				file.write("".join("%s,%s,%s,%s\n" % (id,t+1,min(m,0),max(M,0))
+								   for id,(mins,maxs) in enumerate(zip((book.column('min')*remaining).tolist(),(book.column('max')*remaining).tolist()))
+								   for t,(m,M) in enumerate(zip(mins,maxs))))
+			else:
+				file.write("".join("%s,%s,%s,%s\n" % (id,t+1,0,0) for id in range(B) for t in range(T)))
 			# Dummy bid
 			for t in range(T):
 				file.write("%s,%s,%s,%s\n" % (B,t+1,0,0))
@@ -401,6 +532,24 @@ class FlexibilityPlatform(Agent):
 	# List of registered energy constrained bids.
 	## @var _spBids
 	# List of registered single periods.
+	## @var _ecRequests
+	# Requests of the energy constrained bids.
+	## @var _spRequests
+	# Requests of the single periods.
+	## @var _spSubmittedBids
+	# Number of single periods submitted, before their consolidation.
+	## @var _spBidGroups
+	# Dictionary "(owner, bus, period, obligation, costs) - id of the consolidated single period" if the bids are consolidated.
+	## @var _spBidParts
+	# Dictionary "id - list of the single periods consolidated in the bid" if the bids are consolidated.
+	## @var _ecAcceptedRequests
+	# Dictionary "buyer - set of the ids of the energy constrained bids with an accepted request of the buyer".
+	## @var _spAcceptedRequests
+	# Dictionary "buyer - set of the ids of the single periods with an accepted request of the buyer".
+	## @var _ecAcceptedBids
+	# Dictionary "owner - set of the ids of the reserved energy constrained bids of the owner".
+	## @var _spAcceptedBids
+	# Dictionary "owner - set of the ids of the single periods of the owner with an accepted volume".
 	## @var _FSUs
 	# List of flexibility service users.
 	# This attribute is not cleaned by the the clean method.
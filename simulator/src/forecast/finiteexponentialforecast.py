@@ -1,12 +1,15 @@
 ##@package finiteexponentialforecast
 #@author Sebastien MATHIEU
 
+import numpy
+
 from .forecast import Forecast
-from collections import deque
 
 ## Forecast by taking the exponential mean of the N last measurements.
+# The discounted sum of the measurements and the sum of their discounts are updated at each measurement, the last N
+# measurements being kept in a ring buffer to remove the contribution of the oldest one when the window is full.
 class FiniteExponentialForecast(Forecast):
-    
+
     ## Constructor.
     # @param x0 Initial state.
     # @param N Filtering window size.
@@ -14,32 +17,42 @@ class FiniteExponentialForecast(Forecast):
     def __init__(self, x0=[0], N=5, discountFactor=0):
         Forecast.__init__(self,x0)
         self._N=N
-        self._history=deque()
-        self._history.appendleft(x0)
         self._discountFactor=discountFactor
-        
+        self._history=numpy.zeros((N,len(x0)))
+        self._history[0]=x0
+        self._last=0
+        self._count=1
+        self._sum=numpy.array(x0,dtype=float)
+        self._totalDiscount=1.0
+
     def measure(self, x):
+        # Discount the sum and remove the oldest measurement if the window is full
+        self._sum*=self._discountFactor
+        if self._count == self._N:
+            self._sum-=self._discountFactor**self._N*self._history[(self._last+1)%self._N]
+        else:
+            self._count+=1
+            self._totalDiscount=self._totalDiscount*self._discountFactor+1
+
         # Update history
-        if len(self._history) == self._N:
-            self._history.pop()
-        self._history.appendleft(x)
-            
+        self._last=(self._last+1)%self._N
+        self._history[self._last]=x
+        self._sum+=self._history[self._last]
+
         # Forecast
-        M=len(x)
-        self.x=[0]*M
-        discount=1.0
-        totalDiscount=0.0
-        for e in self._history:
-            for i in range(M):
-                self.x[i]+=discount*e[i]
-            totalDiscount+=discount
-            discount*=self._discountFactor
-        self.x=list(map(lambda x:x/totalDiscount,self.x))
-    
+        self.x=(self._sum/self._totalDiscount).tolist()
+
     ## @var _history
-    # History of the system.
+    # Ring buffer of shape (N,M) with the last measurements of the system.
+    ## @var _last
+    # Row of the last measurement in the history.
+    ## @var _count
+    # Number of measurements in the history.
+    ## @var _sum
+    # Discounted sum of the measurements in the history, the last one having a weight of 1.
+    ## @var _totalDiscount
+    # Sum of the weights of the measurements in the history.
     ## @var _N
     # Filtering window.
     ## @var _discountFactor
     # Discount factor.
-    
\ No newline at end of file
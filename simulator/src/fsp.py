@@ -2,13 +2,14 @@
 #@author Sebastien MATHIEU
 
 from .forecast.finiteexponentialforecast import FiniteExponentialForecast
-from . import options,tools,xmlsolution
+from . import options,tools,staging,xmlsolution
 
 ## Flexibility services provider
 # Needed to inherit from a state agent and have the following properties:
 #	- name
 #	- 'costs' personal data
 #	-  nodes, a list of nodes to consider
+#	-  operationFolder, the folder where the data files are written (@see FSU.operationFolder)
 # The method initialize should be called in the state agent initialization phase.
 class FSP:
 	## Name of the data file with the flexibility prices indicators.
@@ -172,7 +173,7 @@ class FSP:
 	# @param data Data.
 	def writeFlexbilityActivationToProvide(self,data):
 		T=data.general['T'] 
-		with open(options.FOLDER+'/'+FSP.flexToActivatedDataFile, 'w') as file:
+		with staging.manager.write(self.operationFolder+'/'+FSP.flexToActivatedDataFile) as file:
 			file.write("# T\n%s\n" % T)
 			file.write("# N set\n%s\n" % ",".join(map(str,self.nodes)))
 			file.write("# n, t, h, bsp, d, D\n")
@@ -189,7 +190,7 @@ class FSP:
 	# @param data Data.
 	def writeFlexObligations(self,data):
 		T=data.general['T']
-		with open(options.FOLDER+'/'+FSP.flexObligationsDataFile, 'w') as file:
+		with staging.manager.write(self.operationFolder+'/'+FSP.flexObligationsDataFile) as file:
 			file.write("# T\n%s\n" % T)
 			file.write("# N set\n%s\n" % ",".join(map(str,self.nodes)))
 			file.write("# n, t, alpha, beta, d, D\n")
@@ -208,7 +209,7 @@ class FSP:
 	# @param data Data.
 	def writeFlexbilityToProvide(self,data):
 		T=data.general['T'] 
-		with open(options.FOLDER+'/'+FSP.flexDataFile, 'w') as file:
+		with staging.manager.write(self.operationFolder+'/'+FSP.flexDataFile) as file:
 			file.write("# T\n%s\n" % T)
 			file.write("# N set\n%s\n" % ",".join(map(str,self.nodes)))
 			file.write("# n, t, f^+, f^-, d, D\n")
@@ -224,7 +225,7 @@ class FSP:
 	## Write a data file with the flexibility prices indicators.
 	# @param T Number of periods.
 	def writeFlexPricesIndicators(self,T):
-		with open(options.FOLDER+'/'+FSP.flexIndicatorsDataFile, 'w') as file:
+		with staging.manager.write(self.operationFolder+'/'+FSP.flexIndicatorsDataFile) as file:
 			file.write("# T\n%s\n" % T)
 			file.write("# N set\n%s\n" % ",".join(map(str,self.nodes)))
 			file.write("# n,t, pi^f+, pi^f-\n")
@@ -1,10 +1,10 @@
 ##@package fsu
 #@author Sebastien MATHIEU
 
-from . import tools,options, xmlsolution
+from . import tools,options,staging,xmlsolution
 
 from .ecbid import ECBid, ECBidRequest
-from .spbid import SPBid, SPBidRequest, SPObligationBid
+from .spbid import SPBid, SPBidRequest
 from . import xmlsolution
 
 ## Flexibility services user.
@@ -24,6 +24,7 @@ class FSU:
 	def initialize(self, data):
 		T=data.general['T']
 		N=data.general['N']
+		self.operationFolder=options.FOLDER
 		
 		# Create personal variables
 		data.personal[self.name]['a+']={} # Upward flexibility reserved in each node and each period
@@ -46,7 +47,7 @@ class FSU:
 	# @param data Data.
 	def writeFlexbilityActivated(self,data):
 		T=data.general['T'] 
-		with open(options.FOLDER+'/'+FSU.activatedFlexFile, 'w') as file:
+		with staging.manager.write(self.operationFolder+'/'+FSU.activatedFlexFile) as file:
 			file.write("# T\n%s\n" % T)
 			file.write("# N set\n%s\n" % ",".join(map(str,self.nodes)))
 			file.write("# n, t, u\n")
@@ -111,7 +112,7 @@ class FSU:
 		
 		# Solve the optimization problem
 		solver=data.general['solver']
-		solver.solve("%s.zpl"%model,"%s.sol"%model,cwd=options.FOLDER)
+		solver.solve("%s.zpl"%model,"%s-%s.sol"%(model,self.name),cwd=self.operationFolder)
 		solver.checkFeasible()
 		
 		# Parse solution
@@ -165,7 +166,7 @@ class FSU:
 	def flexiblityEvaluationAndRequest(self,model,data):
 		# The offers are written by the flexibility platform.
 		solver=data.general['solver']
-		solver.solve("%s.zpl"%model,"%s.sol"%model,cwd=options.FOLDER)
+		solver.solve("%s.zpl"%model,"%s-%s.sol"%(model,self.name),cwd=self.operationFolder)
 		solver.checkFeasible()
 
 		# Parse the solution
@@ -190,7 +191,7 @@ class FSU:
 	def _writeContractedFlex(self,spBidRequestsList,ecBidRequestsList,data):	  
 		from .dso import DSO  
 		
-		with open(options.FOLDER+'/'+FSU.acceptedFlexFile, 'w') as file:
+		with staging.manager.write(self.operationFolder+'/'+FSU.acceptedFlexFile) as file:
 			T=data.general['T']
 			B=len(spBidRequestsList)
 			F=len(ecBidRequestsList)
@@ -201,7 +202,7 @@ class FSU:
 			i=0
 			for r in spBidRequestsList:
 				b=r.bid
-				if isinstance(self,DSO) and isinstance(b, SPObligationBid):
+				if isinstance(self,DSO) and b.obligation:
 					 file.write("%s, %s, %s, %s, %s, %s, %s\n" % (i, b.bus, b.t+1, b.dsoReservationCost,b.dsoActivationCost, min(r.aw,0), max(r.aW,0)))
 				else:
 					file.write("%s, %s, %s, %s, %s, %s, %s\n" % (i, b.bus, b.t+1, b.reservationCost, b.activationCost, min(r.aw,0), max(r.aW,0)))
@@ -251,4 +252,7 @@ class FSU:
 		s+='\t</timegraph>\n'
 		
 		return s
+
+	## @var operationFolder
+	# Folder where the agent writes its data files and solves its models, the operation folder by default.
 	
\ No newline at end of file
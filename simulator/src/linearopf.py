@@ -0,0 +1,122 @@
+##@package linearopf
+# Sensitivities of the linear optimal power flow of a network to the nodal injections.
+#@author Sebastien MATHIEU
+
+import numpy
+
+## Linear relations between the nodal active injections and the voltages and line flows of the linear optimal power flow models.
+# The reactive injection of each node is its active injection times its Q/P ratio and the node 0 is the slack node
+# with a voltage V0/Vb. The voltages (e,f) and the line flows (p,q) in per unit are then affine functions of the injections,
+# obtained once per network by solving the link and balance equations of the models.
+class LinearOpfSensitivities:
+	## Cosines of the points of the circle approximation of the models.
+	cpCos=[1,0.923879532511287,0.707106781186548,0.382683432365090,0]
+	## Sines of the points of the circle approximation of the models.
+	cpSin=[0,0.382683432365090,0.707106781186547,0.923879532511287,1]
+
+	## Constructor.
+	# @param N Number of nodes.
+	# @param fromBus Dictionary "line - origin bus".
+	# @param toBus Dictionary "line - destination bus".
+	# @param Yg Dictionary "line - conductance [pu.]".
+	# @param Yb Dictionary "line - susceptance [pu.]".
+	# @param Sb Base power [MVA].
+	# @param Vb Base voltage [kV].
+	# @param V0 Voltage of the slack node [kV].
+	# @param QPRatio List of the Q/P ratio of each node.
+	def __init__(self,N,fromBus,toBus,Yg,Yb,Sb,Vb,V0,QPRatio):
+		self.N=N
+		self.lines=sorted(fromBus)
+		self.Sb=Sb
+		L=len(self.lines)
+
+		# Unknowns e, f, p, q, r0, q0 and equations slack, link P, link Q, balance P, balance Q
+		e,f,p,q=0,N,2*N,2*N+L
+		r0,q0=2*N+2*L,2*N+2*L+1
+		M=2*N+2*L+2
+		A=numpy.zeros((M,M))
+		B=numpy.zeros((M,N+1)) # Last column for the constant terms
+		A[0,e]=1.0
+		B[0,N]=V0/Vb
+		A[1,f]=1.0
+		c=V0/Vb
+		for i,line in enumerate(self.lines):
+			a,b=fromBus[line],toBus[line]
+			A[2+i,p+i]=1.0
+			A[2+i,[e+a,e+b,f+a,f+b]]+=[-c*Yg[line],c*Yg[line],c*Yb[line],-c*Yb[line]]
+			A[2+L+i,q+i]=1.0
+			A[2+L+i,[e+a,e+b,f+a,f+b]]+=[c*Yb[line],-c*Yb[line],c*Yg[line],-c*Yg[line]]
+			for offset,column in [(2+2*L,p+i),(2+2*L+N,q+i)]:
+				A[offset+a,column]+=1.0
+				A[offset+b,column]-=1.0
+		A[2+2*L,r0]=-1.0
+		A[2+2*L+N,q0]=-1.0
+		for n in range(N):
+			B[2+2*L+n,n]=1.0/Sb
+			B[2+2*L+N+n,n]=QPRatio[n]/Sb
+
+		if numpy.linalg.matrix_rank(A) < M:
+			raise numpy.linalg.LinAlgError('Singular linear power flow equations.')
+		X=numpy.linalg.solve(A,B)
+		self.offsets={}
+		self.matrices={}
+		for name,start,size in [('e',e,N),('f',f,N),('p',p,L),('q',q,L)]:
+			self.offsets[name]=X[start:start+size,N]
+			self.matrices[name]=X[start:start+size,:N]
+
+	## Build the sensitivities of a network.
+	# @param N Number of nodes.
+	# @param fromBus Dictionary "line - origin bus".
+	# @param toBus Dictionary "line - destination bus".
+	# @param Yg Dictionary "line - conductance [pu.]".
+	# @param Yb Dictionary "line - susceptance [pu.]".
+	# @param Sb Base power [MVA].
+	# @param Vb Base voltage [kV].
+	# @param V0 Voltage of the slack node [kV].
+	# @param QPRatio List of the Q/P ratio of each node.
+	# @return Sensitivities, None if the equations do not define the voltages and flows of the network.
+	@staticmethod
+	def fromNetwork(N,fromBus,toBus,Yg,Yb,Sb,Vb,V0,QPRatio):
+		try:
+			return LinearOpfSensitivities(N,fromBus,toBus,Yg,Yb,Sb,Vb,V0,QPRatio)
+		except numpy.linalg.LinAlgError:
+			return None
+
+	## Compute the voltages and line flows.
+	# @param injections Active injections of shape (N,T) [MW].
+	# @return Dictionary "variable - array of shape (N,T) or (L,T)" for the variables e, f, p and q of the models.
+	def state(self,injections):
+		injections=numpy.asarray(injections,dtype=float)
+		return dict((name,self.offsets[name].reshape(-1,1)+self.matrices[name].dot(injections)) for name in self.matrices)
+
+	## Compute the voltages, the line flows and the capacity needs of the model DSO-linearOpf-capaNeeds.
+	# The capacity need of a line is the smallest increase of its capacity such that the flow satisfies the capacity
+	# constraint and the polygonal approximation of the circle of apparent power.
+	# @param injections Active injections of shape (N,T) [MW].
+	# @param C Capacity of each line [MVA], in the order of LinearOpfSensitivities.lines.
+	# @return Dictionary "variable - array of shape (N,T) or (L,T)" for the variables e, f, p, q and dC of the models.
+	def capacityNeeds(self,injections,C):
+		values=self.state(injections)
+		C=numpy.asarray(C,dtype=float).reshape(-1,1)
+		absP=numpy.abs(values['p'])
+		absQ=numpy.abs(values['q'])
+		dC=numpy.maximum(0.0,absP-C)
+		cpCos,cpSin=LinearOpfSensitivities.cpCos,LinearOpfSensitivities.cpSin
+		for cp in range(1,len(cpCos)):
+			a=cpSin[cp]-cpSin[cp-1]
+			b=cpCos[cp-1]-cpCos[cp]
+			k=cpSin[cp-1]*b-cpCos[cp-1]*(cpSin[cp-1]-cpSin[cp])
+			dC=numpy.maximum(dC,self.Sb*(a*absP+b*absQ)/k-C)
+		values['dC']=dC
+		return values
+
+	## @var N
+	# Number of nodes.
+	## @var lines
+	# List of the line indices.
+	## @var Sb
+	# Base power [MVA].
+	## @var offsets
+	# Dictionary "variable - values without injection" for the variables e, f, p and q.
+	## @var matrices
+	# Dictionary "variable - matrix of the sensitivities to the active injections" for the variables e, f, p and q.
@@ -15,6 +15,12 @@ DEBUG=False
 COPY=True 
 ## Operation folder.
 FOLDER='operationFolder'
+## Create the operation folder in a memory-backed file system, removed at exit.
+RAMFS=False
+## Memory-backed file system of the operation folder if RAMFS is True.
+RAMFS_ROOT='/dev/shm'
+## Path to the SCIP binary. None to use the binary "scip" next to the operation folder.
+SCIP_BIN=None
 ## Accuracy parameter.
 EPS=0.00001
 ## Arbitrary big number
@@ -23,5 +29,29 @@ INF=10000
 #  - "networkFlow" or None: Traditional network flow with active powers.
 #  - "linearOpf" : Linear approximation of the optimal power flow problems.
 OPF_METHOD=None
-## Solver name. By default uses scip. Alternative: cplex.
+## Solver solution cache folder. None to deactivate the cache.
+CACHE_FOLDER=None
+## Maximum size of the solver solution cache in MB.
+CACHE_SIZE=512
+## Give the previous solution of each agent problem to SCIP as a starting solution.
+WARM_START=False
+## Record the statistics of each solve and export them in the profiling section of the output file.
+PROFILING=False
+## CSV file with one line per solve written if PROFILING is True. None to skip it.
+PROFILING_CSV=None
+## Keep a copy of the whole data of each iteration in the system trace instead of only the status variables of the two last iterations.
+FULL_TRACE=False
+## Compute the DSO capacity needs in closed form if the network is radial, without calling the solver. Ignored with the linear optimal power flows.
+RADIAL_FLOWS=True
+## Compute the DSO capacity needs with the linear optimal power flows from the sensitivities of the voltages and line flows to the injections, computed once per network, without calling the solver.
+LINEAR_OPF_SENSITIVITIES=True
+## Number of concurrent batches of per-period solves of the DSO capacity and flexibility needs, each batch solved by a single solver process. 0 to solve all the periods in a single multi-period problem.
+DSO_WORKERS=0
+## Number of retailers and producers optimizing concurrently in the baseline, flexibility and imbalance optimization layers. 0 to act sequentially.
+AGENT_WORKERS=0
+## Consolidate the single period bids of the same owner, bus, period and prices into one bid before publishing them to the flexibility service users.
+CONSOLIDATE_BIDS=False
+## Keep a CPLEX and a SCIP process alive between the solves if the solver is cplex.
+CPLEX_PERSISTENT=False
+## Solver name. By default uses scip. Alternatives: cplex, scippool (persistent SCIP processes), highs (in-process HiGHS when a Python formulation exists).
 SOLVER = 'scip'
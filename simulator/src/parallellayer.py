@@ -0,0 +1,115 @@
+##@package parallellayer
+#@author Sebastien MATHIEU
+
+import os, glob
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+
+from .agent.layer import Layer
+from .agent.data import Data
+from . import options,staging
+
+## Flexibility platform wrapper recording the registered bids instead of registering them.
+# The other methods are forwarded to the flexibility platform.
+class FlexibilityPlatformRecorder:
+	## Constructor.
+	# @param flexibilityPlatform Flexibility platform.
+	def __init__(self,flexibilityPlatform):
+		self._flexibilityPlatform=flexibilityPlatform
+		self._bids=[]
+
+	## Record a energy constrained bid.
+	# @param b Energy constrained bid.
+	# @param data Data.
+	def registerECBid(self,b,data):
+		self._bids.append((self._flexibilityPlatform.registerECBid,b))
+
+	## Record a single period bid.
+	# @param b Classic bid.
+	# @param data Data.
+	def registerSPBid(self,b,data):
+		self._bids.append((self._flexibilityPlatform.registerSPBid,b))
+
+	## Register the recorded bids on the flexibility platform in their recording order.
+	# @param data Data.
+	def replay(self,data):
+		for register,b in self._bids:
+			register(b,data)
+
+	def __getattr__(self,name):
+		return getattr(self._flexibilityPlatform,name)
+
+	## @var _flexibilityPlatform
+	# Flexibility platform.
+	## @var _bids
+	# List of pairs (registration method, bid).
+
+## Layer running its agents concurrently, each one in its own subfolder of the operation folder.
+# The agents may only write their personal data, add to the aggregates of ParallelLayer.aggregates and register bids on the flexibility platform.
+# These contributions are collected per agent and applied afterwards in the order of the agent list,
+# such that the data are identical to the ones of a sequential layer.
+class ParallelLayer(Layer):
+	## General data to which the agents add their contributions.
+	aggregates=['p^b','p^p','p^r']
+	## Patterns of the files of the operation folder needed in the subfolders.
+	sharedFiles=['*.zpl','prices.csv']
+
+	## Default constructor.
+	# @param agentList Initial list of agents in the layer.
+	# @param name Name of the layer.
+	# @param workers Maximum number of agents acting at the same time.
+	def __init__(self, agentList=[], name="", workers=1):
+		Layer.__init__(self,agentList,name)
+		self.workers=max(1,workers)
+
+	## Perform the action of all agents in the layer.
+	# The data are modified by the actions of the agent.
+	# @param data Data needed for the action. 
+	def act(self, data):
+		with ThreadPoolExecutor(max_workers=self.workers) as executor:
+			views=list(executor.map(lambda a: self._actAlone(a,data),self._agentList))
+
+		# Reduce the contributions in the order of the agents
+		for view in views:
+			for key in ParallelLayer.aggregates:
+				if key in data.general:
+					values=view.general[key].array
+					numpy.add(data.general[key].array,values,out=data.general[key].array,where=values != 0)
+			view.general['flexibilityPlatform'].replay(data)
+
+	## Perform the action of an agent in its subfolder with a private view of the general data.
+	# @param agent Agent.
+	# @param data Data.
+	# @return View of the data used by the agent.
+	def _actAlone(self,agent,data):
+		folder='%s/%s'%(options.FOLDER,agent.name)
+		self._prepareFolder(folder)
+
+		view=Data()
+		view.personal=data.personal
+		view.general=dict(data.general)
+		for key in ParallelLayer.aggregates:
+			if key in data.general:
+				view.general[key]=data.general[key].zeros()
+		view.general['solver']=data.general['solver'].clone()
+		view.general['flexibilityPlatform']=FlexibilityPlatformRecorder(data.general['flexibilityPlatform'])
+
+		agent.operationFolder=folder
+		try:
+			self.actAgent(agent,view)
+		finally:
+			agent.operationFolder=options.FOLDER
+		return view
+
+	## Create a subfolder of the operation folder and stage the shared files in it.
+	# @param folder Subfolder.
+	def _prepareFolder(self,folder):
+		if not os.path.isdir(folder):
+			os.makedirs(folder)
+		for pattern in ParallelLayer.sharedFiles:
+			for file in glob.glob('%s/%s'%(options.FOLDER,pattern)):
+				staging.manager.stage(file,'%s/%s'%(folder,os.path.basename(file)))
+
+	## @var workers
+	# Maximum number of agents acting at the same time.
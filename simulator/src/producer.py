@@ -7,7 +7,7 @@ from .agent.stateAgent import StateAgent
 from .fsu import FSU
 from .fsp import FSP
 from .brp import BRP
-from . import options,tools
+from . import options,staging
 from .spbid import SPBid, SPObligationBid
 
 ## Producer agent.
@@ -89,9 +89,9 @@ class Producer(StateAgent,FSU,FSP,BRP):
 			
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/producer.dat')
+			staging.manager.stage(self._dataFile,self.operationFolder+'/producer.dat')
 		else: # Rename instead of copy if debug
-			shutil.move(self._dataFile,options.FOLDER+'/producer.dat')
+			shutil.move(self._dataFile,self.operationFolder+'/producer.dat')
 		
 		# Optimize position
 		try:
@@ -99,16 +99,16 @@ class Producer(StateAgent,FSU,FSP,BRP):
 						
 		finally: # Move back the data file
 			if not options.COPY:
-				shutil.copy(options.FOLDER+'/producer.dat',self._dataFile)
+				shutil.copy(self.operationFolder+'/producer.dat',self._dataFile)
 				
 	## Activation of the contracted flexibility.
 	# @param data Data.
 	def _flexibilityActivation(self,data):		
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/producer.dat')
+			staging.manager.stage(self._dataFile,self.operationFolder+'/producer.dat')
 		else: # Rename instead of copy if debug
-			shutil.move(self._dataFile,options.FOLDER+'/producer.dat')
+			shutil.move(self._dataFile,self.operationFolder+'/producer.dat')
 	
 		# Optimize position
 		try:
@@ -118,16 +118,16 @@ class Producer(StateAgent,FSU,FSP,BRP):
 						
 		finally: # Move back the data file
 			if not options.COPY:
-				shutil.copy(options.FOLDER+'/producer.dat',self._dataFile)
+				shutil.copy(self.operationFolder+'/producer.dat',self._dataFile)
 		
 	## Evaluate and request the flexibility offers.
 	# @param data Data.
 	def flexibilityEvaluation(self, data):
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/producer.dat')
+			staging.manager.stage(self._dataFile,self.operationFolder+'/producer.dat')
 		else: # Rename instead of copy if debug
-			shutil.move(self._dataFile,options.FOLDER+'/producer.dat')
+			shutil.move(self._dataFile,self.operationFolder+'/producer.dat')
 		
 		# Optimize position
 		try:
@@ -137,7 +137,7 @@ class Producer(StateAgent,FSU,FSP,BRP):
 						
 		finally: # Move back the data file
 			if not options.COPY:
-				shutil.copy(options.FOLDER+'/producer.dat',self._dataFile)
+				shutil.copy(self.operationFolder+'/producer.dat',self._dataFile)
 				
 	## Optimize the flexibility of the producer.
 	# @param data Data.
@@ -146,13 +146,13 @@ class Producer(StateAgent,FSU,FSP,BRP):
 			
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/producer.dat')
+			staging.manager.stage(self._dataFile,self.operationFolder+'/producer.dat')
 		else: # Rename instead of copy if debug
-			shutil.move(self._dataFile,options.FOLDER+'/producer.dat')
+			shutil.move(self._dataFile,self.operationFolder+'/producer.dat')
 		
 		# Optimize position
 		try:
-			solutionFile="producer-flexibility.sol"
+			solutionFile="producer-flexibility-%s.sol"%self.name
 			self.buildFlexPricesIndicators(T,data.general['R+'],data.general['R-'])
 			self.writeFlexPricesIndicators(T)
 			self.writeBaselines(Producer.baselinesDataFile,data)
@@ -160,7 +160,7 @@ class Producer(StateAgent,FSU,FSP,BRP):
 				
 			# Retrieve the solution
 			solver=data.general['solver']
-			solver.solve("producer-flexibility.zpl",solutionFile,cwd=options.FOLDER)
+			solver.solve("producer-flexibility.zpl",solutionFile,cwd=self.operationFolder)
 			solver.checkFeasible()
 			
 			# Parse the solution			
@@ -200,7 +200,7 @@ class Producer(StateAgent,FSU,FSP,BRP):
 						
 		finally: # Move back the data file
 			if not options.COPY:
-				shutil.copy(options.FOLDER+'/producer.dat',self._dataFile)
+				shutil.copy(self.operationFolder+'/producer.dat',self._dataFile)
 	
 	## Optimize the consumption strategy of the producer.
 	# @param data Data.
@@ -220,16 +220,16 @@ class Producer(StateAgent,FSU,FSP,BRP):
 				   
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/producer.dat')
+			staging.manager.stage(self._dataFile,self.operationFolder+'/producer.dat')
 		else: # Rename instead of copy if debug
-			shutil.move(self._dataFile,options.FOLDER+'/producer.dat')
+			shutil.move(self._dataFile,self.operationFolder+'/producer.dat')
 		
 		# Optimize position
 		try:
 			BRP.optimizeBaseline(self,'producer-baseline',data,layer=layer)
 		finally: # Move back the data file
 			if not options.COPY:
-				shutil.copy(options.FOLDER+'/producer.dat',self._dataFile)
+				shutil.copy(self.operationFolder+'/producer.dat',self._dataFile)
 	
 	## Read the data file of the producer.
 	# @param data Data.
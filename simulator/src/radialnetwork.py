@@ -0,0 +1,76 @@
+##@package radialnetwork
+# Closed-form network flows of radial networks.
+#@author Sebastien MATHIEU
+
+import numpy
+
+## Radial network, i.e. a tree rooted at the node 0 whose line flows follow from the sums of the injections below each line.
+# With the network flow formulation, the flow of a line is minus the sum of the injections of the nodes below the line
+# if the line is oriented away from the root and this sum otherwise. The node 0 balances the network.
+class RadialNetwork:
+	## Constructor.
+	# @param N Number of nodes.
+	# @param lines List of the line indices.
+	# @param incidence Matrix of shape (L,N) with the sign of the injection of each node in the flow of each line, 0 if the node is not below the line.
+	def __init__(self,N,lines,incidence):
+		self.N=N
+		self.lines=lines
+		self.incidence=incidence
+
+	## Build the radial network of a topology.
+	# @param N Number of nodes.
+	# @param fromBus Dictionary "line - origin bus".
+	# @param toBus Dictionary "line - destination bus".
+	# @return Radial network, None if the network is meshed or not connected.
+	@staticmethod
+	def fromLines(N,fromBus,toBus):
+		lines=sorted(fromBus)
+		if len(lines) != N-1:
+			return None
+
+		# Parent line of each node by a breadth-first search from the root
+		neighbours=[[] for n in range(N)]
+		for line in lines:
+			neighbours[fromBus[line]].append((line,toBus[line]))
+			neighbours[toBus[line]].append((line,fromBus[line]))
+		parent={0:None}
+		queue=[0]
+		for n in queue:
+			for line,m in neighbours[n]:
+				if m not in parent:
+					parent[m]=(line,n)
+					queue.append(m)
+		if len(parent) != N:
+			return None
+
+		# Each node contributes to the flows of the lines on its path to the root
+		row=dict((line,i) for i,line in enumerate(lines))
+		incidence=numpy.zeros((len(lines),N))
+		for n in range(1,N):
+			m=n
+			while parent[m] is not None:
+				line,up=parent[m]
+				incidence[row[line],n]=-1.0 if fromBus[line] == up else 1.0
+				m=up
+		return RadialNetwork(N,lines,incidence)
+
+	## Compute the line flows.
+	# @param p Injections of shape (N,T).
+	# @return Flows of shape (L,T), in the order of RadialNetwork.lines.
+	def flows(self,p):
+		return self.incidence.dot(numpy.asarray(p,dtype=float))
+
+	## Compute the line flows and the minimum capacity increases allowing them.
+	# @param p Injections of shape (N,T).
+	# @param C Capacity of each line, in the order of RadialNetwork.lines.
+	# @return Tuple (flows, capacity needs) of arrays of shape (L,T).
+	def capacityNeeds(self,p,C):
+		f=self.flows(p)
+		return f,numpy.maximum(0.0,numpy.abs(f)-numpy.asarray(C,dtype=float).reshape(-1,1))
+
+	## @var N
+	# Number of nodes.
+	## @var lines
+	# List of the line indices.
+	## @var incidence
+	# Matrix of shape (L,N) with the sign of the injection of each node in the flow of each line, 0 if the node is not below the line.
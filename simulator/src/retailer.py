@@ -8,7 +8,7 @@ from .fsu import FSU
 from .fsp import FSP
 from .brp import BRP
 from .ecbid import ECBid, ECObligationBid 
-from . import options,tools
+from . import options,tools,staging
 
 ## Retailer agent.
 class Retailer(StateAgent, FSU, FSP, BRP):
@@ -84,9 +84,9 @@ class Retailer(StateAgent, FSU, FSP, BRP):
 		
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/retailer.dat')
+			staging.manager.stage(self._dataFile,self.operationFolder+'/retailer.dat')
 		else: # Rename instead of copy if debug
-			os.rename(self._dataFile,options.FOLDER+'/retailer.dat')
+			os.rename(self._dataFile,self.operationFolder+'/retailer.dat')
 		
 		# Optimize position
 		try:
@@ -94,16 +94,16 @@ class Retailer(StateAgent, FSU, FSP, BRP):
 			
 		finally: # Move back the data file
 			if not options.COPY:
-				os.rename(options.FOLDER+'/retailer.dat',self._dataFile)
+				os.rename(self.operationFolder+'/retailer.dat',self._dataFile)
 			
 	## Activation of the contracted flexibility.
 	# @param data Data.
 	def _flexibilityActivation(self,data):		
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/retailer.dat')
+			staging.manager.stage(self._dataFile,self.operationFolder+'/retailer.dat')
 		else: # Rename instead of copy if debug
-			os.rename(self._dataFile,options.FOLDER+'/retailer.dat')
+			os.rename(self._dataFile,self.operationFolder+'/retailer.dat')
 	
 		# Optimize position
 		try:
@@ -113,16 +113,16 @@ class Retailer(StateAgent, FSU, FSP, BRP):
 						
 		finally: # Move back the data file
 			if not options.COPY:
-				os.rename(options.FOLDER+'/retailer.dat',self._dataFile)
+				os.rename(self.operationFolder+'/retailer.dat',self._dataFile)
 				
 	## Evaluate and request the flexibility offers.
 	# @param data Data.
 	def flexibilityEvaluation(self, data):
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/retailer.dat')
+			staging.manager.stage(self._dataFile,self.operationFolder+'/retailer.dat')
 		else: # Rename instead of copy if debug
-			os.rename(self._dataFile,options.FOLDER+'/retailer.dat')
+			os.rename(self._dataFile,self.operationFolder+'/retailer.dat')
 		
 		# Optimize position
 		try:
@@ -132,7 +132,7 @@ class Retailer(StateAgent, FSU, FSP, BRP):
 						
 		finally: # Move back the data file
 			if not options.COPY:
-				os.rename(options.FOLDER+'/retailer.dat',self._dataFile)
+				os.rename(self.operationFolder+'/retailer.dat',self._dataFile)
 				
 	## Optimize the flexibility of the retailer.
 	# @param data Data.
@@ -141,13 +141,13 @@ class Retailer(StateAgent, FSU, FSP, BRP):
 			
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/retailer.dat')
+			staging.manager.stage(self._dataFile,self.operationFolder+'/retailer.dat')
 		else: # Rename instead of copy if debug
-			os.rename(self._dataFile,options.FOLDER+'/retailer.dat')
+			os.rename(self._dataFile,self.operationFolder+'/retailer.dat')
 		
 		# Optimize position
 		try:
-			solutionFile="retailer-flexibility.sol"
+			solutionFile="retailer-flexibility-%s.sol"%self.name
 			self._writeNodalTotalConsumption(data)
 			self.buildFlexPricesIndicators(T,data.general['R+'],data.general['R-'])
 			self.writeFlexPricesIndicators(T)
@@ -156,7 +156,7 @@ class Retailer(StateAgent, FSU, FSP, BRP):
 			
 			# Retrieve the solution file
 			solver=data.general['solver']
-			solver.solve("retailer-flexibility.zpl",solutionFile,cwd=options.FOLDER)
+			solver.solve("retailer-flexibility.zpl",solutionFile,cwd=self.operationFolder)
 			solver.checkFeasible()
 			
 			# Parse the solution
@@ -203,7 +203,7 @@ class Retailer(StateAgent, FSU, FSP, BRP):
 		
 		finally: # Move back the data file
 			if not options.COPY:
-				os.rename(options.FOLDER+'/retailer.dat',self._dataFile)
+				os.rename(self.operationFolder+'/retailer.dat',self._dataFile)
 				
 	## Optimize the consumption strategy of the retailer.
 	# @param data Data.
@@ -223,22 +223,22 @@ class Retailer(StateAgent, FSU, FSP, BRP):
 
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/retailer.dat')
+			staging.manager.stage(self._dataFile,self.operationFolder+'/retailer.dat')
 		else: # Rename instead of copy if debug
-			os.rename(self._dataFile,options.FOLDER+'/retailer.dat')
+			os.rename(self._dataFile,self.operationFolder+'/retailer.dat')
 		
 		# Optimize position
 		try:
 			BRP.optimizeBaseline(self,'retailer-baseline',data,layer=layer)
 		finally: # Move back the data file
 			if not options.COPY:
-				os.rename(options.FOLDER+'/retailer.dat',self._dataFile)
+				os.rename(self.operationFolder+'/retailer.dat',self._dataFile)
 				if not os.path.isfile(self._dataFile):
 					raise Exception(self._dataFile+' was not restored to the instance folder!')
 	
 	## Write the nodal total consumption based on the submitted baselines.
 	def _writeNodalTotalConsumption(self,data):
-		with open(options.FOLDER+'/'+Retailer.submittedNodalTotalConsumptionsDataFile, 'w') as file:
+		with staging.manager.write(self.operationFolder+'/'+Retailer.submittedNodalTotalConsumptionsDataFile) as file:
 			file.write("# N set\n%s\n" % ",".join(map(str,self.nodes)))
 			file.write("# n, D^b\n")
 			for n in self.nodes:
@@ -0,0 +1,257 @@
+##@package cachedsolver
+#@author Sebastien MATHIEU
+
+import os, re, glob, hashlib, pickle, tempfile, threading
+
+from .solver import Solver
+from .solution import Solution
+
+## Solver wrapper storing the parsed solutions on disk, indexed by the content of the model and of its data files.
+# The cache folder may be shared by several simulators running at the same time:
+# entries are written atomically and a vanished entry is simply a cache miss.
+# The least recently used entries are removed once the cache exceeds its maximum size.
+# The clones share the statistics and the size of the cache, updated under a lock.
+class CachedSolver(Solver):
+	## Regular expression matching the data files read by a ZIMPL model.
+	readRegex=re.compile('read\\s+"([^"]+)"')
+	## Extension of the cache entries.
+	extension='.pickle'
+
+	## Constructor.
+	# @param solver Solver to call in case of cache miss.
+	# @param folder Cache folder.
+	# @param maxSize Maximum size of the cache folder in bytes.
+	def __init__(self,solver,folder,maxSize=512*1024*1024):
+		Solver.__init__(self)
+		self._solver=solver
+		self.folder=folder
+		self.maxSize=maxSize
+		self.statistics={'hits':0,'misses':0}
+		self.lastHit=False
+		self._dataFiles={}
+		self._lock=threading.Lock()
+		if not os.path.exists(self.folder):
+			os.makedirs(self.folder)
+		self._size=[sum(self._entries().values())]
+
+	def solve(self,model,solution,cwd=""):
+		Solver.solve(self,model,solution)
+		entry=self._entry(model,cwd)
+		if self._load(entry,model,solution,cwd):
+			return
+
+		# Cache miss
+		self._count('misses')
+		self.lastHit=False
+		self._solver.solve(model,solution,cwd=cwd)
+		self.debugInfo=self._solver.debugInfo
+		if self._solver.isOptimal():
+			self._store(entry,self._solver._sol)
+
+	## Solve independent problems, the cache misses being solved together by the solver.
+	def solveMany(self,problems):
+		solvers=[]
+		entries=[]
+		misses=[]
+		for model,solution,cwd in problems:
+			solver=self.clone()
+			Solver.solve(solver,model,solution)
+			entry=solver._entry(model,cwd)
+			if not solver._load(entry,model,solution,cwd):
+				misses.append(len(solvers))
+			solvers.append(solver)
+			entries.append(entry)
+
+		# Cache misses, counted once for the batch
+		self._count('misses',len(misses))
+		for i,inner in zip(misses,self._solver.solveMany([problems[i] for i in misses])):
+			solver=solvers[i]
+			solver.lastHit=False
+			solver._solver=inner
+			solver.debugInfo=inner.debugInfo
+			if inner.isOptimal():
+				self._store(entries[i],inner._sol)
+		return solvers
+
+	def isFeasible(self):
+		return self._solver.isFeasible()
+
+	def isOptimal(self):
+		optimal=self._solver.isOptimal()
+		self.debugInfo=self._solver.debugInfo
+		return optimal
+
+	def objectiveValue(self):
+		return self._solver.objectiveValue()
+
+	def variableValue(self,variableName='x'):
+		return self._solver.variableValue(variableName)
+
+	def variableVectorValue(self,maxIndex,variablePrefix='x#',minIndex=0,variableSuffix=''):
+		return self._solver.variableVectorValue(maxIndex,variablePrefix,minIndex,variableSuffix)
+
+	def variableMatrixValue(self,rows,maxIndex,variablePrefix='x#',minIndex=0):
+		return self._solver.variableMatrixValue(rows,maxIndex,variablePrefix,minIndex)
+
+	def lastStatistics(self):
+		if self.lastHit:
+			return {}
+		return self._solver.lastStatistics()
+
+	def clone(self):
+		solver=Solver.clone(self)
+		solver._solver=self._solver.clone()
+		return solver
+
+	def close(self):
+		self._solver.close()
+
+	def report(self):
+		text="Solutions cache: %s hit(s), %s miss(es)." % (self.statistics['hits'],self.statistics['misses'])
+		solverReport=self._solver.report()
+		if solverReport != "":
+			text+="\n"+solverReport
+		return text
+
+	## Load the solution of a problem from the cache and write it to the solution file, as read by the warm starts.
+	# @param entry Path of the entry.
+	# @param model Model file.
+	# @param solution Target solution file.
+	# @param cwd Working directory.
+	# @return True if the cache holds the solution.
+	def _load(self,entry,model,solution,cwd=""):
+		try:
+			with open(entry,'rb') as file:
+				sol=pickle.load(file)
+			if not isinstance(sol,Solution):
+				raise pickle.UnpicklingError('Entry of a previous version')
+			sol.writeScip(os.path.join(cwd,solution))
+			self._solver._sol=sol
+			os.utime(entry,None)
+		except (IOError,OSError,EOFError,pickle.UnpicklingError):
+			return False
+
+		self._solver.lastModel=model
+		self._solver.lastSolution=solution
+		self._solver.debugInfo="\tCached solution: %s\n"%entry
+		self.debugInfo=self._solver.debugInfo
+		self._count('hits')
+		self.lastHit=True
+		return True
+
+	## Count solves in the statistics.
+	# @param key "hits" or "misses".
+	# @param count Number of solves.
+	def _count(self,key,count=1):
+		with self._lock:
+			self.statistics[key]+=count
+
+	## Get the entry of a problem.
+	# @param model Model file.
+	# @param cwd Working directory.
+	# @return Path of the entry.
+	def _entry(self,model,cwd):
+		return '%s/%s%s'%(self.folder,self._key(model,cwd),CachedSolver.extension)
+
+	## Compute the key of a problem from the model and the data files it reads.
+	# @param model Model file.
+	# @param cwd Working directory.
+	# @return Hexadecimal key.
+	def _key(self,model,cwd):
+		modelPath=os.path.join(cwd,model)
+		with open(modelPath,'rb') as file:
+			content=file.read()
+
+		# Data files read by the model, parsed once per model content
+		h=hashlib.sha1(content)
+		modelDigest=h.hexdigest()
+		if modelDigest not in self._dataFiles:
+			self._dataFiles[modelDigest]=sorted(set(CachedSolver.readRegex.findall(content.decode('latin-1'))))
+
+		# Solver configuration
+		h.update(type(self._solver).__name__.encode())
+		for attr in ['timeLimit','noPresolve']:
+			h.update(('%s=%s;'%(attr,getattr(self._solver,attr,None))).encode())
+
+		# Data files
+		for dataFile in self._dataFiles[modelDigest]:
+			h.update(dataFile.encode()+b'\0')
+			try:
+				with open(os.path.join(os.path.dirname(modelPath),dataFile),'rb') as file:
+					h.update(file.read())
+			except (IOError,OSError):
+				h.update(b'\0missing')
+			h.update(b'\0')
+		return h.hexdigest()
+
+	## Store a parsed solution and evict the oldest entries if needed.
+	# @param entry Path of the entry.
+	# @param sol Parsed solution.
+	def _store(self,entry,sol):
+		fd,tmpPath=tempfile.mkstemp(dir=self.folder,suffix='.tmp')
+		try:
+			with os.fdopen(fd,'wb') as file:
+				pickle.dump(sol,file,pickle.HIGHEST_PROTOCOL)
+			size=os.path.getsize(tmpPath)
+			os.replace(tmpPath,entry)
+		except (IOError,OSError):
+			if os.path.exists(tmpPath):
+				os.remove(tmpPath)
+			return
+
+		with self._lock:
+			self._size[0]+=size
+			if self._size[0] > self.maxSize:
+				self._evict()
+
+	## Remove the least recently used entries until the cache fits in its maximum size.
+	# The lock must be held by the caller.
+	def _evict(self):
+		entries=self._entries()
+		self._size[0]=sum(entries.values())
+		for path in sorted(entries,key=lambda p: self._mtime(p)):
+			if self._size[0] <= self.maxSize:
+				break
+			try:
+				os.remove(path)
+			except OSError:
+				pass # Already removed by another process
+			self._size[0]-=entries[path]
+
+	## Get the entries of the cache folder.
+	# @return Dictionary "path - size".
+	def _entries(self):
+		entries={}
+		for path in glob.glob('%s/*%s'%(self.folder,CachedSolver.extension)):
+			try:
+				entries[path]=os.path.getsize(path)
+			except OSError:
+				pass
+		return entries
+
+	## Get the last access time of an entry.
+	# @param path Path of the entry.
+	# @return Modification time, 0 if the entry vanished.
+	@staticmethod
+	def _mtime(path):
+		try:
+			return os.path.getmtime(path)
+		except OSError:
+			return 0
+
+	## @var folder
+	# Cache folder.
+	## @var maxSize
+	# Maximum size of the cache folder in bytes.
+	## @var statistics
+	# Dictionary with the number of solves answered by the cache, "hits", and delegated to the solver, "misses", shared by the clones.
+	## @var lastHit
+	# True if the last solve was answered by the cache.
+	## @var _solver
+	# Solver called in case of cache miss.
+	## @var _dataFiles
+	# Dictionary "model digest - list of data files read by the model".
+	## @var _size
+	# List with the estimated size of the cache folder in bytes, shared by the clones.
+	## @var _lock
+	# Lock protecting the statistics and the size shared by the clones.
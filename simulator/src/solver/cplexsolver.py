@@ -1,10 +1,28 @@
 #@package cplexsolver
-#Class to solve a model using CPLEX, SCIP and ZIMPL.
+#Class to solve a model using CPLEX, SCIP and ZIMPL or the Python formulations.
 #@version 1.0
 
-import re, os
+import re, os, threading, atexit
 
 from .solver import Solver
+from .solution import Solution
+from .scippoolsolver import ScipWorker
+from .formulations import FORMULATIONS
+
+## Interactive CPLEX process kept alive between the solves and fed with commands through its standard input.
+class CplexWorker(ScipWorker):
+	## Command reading a missing file, CPLEX answering with an error message naming the file.
+	sentinelCommand='read %s.lp'
+
+	## Constructor.
+	# @param cplexBin Path to the CPLEX binary.
+	# @param timeLimit Time limit in seconds.
+	def __init__(self,cplexBin,timeLimit=0):
+		ScipWorker.__init__(self,cplexBin)
+		settings=['set logfile *','set lpmethod 1'] # Feasibility first
+		if timeLimit > 0:
+			settings.append('set timelimit %s'%timeLimit)
+		self.execute(settings)
 
 class CplexSolver(Solver):
 	## Constructor.
@@ -13,27 +31,69 @@ class CplexSolver(Solver):
 	# @param lp Binary equal to True if the solver writes the LP problem file.
 	# @param timeLimit Time limit in seconds
 	# @param maxTrials Maximum calling trials of the solver.
-	def __init__(self,cplexBin='cplex',scipBin='../scip',lp=False,timeLimit=5*60,maxTrials=2):
-		self._sol={}
+	# @param persistent True to keep CPLEX and SCIP processes alive between the solves instead of launching them for each solve.
+	def __init__(self,cplexBin='cplex',scipBin='../scip',lp=False,timeLimit=5*60,maxTrials=2,persistent=False):
+		self._sol=Solution()
 		self.lp=lp
 		self._cplex=cplexBin
 		self._scip=scipBin
 		self.timeLimit=timeLimit
 		self.maxTrials=max(1,maxTrials)
+		self.persistent=persistent
+		self._workers={'cplex':[],'scip':[]}
+		self._lock=threading.Lock()
+		if persistent:
+			atexit.register(self.close)
 
 	def solve(self,model,solution,cwd=""):
 		Solver.solve(self,model,solution)
 
-		# Create the cmd to write the lp
-		scipCmd=self._scip
-		scipCmd+=' -c "read %s"'%model
-
+		# Write the lp
 		lpFile=solution+".lp"
 		lpPath='%s/%s'%(cwd,lpFile)
-		scipCmd+=' -c "write problem %s"' % lpFile
 		if os.path.exists(lpPath):
 			os.remove(lpPath)
+		formulation=FORMULATIONS.get(model)
+		if formulation is not None:
+			self.debugInfo="\tLP written from the Python formulation of %s\n"%model
+			formulation(cwd if cwd != "" else ".").writeLp(lpPath)
+		elif self.persistent:
+			self._executePersistent('scip',['read %s'%os.path.abspath('%s/%s'%(cwd,model)),'write problem %s'%os.path.abspath(lpPath),'free'])
+		else:
+			self._translate(model,lpFile,cwd)
+		if not os.path.isfile(lpPath):
+			raise Exception('Error when generating "' + lpFile + '"".\n'+self.debugInfo)
+
+		# Solve the lp using cplex
+		solutionFile='%s/%s'%(cwd,solution)
+		if os.path.exists(solutionFile):
+			os.remove(solutionFile)
+		if self.persistent:
+			self._executePersistent('cplex',['read %s'%os.path.abspath(lpPath),'opt','write %s'%os.path.abspath(solutionFile)])
+		else:
+			self._callCplex(lpFile,solution,cwd)
+		if not os.path.isfile(solutionFile):
+			raise Exception('Error when generating the solution file with the model \"'+ lpFile + '\".\n'+self.debugInfo)
+
+		# Parse the solution
+		self._sol=self._parseSolution(solutionFile)
 
+	## Stop the persistent processes.
+	def close(self):
+		with self._lock:
+			for workers in self._workers.values():
+				for worker in workers:
+					worker.terminate()
+				del workers[:]
+
+	## Write the LP file of a ZIMPL model with a new SCIP process.
+	# @param model Model file.
+	# @param lpFile LP file.
+	# @param cwd Working directory.
+	def _translate(self,model,lpFile,cwd):
+		scipCmd=self._scip
+		scipCmd+=' -c "read %s"'%model
+		scipCmd+=' -c "write problem %s"' % lpFile
 		scipCmd+=' -c "q"'
 
 		# Call scip and generate the lp
@@ -47,11 +107,12 @@ class CplexSolver(Solver):
 		# Check return
 		if retCode != 0:
 			raise Exception('Error calling SCIP with the model "' + model + '".\n\tCommand : '+ scipCmd)
-		if not os.path.isfile(lpPath):
-			raise Exception('Error when generating "' + lpFile + '"".\n\tCommand : '+ scipCmd)
 
-		# Solve the lp using cplex
-		solutionFile='%s/%s'%(cwd,solution)
+	## Solve a LP file with a new CPLEX process.
+	# @param lpFile LP file.
+	# @param solution Solution file.
+	# @param cwd Working directory.
+	def _callCplex(self,lpFile,solution,cwd):
 		cplexCmd = '%s -c "set logfile *"' % self._cplex
 		if self.timeLimit > 0:
 			cplexCmd+=' -c "set timelimit %s"' % self.timeLimit
@@ -62,9 +123,6 @@ class CplexSolver(Solver):
 
 		cplexCmd += ' "read %s" "opt" "write %s" "y" "quit"' % (lpFile, solution)
 
-		if os.path.exists(solutionFile):
-			os.remove(solutionFile)
-
 		self.debugInfo="\tCommand: %s\n"%cplexCmd
 		retCode=-1
 		trial=0
@@ -75,58 +133,92 @@ class CplexSolver(Solver):
 		# Check return
 		if retCode != 0:
 			raise Exception('Error calling CPLEX with the model \"'+ lpFile + '\".\n\tCommand : '+cplexCmd)
-		if not os.path.isfile(solutionFile):
-			raise Exception('Error when generating the solution file with the model \"'+ lpFile + '\".\n\tCommand : '+cplexCmd)
 
-		# Parse the solution
-		self._sol=self._parseSolution(solutionFile)
+	## Execute commands with a persistent process, started if needed.
+	# The clones share the idle processes, such that the concurrent clones each use their own process.
+	# @param program "scip" or "cplex".
+	# @param commands List of commands with absolute paths.
+	def _executePersistent(self,program,commands):
+		self.debugInfo="\t%s commands: %s\n"%(program,'; '.join(commands))
+		output=None
+		trial=0
+		while output is None and trial<self.maxTrials:
+			worker=None
+			with self._lock:
+				while len(self._workers[program]) > 0 and worker is None:
+					worker=self._workers[program].pop()
+					if not worker.isAlive():
+						worker.terminate()
+						worker=None
+			if worker is None:
+				worker=CplexWorker(self._cplex,self.timeLimit) if program == 'cplex' else ScipWorker(self._scip)
+			output=worker.execute(commands)
+			if output is None:
+				worker.terminate()
+			else:
+				with self._lock:
+					self._workers[program].append(worker)
+			trial+=1
+
+		if output is None:
+			raise Exception('Error calling %s.\n%s'%(program,self.debugInfo))
 
 	def isFeasible(self):
-		return self._sol['#$!feasible']
+		return self._sol.feasible
 
 	def isOptimal(self):
-		optimal=(self._sol['#$!status'].find("optimal") >=0)
+		optimal=(self._sol.status.find("optimal") >=0)
 		if not optimal:
-			self.debugInfo+="\tSolution status: %s\n"%self._sol['#$!status']
+			self.debugInfo+="\tSolution status: %s\n"%self._sol.status
 		return optimal
 
 	def objectiveValue(self):
-		return self._sol['#$!obj']
+		return self._sol.objective
 
 	def variableValue(self,variableName='x'):
-		v=0.0
-		try:
-			v=float(self._sol[variableName])
-		finally:
-			return v
+		return self._sol.value(variableName)
+
+	def variableVectorValue(self,maxIndex,variablePrefix='x#',minIndex=0,variableSuffix=''):
+		values=self._sol.vector(maxIndex,variablePrefix,minIndex,variableSuffix)
+		if values is None:
+			values=Solver.variableVectorValue(self,maxIndex,variablePrefix,minIndex,variableSuffix)
+		return values
+
+	def variableMatrixValue(self,rows,maxIndex,variablePrefix='x#',minIndex=0):
+		values=self._sol.matrix(rows,maxIndex,variablePrefix,minIndex)
+		if values is None:
+			values=Solver.variableMatrixValue(self,rows,maxIndex,variablePrefix,minIndex)
+		return values
 
 	## Parse the solution file.
 	#@param filePath Path to the solution file.
+	#@return Solution.
 	def _parseSolution(self,filePath):
-		dict={}
-		dict['#$!feasible'] = False
-		dict['#$!obj'] = 0.0
-		dict['#$!status'] = 'not parsed'
+		solution=Solution()
+		names=[]
+		values=[]
 
 		with open(filePath, 'r') as file:
-			feasibleRegex = re.compile('^\s+primalFeasible="(\d)"')
-			statusRegex = re.compile('^\s+solutionStatusString="(.+)"')
-			varRegex = re.compile('^\s+<variable name="(.+?)" .+? value="(.+?)"')
-			objRegex = re.compile('^\s+objectiveValue="(.+)"')
+			feasibleRegex = re.compile(r'^\s+primalFeasible="(\d)"')
+			statusRegex = re.compile(r'^\s+solutionStatusString="(.+)"')
+			varRegex = re.compile(r'^\s+<variable name="(.+?)" .+? value="(.+?)"')
+			objRegex = re.compile(r'^\s+objectiveValue="(.+)"')
 			for line in file:
 				matchVar=varRegex.match(line)
 				if matchVar:
-					dict[matchVar.group(1)]=matchVar.group(2)
+					names.append(matchVar.group(1))
+					values.append(matchVar.group(2))
 				elif objRegex.match(line):
-					dict['#$!obj']=float(objRegex.match(line).group(1))
+					solution.objective=float(objRegex.match(line).group(1))
 				elif feasibleRegex.match(line):
-					dict['#$!feasible'] = feasibleRegex.match(line).group(1) == "1"
+					solution.feasible = feasibleRegex.match(line).group(1) == "1"
 				elif statusRegex.match(line):
-					dict['#$!status'] = statusRegex.match(line).group(1)
-		return dict
+					solution.status = statusRegex.match(line).group(1)
+		solution.setValues(names,values)
+		return solution
 
 	## @var _sol
-	# Solution xml tree.
+	# Parsed solution.
 	## @var lp
 	# Boolean, True if the solver writes the LP problem file.
 	## @var _cplex
@@ -137,3 +229,9 @@ class CplexSolver(Solver):
 	# Time limit in seconds.
 	## @var maxTrials
 	# Maximum calling trials of the solver.
+	## @var persistent
+	# True to keep CPLEX and SCIP processes alive between the solves.
+	## @var _workers
+	# Dictionary "program - list of the idle persistent processes", shared by the clones.
+	## @var _lock
+	# Lock protecting the lists of idle persistent processes.
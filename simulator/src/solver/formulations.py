@@ -0,0 +1,352 @@
+##@package formulations
+# Python counterparts of ZIMPL models, built from the data files of the operation folder.
+#@author Sebastien MATHIEU
+
+import re
+
+from .linearprogram import LinearProgram, INFINITY
+
+## Separators of the fields in the ZIMPL data files.
+FIELDS_SEPARATOR=re.compile('[\\s,;:]+')
+
+## Read the data rows of a file as ZIMPL does, i.e. ignoring comments and empty lines.
+# @param filePath Path to the file.
+# @return List of rows, each row being a list of strings.
+def readRows(filePath):
+	rows=[]
+	with open(filePath,'r') as file:
+		for line in file:
+			line=line.split('#',1)[0].strip()
+			if line != "":
+				rows.append(FIELDS_SEPARATOR.split(line))
+	return rows
+
+## Read the network data common to the network flow models.
+# @param cwd Folder with the file network.csv.
+# @return Tuple (N, L, first row, fromBus, toBus, C) where the three last elements are dictionaries indexed by the lines.
+def readNetwork(cwd):
+	rows=readRows('%s/network.csv'%cwd)
+	N=int(rows[0][0])
+	L=int(rows[0][1])
+	fromBus={}
+	toBus={}
+	C={}
+	for row in rows[1:1+L]:
+		line=int(row[0])
+		fromBus[line]=int(row[1])
+		toBus[line]=int(row[2])
+		C[line]=float(row[5])
+	return N,L,rows[0],fromBus,toBus,C
+
+## Add the nodal balance rows "coefficients + sum flows to n - sum flows from n == rhs" to a program.
+# @param lp Linear program.
+# @param nodeTerms List for each node of the list of terms specific to the node.
+# @param rhs List for each node of the right-hand side.
+# @param flows Dictionary "line - column of the flow variable".
+# @param fromBus Dictionary "line - origin bus".
+# @param toBus Dictionary "line - destination bus".
+def addNodalBalances(lp,nodeTerms,rhs,flows,fromBus,toBus):
+	for line,column in flows.items():
+		nodeTerms[fromBus[line]].append((column,-1.0))
+		nodeTerms[toBus[line]].append((column,1.0))
+	for n in range(len(nodeTerms)):
+		lp.addEquality(nodeTerms[n],rhs[n])
+
+## Add the capacity needs of a single period to a program.
+# @param lp Linear program.
+# @param L Number of lines.
+# @param fromBus Dictionary "line - origin bus".
+# @param toBus Dictionary "line - destination bus".
+# @param C Dictionary "line - capacity".
+# @param p List for each node of the injection.
+# @param suffix Suffix of the variable names, e.g. '#1' for the first period of a multi-period model.
+def addCapaNeeds(lp,L,fromBus,toBus,C,p,suffix=''):
+	f={}
+	for line in range(1,L+1):
+		f[line]=lp.addVariable('f#%s%s'%(line,suffix),-INFINITY)
+		dC=lp.addVariable('dC#%s%s'%(line,suffix),cost=1.0)
+		lp.addConstraint([(f[line],1.0),(dC,-1.0)],upper=C[line])
+		lp.addConstraint([(f[line],1.0),(dC,1.0)],lower=-C[line])
+	r0=lp.addVariable('r0%s'%suffix,-INFINITY)
+
+	nodeTerms=[[] for n in range(len(p))]
+	nodeTerms[0].append((r0,1.0))
+	addNodalBalances(lp,nodeTerms,[-x for x in p],f,fromBus,toBus)
+
+## Read the data of the models using the full baselines.
+# @param cwd Operation folder.
+# @return Tuple ((network, first row of the baselines), p) where p is the dictionary of the injections indexed by (n,t).
+def readBaselinesFull(cwd):
+	network=readNetwork(cwd)
+	N=network[0]
+	rows=readRows('%s/baselines-full.dat'%cwd)
+	T=int(rows[0][1])
+	p=dict.fromkeys([(n,t) for t in range(1,T+1) for n in range(N)],0.0)
+	for row in rows[1:1+N*T]:
+		p[int(row[0]),int(row[1])]=float(row[2])
+	return (network,rows[0]),p
+
+## Read the data of the model DSO-capaNeeds.
+# @param cwd Operation folder.
+# @return Tuple ((network,), p) where p is the dictionary of the injections indexed by n.
+def readDsoCapaNeeds(cwd):
+	network=readNetwork(cwd)
+	N=network[0]
+	p=dict.fromkeys(range(N),0.0)
+	for row in readRows('%s/baselines.dat'%cwd)[1:1+N]:
+		p[int(row[0])]=float(row[1])
+	return (network,),p
+
+## Build the model DSO-capaNeeds.
+# @param structure Tuple (network,) as read by readDsoCapaNeeds.
+# @param p Dictionary of the injections indexed by n.
+# @return Linear program.
+def buildDsoCapaNeeds(structure,p):
+	N,L,header,fromBus,toBus,C=structure[0]
+	lp=LinearProgram()
+	addCapaNeeds(lp,L,fromBus,toBus,C,[p[n] for n in range(N)])
+	return lp
+
+## Build the model DSO-capaNeeds.
+# @param cwd Operation folder.
+# @return Linear program.
+def dsoCapaNeeds(cwd):
+	return buildDsoCapaNeeds(*readDsoCapaNeeds(cwd))
+
+## Build the model DSO-capaNeeds-multiperiod.
+# @param structure Tuple (network, first row of the baselines) as read by readBaselinesFull.
+# @param p Dictionary of the injections indexed by (n,t).
+# @return Linear program.
+def buildDsoCapaNeedsMultiperiod(structure,p):
+	(N,L,header,fromBus,toBus,C),first=structure
+	T=int(first[1])
+	lp=LinearProgram()
+	for t in range(1,T+1):
+		addCapaNeeds(lp,L,fromBus,toBus,C,[p[n,t] for n in range(N)],'#%s'%t)
+	return lp
+
+## Build the model DSO-capaNeeds-multiperiod.
+# @param cwd Operation folder.
+# @return Linear program.
+def dsoCapaNeedsMultiperiod(cwd):
+	return buildDsoCapaNeedsMultiperiod(*readBaselinesFull(cwd))
+
+## Build the model DSO-operation.
+# @param structure Tuple (network, first row of the baselines) as read by readBaselinesFull.
+# @param p Dictionary of the injections indexed by (n,t).
+# @return Linear program.
+def buildDsoOperation(structure,p):
+	(N,L,header,fromBus,toBus,C),first=structure
+	piTp=float(header[2])
+	piTd=float(header[3])
+	T=int(first[1])
+	dt=float(first[3])
+	EPS=float(first[4])
+
+	lp=LinearProgram()
+	for t in range(1,T+1):
+		f={}
+		fr={}
+		for line in range(1,L+1):
+			f[line]=lp.addVariable('f#%s#%s'%(line,t),-C[line]-EPS,C[line]+EPS)
+			fr[line]=lp.addVariable('fr#%s#%s'%(line,t),-INFINITY)
+			flowViolation=lp.addVariable('flowViolation#%s#%s'%(line,t),cost=EPS)
+			lp.addConstraint([(fr[line],1.0),(flowViolation,-1.0)],upper=C[line])
+			lp.addConstraint([(fr[line],1.0),(flowViolation,1.0)],lower=-C[line])
+		r0=lp.addVariable('r0#%s'%t,-INFINITY)
+		r0r=lp.addVariable('r0r#%s'%t,-INFINITY)
+
+		realTerms=[[] for n in range(N)]
+		observedTerms=[[] for n in range(N)]
+		realTerms[0].append((r0,1.0))
+		observedTerms[0].append((r0r,1.0))
+		for n in range(N):
+			z=lp.addBinary('z#%s#%s'%(n,t))
+			trippingCost=lp.addVariable('trippingCost#%s#%s'%(n,t),cost=1.0)
+			lp.addConstraint([(trippingCost,1.0),(z,-piTp*dt*p[n,t])],lower=0.0)
+			lp.addConstraint([(trippingCost,1.0),(z,piTd*dt*p[n,t])],lower=0.0)
+			realTerms[n].append((z,-p[n,t]))
+		rhs=[-p[n,t] for n in range(N)]
+		addNodalBalances(lp,observedTerms,rhs,fr,fromBus,toBus)
+		addNodalBalances(lp,realTerms,rhs,f,fromBus,toBus)
+	return lp
+
+## Build the model DSO-operation.
+# @param cwd Operation folder.
+# @return Linear program.
+def dsoOperation(cwd):
+	return buildDsoOperation(*readBaselinesFull(cwd))
+
+## Read the data common to the baseline models of the balance responsible parties.
+# @param cwd Operation folder.
+# @param dataFile Name of the personal data file.
+# @return Tuple (personal data rows, T, nodes, obligations, access, prices, indicators).
+def readBaselineData(cwd,dataFile):
+	rows=readRows('%s/%s'%(cwd,dataFile))
+	T=int(rows[0][0])
+	nodes=[int(n) for n in rows[1]]
+	NT=len(nodes)*T
+
+	obligations={}
+	access={}
+	obligationsRows=readRows('%s/flexObligations.dat'%cwd)
+	for row in obligationsRows[2:2+NT]:
+		obligations[int(row[0]),int(row[1])]=list(map(float,row[2:6]))
+	for row in obligationsRows[2+NT:2+NT+len(nodes)]:
+		access[int(row[0])]=list(map(float,row[1:5]))
+
+	pricesRows=readRows('%s/prices.csv'%cwd)
+	prices={}
+	for row in pricesRows[1:1+T]:
+		prices[int(row[0])]=list(map(float,row[1:4]))
+
+	indicators={}
+	for row in readRows('%s/flexIndicators.dat'%cwd)[2:2+NT]:
+		indicators[int(row[0]),int(row[1])]=list(map(float,row[2:4]))
+
+	return rows,T,nodes,obligations,access,pricesRows[0],prices,indicators
+
+## Build the part of the baseline models shared by the producers and the retailers.
+# @param lp Linear program.
+# @param T Number of periods.
+# @param nodes List of nodes.
+# @param pMin Dictionary of the minimum power indexed by (n,t).
+# @param pMax Dictionary of the maximum power indexed by (n,t).
+# @param obligations Dictionary of [alpha, beta, d, D] indexed by (n,t).
+# @param access Dictionary of [k, K, l, L] indexed by n.
+# @param header First row of the prices file.
+# @param prices Dictionary of [pi^E, pi^I+, pi^I-] indexed by t.
+# @param indicators Dictionary of [pi^f+, pi^f-] indexed by (n,t).
+# @return Dictionary "variable prefix - dictionary of columns".
+def addBaseline(lp,T,nodes,pMin,pMax,obligations,access,header,prices,indicators):
+	EPS=float(header[1])
+	pii=float(header[2])
+	v={}
+	for name in ['Pa','P','I','IP','IM','i','iP','iM','id','iD','fP','fM','p','pP','pM','pa']:
+		v[name]={}
+
+	for t in range(1,T+1):
+		piE,piIP,piIM=prices[t]
+		v['Pa'][t]=lp.addVariable('Pa#%s'%t,-INFINITY,cost=piE)
+		v['P'][t]=lp.addVariable('P#%s'%t,-INFINITY)
+		v['I'][t]=lp.addVariable('I#%s'%t,-INFINITY)
+		v['IP'][t]=lp.addVariable('IP#%s'%t,cost=-piIP)
+		v['IM'][t]=lp.addVariable('IM#%s'%t,cost=-piIM)
+		for n in nodes:
+			k,K,l,L=access[n]
+			piFP,piFM=indicators[n,t]
+			i=(n,t)
+			name='%s#%s'%(n,t)
+			v['i'][i]=lp.addVariable('i#'+name,-INFINITY)
+			v['iP'][i]=lp.addVariable('iP#'+name,cost=-EPS)
+			v['iM'][i]=lp.addVariable('iM#'+name,cost=-EPS)
+			v['id'][i]=lp.addVariable('id#'+name,cost=-pii)
+			v['iD'][i]=lp.addVariable('iD#'+name,cost=-pii)
+			v['fP'][i]=lp.addVariable('fP#'+name,cost=piFP)
+			v['fM'][i]=lp.addVariable('fM#'+name,cost=piFM)
+			lower=max(pMin[i],k)
+			upper=min(pMax[i],K)
+			v['p'][i]=lp.addVariable('p#'+name,lower,upper)
+			v['pP'][i]=lp.addVariable('pP#'+name,lower,upper)
+			v['pM'][i]=lp.addVariable('pM#'+name,lower,upper)
+			v['pa'][i]=lp.addVariable('pa#'+name,k,K)
+
+	for t in range(1,T+1):
+		lp.addEquality([(v['Pa'][t],1.0)]+[(v['pa'][n,t],-1.0) for n in nodes])
+		lp.addEquality([(v['P'][t],1.0)]+[(v['p'][n,t],-1.0) for n in nodes])
+		lp.addEquality([(v['I'][t],1.0),(v['P'][t],-1.0),(v['Pa'][t],1.0)])
+		lp.addConstraint([(v['IP'][t],1.0),(v['I'][t],-1.0)],lower=0.0)
+		lp.addConstraint([(v['IM'][t],1.0),(v['I'][t],1.0)],lower=0.0)
+		for n in nodes:
+			i=(n,t)
+			k,K,l,L=access[n]
+			d,D=obligations[i][2:4]
+			lp.addConstraint([(v['fP'][i],1.0),(v['pP'][i],-1.0),(v['pa'][i],1.0)],upper=0.0)
+			lp.addConstraint([(v['fM'][i],1.0),(v['pa'][i],-1.0),(v['pM'][i],1.0)],upper=0.0)
+			lp.addConstraint([(v['pM'][i],1.0)],upper=L)
+			lp.addConstraint([(v['pP'][i],1.0)],lower=l)
+			lp.addEquality([(v['pa'][i],1.0),(v['i'][i],1.0),(v['p'][i],-1.0)])
+			lp.addConstraint([(v['iP'][i],1.0),(v['i'][i],-1.0)],lower=0.0)
+			lp.addConstraint([(v['iM'][i],1.0),(v['i'][i],1.0)],lower=0.0)
+			lp.addConstraint([(v['id'][i],1.0),(v['p'][i],1.0)],lower=d)
+			lp.addConstraint([(v['iD'][i],1.0),(v['p'][i],-1.0)],lower=-D)
+			lp.addConstraint([(v['id'][i],1.0),(v['pM'][i],1.0)],lower=d)
+			lp.addConstraint([(v['iD'][i],1.0),(v['pP'][i],-1.0)],lower=-D)
+	return v
+
+## Build the model producer-baseline.
+# @param cwd Operation folder.
+# @return Linear program.
+def producerBaseline(cwd):
+	rows,T,nodes,obligations,access,header,prices,indicators=readBaselineData(cwd,'producer.dat')
+	pMin={}
+	pMax={}
+	c={}
+	for row in rows[2:2+len(nodes)*T]:
+		i=(int(row[0]),int(row[1]))
+		pMin[i]=float(row[2])
+		pMax[i]=float(row[3])
+		c[i]=float(row[4])
+
+	lp=LinearProgram(maximize=True)
+	v=addBaseline(lp,T,nodes,pMin,pMax,obligations,access,header,prices,indicators)
+	for i,column in v['p'].items():
+		lp.costs[column]-=c[i]
+
+	for t in range(1,T+1):
+		FP=lp.addVariable('FP#%s'%t)
+		FM=lp.addVariable('FM#%s'%t)
+		lp.addEquality([(FP,1.0)]+[(v['fP'][n,t],-1.0) for n in nodes])
+		lp.addEquality([(FM,1.0)]+[(v['fM'][n,t],-1.0) for n in nodes])
+		for n in nodes:
+			i=(n,t)
+			alpha,beta=obligations[i][0:2]
+			lp.addConstraint([(v['fM'][i],1.0),(v['pa'][i],-alpha)],lower=0.0)
+			lp.addConstraint([(v['fP'][i],1.0),(v['pa'][i],beta)],lower=0.0)
+	return lp
+
+## Build the model retailer-baseline.
+# @param cwd Operation folder.
+# @return Linear program.
+def retailerBaseline(cwd):
+	rows,T,nodes,obligations,access,header,prices,indicators=readBaselineData(cwd,'retailer.dat')
+	piV=float(rows[0][2])
+	dt=float(header[3])
+	NT=len(nodes)*T
+	pMin={}
+	pMax={}
+	for row in rows[2:2+NT]:
+		i=(int(row[0]),int(row[1]))
+		pMin[i]=float(row[2])
+		pMax[i]=float(row[3])
+	V={}
+	for row in rows[2+NT:2+NT+len(nodes)]:
+		V[int(row[0])]=float(row[1])
+
+	lp=LinearProgram(maximize=True)
+	v=addBaseline(lp,T,nodes,pMin,pMax,obligations,access,header,prices,indicators)
+	for column in v['P'].values():
+		lp.costs[column]-=piV
+
+	for n in nodes:
+		k,K,l,L=access[n]
+		o=lp.addVariable('obligations#%s'%n)
+		lp.addEquality([(v['p'][n,t],dt) for t in range(1,T+1)],V[n])
+		for t in range(1,T+1):
+			i=(n,t)
+			alpha,beta=obligations[i][0:2]
+			lp.addConstraint([(v['fM'][i],1.0),(o,-1.0)],lower=0.0)
+			lp.addConstraint([(v['fP'][i],1.0),(o,-1.0)],lower=0.0)
+			lp.addConstraint([(o,1.0)],lower=max(alpha,beta)*(pMax[i]-pMin[i]))
+			lp.addConstraint([(o,1.0),(v['pa'][i],1.0)],lower=l)
+			lp.addConstraint([(o,1.0),(v['pa'][i],-1.0)],lower=-L)
+	return lp
+
+## Python formulations indexed by the name of the corresponding ZIMPL model.
+FORMULATIONS={
+	'DSO-capaNeeds.zpl':dsoCapaNeeds,
+	'DSO-capaNeeds-multiperiod.zpl':dsoCapaNeedsMultiperiod,
+	'DSO-operation.zpl':dsoOperation,
+	'producer-baseline.zpl':producerBaseline,
+	'retailer-baseline.zpl':retailerBaseline
+}
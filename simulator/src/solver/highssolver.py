@@ -0,0 +1,99 @@
+#@package highssolver
+#Class to solve the models with a Python formulation in-process using HiGHS, the other ones using SCIP and ZIMPL.
+#@version 1.0
+
+import time
+
+from .solver import Solver
+from .scipsolver import ScipSolver
+from .solution import Solution
+from .formulations import FORMULATIONS
+from .templates import TEMPLATES, CompiledProgram
+
+try:
+	from scipy.optimize import milp, Bounds, LinearConstraint
+	from scipy.sparse import csr_matrix
+except ImportError:
+	milp=None
+
+class HighsSolver(ScipSolver):
+	## Status strings of the scipy milp return codes.
+	STATUS={0:'optimal',1:'limit',2:'infeasible',3:'unbounded'}
+
+	## Constructor.
+	# @param scipBin Path to the SCIP binary used for the models without Python formulation.
+	# @param lp Binary equal to True if the solver writes the solution file of the in-process solves.
+	# @param timeLimit Time limit in seconds
+	# @param maxTrials Maximum calling trials of the solver.
+	def __init__(self,scipBin='../scip',lp=False,timeLimit=5*60,maxTrials=2):
+		if milp is None:
+			raise Exception('The HiGHS solver requires the Python packages numpy and scipy (version 1.9 or above).')
+		ScipSolver.__init__(self,scipBin,lp,timeLimit,maxTrials)
+		self._inProcessStatistics=None
+
+	def solve(self,model,solution,cwd=""):
+		formulation=FORMULATIONS.get(model)
+		if formulation is None:
+			self._inProcessStatistics=None
+			ScipSolver.solve(self,model,solution,cwd)
+			return
+
+		Solver.solve(self,model,solution)
+		self.debugInfo="\tIn-process HiGHS solve of %s\n"%model
+		template=TEMPLATES.get(model)
+		if template is not None:
+			lp=template.instantiate(cwd if cwd != "" else ".")
+		else:
+			lp=CompiledProgram(formulation(cwd if cwd != "" else "."))
+
+		# Solve
+		costs=-lp.costs if lp.maximize else lp.costs
+		constraints=()
+		if lp.constraintsCount() > 0:
+			A=csr_matrix((lp.data,lp.indices,lp.indptr),shape=(lp.constraintsCount(),lp.variablesCount()))
+			constraints=LinearConstraint(A,lp.rowLower,lp.rowUpper)
+		options={'disp':False}
+		if self.timeLimit > 0:
+			options['time_limit']=self.timeLimit
+		tic=time.time()
+		result=milp(costs,integrality=lp.integrality,bounds=Bounds(lp.lower,lp.upper),constraints=constraints,options=options)
+		self._inProcessStatistics={'solving time':time.time()-tic}
+		for key,attr in [('nodes','mip_node_count'),('gap','mip_gap')]:
+			if getattr(result,attr,None) is not None:
+				self._inProcessStatistics[key]=getattr(result,attr)*(100 if key == 'gap' else 1)
+
+		# Store the solution as the parsed SCIP solutions
+		self._sol=Solution(HighsSolver.STATUS.get(result.status,'error'),result.x is not None)
+		if result.x is not None:
+			self._sol.objective=-result.fun if lp.maximize else result.fun
+			self._sol.setValues(lp.names,result.x)
+		else:
+			self.debugInfo+="\t%s\n"%result.message
+
+		if self.lp:
+			self._writeSolution('%s/%s'%(cwd,solution) if cwd != "" else solution)
+
+	## Solve the problems with a Python formulation in-process, the other ones within a single SCIP process.
+	def solveMany(self,problems):
+		solvers=[None]*len(problems)
+		others=[]
+		for i,(model,solution,cwd) in enumerate(problems):
+			if model in FORMULATIONS:
+				solvers[i]=self.clone()
+				solvers[i].solve(model,solution,cwd)
+			else:
+				others.append(i)
+		for i,solver in zip(others,ScipSolver.solveMany(self,[problems[i] for i in others])):
+			solver._inProcessStatistics=None
+			solvers[i]=solver
+		return solvers
+
+	def lastStatistics(self):
+		if self._inProcessStatistics is None:
+			return ScipSolver.lastStatistics(self)
+		return dict(self._inProcessStatistics)
+
+	## Write the solution in the SCIP format.
+	#@param filePath Path to the solution file.
+	def _writeSolution(self,filePath):
+		self._sol.writeScip(filePath)
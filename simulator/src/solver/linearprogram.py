@@ -0,0 +1,161 @@
+##@package linearprogram
+#@author Sebastien MATHIEU
+
+## Infinity bound.
+INFINITY=float('inf')
+
+## Write a number in the LP format.
+# @param value Number.
+# @return String.
+def _lpNumber(value):
+	if value == INFINITY:
+		return 'inf'
+	if value == -INFINITY:
+		return '-inf'
+	return repr(float(value))
+
+## Mixed-integer linear program stored in a sparse triplet form.
+# The variables are named as in the ZIMPL solutions, e.g. 'f#1' or 'z#0#1'.
+class LinearProgram:
+	## Constructor.
+	# @param maximize True if the objective is maximized.
+	def __init__(self,maximize=False):
+		self.maximize=maximize
+		self.names=[]
+		self.index={}
+		self.lower=[]
+		self.upper=[]
+		self.costs=[]
+		self.integrality=[]
+		self.rows=[]
+		self.columns=[]
+		self.coefficients=[]
+		self.rowLower=[]
+		self.rowUpper=[]
+
+	## Add a variable.
+	# @param name Name of the variable.
+	# @param lower Lower bound.
+	# @param upper Upper bound.
+	# @param cost Objective coefficient.
+	# @param integer True if the variable is integer.
+	# @return Column index of the variable.
+	def addVariable(self,name,lower=0.0,upper=INFINITY,cost=0.0,integer=False):
+		column=len(self.names)
+		self.names.append(name)
+		self.index[name]=column
+		self.lower.append(lower)
+		self.upper.append(upper)
+		self.costs.append(cost)
+		self.integrality.append(1 if integer else 0)
+		return column
+
+	## Add a binary variable.
+	# @param name Name of the variable.
+	# @param cost Objective coefficient.
+	# @return Column index of the variable.
+	def addBinary(self,name,cost=0.0):
+		return self.addVariable(name,0.0,1.0,cost,True)
+
+	## Add a constraint lower <= sum coefficient*variable <= upper.
+	# @param terms List of pairs (column, coefficient).
+	# @param lower Lower bound.
+	# @param upper Upper bound.
+	def addConstraint(self,terms,lower=-INFINITY,upper=INFINITY):
+		row=len(self.rowLower)
+		for column,coefficient in terms:
+			self.rows.append(row)
+			self.columns.append(column)
+			self.coefficients.append(coefficient)
+		self.rowLower.append(lower)
+		self.rowUpper.append(upper)
+
+	## Add an equality constraint sum coefficient*variable == rhs.
+	# @param terms List of pairs (column, coefficient).
+	# @param rhs Right-hand side.
+	def addEquality(self,terms,rhs=0.0):
+		self.addConstraint(terms,rhs,rhs)
+
+	## Get the number of variables.
+	# @return Number of variables.
+	def variablesCount(self):
+		return len(self.names)
+
+	## Get the number of constraints.
+	# @return Number of constraints.
+	def constraintsCount(self):
+		return len(self.rowLower)
+
+	## Write the program in the CPLEX LP format.
+	# The ranged constraints are written as two constraints.
+	# @param filePath Path to the LP file.
+	def writeLp(self,filePath):
+		rows=[[] for r in range(self.constraintsCount())]
+		for row,column,coefficient in zip(self.rows,self.columns,self.coefficients):
+			rows[row].append((column,coefficient))
+
+		with open(filePath,'w') as file:
+			file.write('%s\n obj:' % ('Maximize' if self.maximize else 'Minimize'))
+			file.write(self._lpTerms([(c,v) for c,v in enumerate(self.costs) if v != 0]))
+			file.write('\nSubject To\n')
+			for r,terms in enumerate(rows):
+				lower,upper=self.rowLower[r],self.rowUpper[r]
+				if lower == upper:
+					file.write(' c%s:%s = %s\n' % (r,self._lpTerms(terms),_lpNumber(lower)))
+					continue
+				if lower > -INFINITY:
+					file.write(' c%sl:%s >= %s\n' % (r,self._lpTerms(terms),_lpNumber(lower)))
+				if upper < INFINITY:
+					file.write(' c%su:%s <= %s\n' % (r,self._lpTerms(terms),_lpNumber(upper)))
+
+			file.write('Bounds\n')
+			for name,lower,upper in zip(self.names,self.lower,self.upper):
+				if lower == -INFINITY and upper == INFINITY:
+					file.write(' %s free\n' % name)
+				elif lower != 0.0 or upper != INFINITY:
+					file.write(' %s <= %s <= %s\n' % (_lpNumber(lower),name,_lpNumber(upper)))
+
+			integers=[name for name,integer in zip(self.names,self.integrality) if integer]
+			if len(integers) > 0:
+				file.write('Generals\n')
+				for name in integers:
+					file.write(' %s\n' % name)
+			file.write('End\n')
+
+	## Write a linear expression in the LP format.
+	# @param terms List of pairs (column, coefficient).
+	# @return String of the expression, split in several lines since the LP lines are limited in length.
+	def _lpTerms(self,terms):
+		if len(terms) == 0:
+			terms=[(0,0.0)]
+		text=''
+		for i,(column,coefficient) in enumerate(terms):
+			if i > 0 and i % 8 == 0:
+				text+='\n'
+			text+=' %s %s %s' % ('-' if coefficient < 0 else '+',_lpNumber(abs(coefficient)),self.names[column])
+		return text
+
+	## @var maximize
+	# True if the objective is maximized.
+	## @var names
+	# Name of each variable.
+	## @var index
+	# Dictionary "variable name - column index".
+	## @var lower
+	# Lower bound of each variable.
+	## @var upper
+	# Upper bound of each variable.
+	## @var costs
+	# Objective coefficient of each variable.
+	## @var integrality
+	# 1 for each integer variable, 0 otherwise.
+	## @var rows
+	# Row index of each nonzero coefficient.
+	## @var columns
+	# Column index of each nonzero coefficient.
+	## @var coefficients
+	# Value of each nonzero coefficient.
+	## @var rowLower
+	# Lower bound of each constraint.
+	## @var rowUpper
+	# Upper bound of each constraint.
@@ -0,0 +1,153 @@
+##@package profilingsolver
+#@author Sebastien MATHIEU
+
+import time, csv, threading
+
+from .solver import Solver
+from ..agent.layer import Layer
+
+## Solver wrapper recording the model, the acting agent and layer, the iteration, the wall time and the statistics of each solve.
+# The records are shared by the clones such that the concurrent solves are recorded as well.
+class ProfilingSolver(Solver):
+	## Fields of a record.
+	fields=['model','agent','layer','iteration','wall time','solving time','presolving time','nodes','gap','lp iterations']
+	## Fields summed in the summary.
+	sums=['wall time','solving time','presolving time','nodes','lp iterations']
+
+	## Constructor.
+	# @param solver Solver to profile.
+	def __init__(self,solver):
+		Solver.__init__(self)
+		self._solver=solver
+		self.records=[]
+		self._iteration=[0]
+		self._lock=threading.Lock()
+		self._acting=(None,None)
+
+	def solve(self,model,solution,cwd=""):
+		Solver.solve(self,model,solution)
+		tic=time.time()
+		self._solver.solve(model,solution,cwd=cwd)
+		self.debugInfo=self._solver.debugInfo
+		self._record(model,time.time()-tic,self._solver.lastStatistics())
+
+	## Solve independent problems together, the wall time being shared equally by the problems.
+	def solveMany(self,problems):
+		tic=time.time()
+		inners=self._solver.solveMany(problems)
+		wallTime=(time.time()-tic)/max(1,len(problems))
+
+		solvers=[]
+		for (model,solution,cwd),inner in zip(problems,inners):
+			solver=Solver.clone(self)
+			Solver.solve(solver,model,solution)
+			solver._solver=inner
+			solver.debugInfo=inner.debugInfo
+			solver._record(model,wallTime,inner.lastStatistics())
+			solvers.append(solver)
+		return solvers
+
+	def isFeasible(self):
+		return self._solver.isFeasible()
+
+	def isOptimal(self):
+		optimal=self._solver.isOptimal()
+		self.debugInfo=self._solver.debugInfo
+		return optimal
+
+	def objectiveValue(self):
+		return self._solver.objectiveValue()
+
+	def variableValue(self,variableName='x'):
+		return self._solver.variableValue(variableName)
+
+	def variableVectorValue(self,maxIndex,variablePrefix='x#',minIndex=0,variableSuffix=''):
+		return self._solver.variableVectorValue(maxIndex,variablePrefix,minIndex,variableSuffix)
+
+	def variableMatrixValue(self,rows,maxIndex,variablePrefix='x#',minIndex=0):
+		return self._solver.variableMatrixValue(rows,maxIndex,variablePrefix,minIndex)
+
+	def lastStatistics(self):
+		return self._solver.lastStatistics()
+
+	def clone(self):
+		solver=Solver.clone(self)
+		solver._solver=self._solver.clone()
+		solver._acting=Layer.acting()
+		return solver
+
+	def close(self):
+		self._solver.close()
+
+	def report(self):
+		text="Solver profiling: %s solve(s) in %.2f s." % (len(self.records),sum(r['wall time'] for r in self.records))
+		solverReport=self._solver.report()
+		if solverReport != "":
+			text+="\n"+solverReport
+		return text
+
+	## Record a solve.
+	# @param model Model file.
+	# @param wallTime Wall time of the solve.
+	# @param statistics Statistics of the solve reported by the solver.
+	def _record(self,model,wallTime,statistics):
+		layer,agent=Layer.acting()
+		if agent is None:
+			layer,agent=self._acting
+		record=dict.fromkeys(ProfilingSolver.fields)
+		record.update(statistics)
+		record.update({'model':model,'iteration':self._iteration[0],'wall time':wallTime,
+					'agent':getattr(agent,'name',str(agent)) if agent is not None else '',
+					'layer':layer.name if layer is not None else ''})
+		with self._lock:
+			self.records.append(record)
+
+	## Set the iteration of the system given to the next records.
+	# @param iteration Iteration.
+	def setIteration(self,iteration):
+		self._iteration[0]=iteration
+
+	## Aggregate the records per agent, layer and model.
+	# @return List of dictionaries with the agent, the layer, the model, the number of solves, the sums of ProfilingSolver.sums and the maximum gap,
+	# sorted by decreasing wall time.
+	def summary(self):
+		groups={}
+		with self._lock:
+			records=list(self.records)
+		for r in records:
+			key=(r['agent'],r['layer'],r['model'])
+			group=groups.get(key)
+			if group is None:
+				group=dict(zip(['agent','layer','model'],key))
+				group.update(dict.fromkeys(ProfilingSolver.sums+['gap']))
+				group['solves']=0
+				groups[key]=group
+			group['solves']+=1
+			for field in ProfilingSolver.sums:
+				if r[field] is not None:
+					group[field]=(group[field] or 0)+r[field]
+			if r['gap'] is not None:
+				group['gap']=max(group['gap'] or 0,r['gap'])
+		return sorted(groups.values(),key=lambda g: -g['wall time'])
+
+	## Write the records in a CSV file, one line per solve.
+	# @param filePath Path to the CSV file.
+	def writeCsv(self,filePath):
+		with self._lock:
+			records=list(self.records)
+		with open(filePath,'w',newline='') as file:
+			writer=csv.writer(file)
+			writer.writerow(ProfilingSolver.fields)
+			for r in records:
+				writer.writerow(['' if r[f] is None else r[f] for f in ProfilingSolver.fields])
+
+	## @var records
+	# List of the records of the solves, dictionaries with the fields of ProfilingSolver.fields, None if not available.
+	## @var _solver
+	# Profiled solver.
+	## @var _iteration
+	# List with the iteration of the system, shared by the clones.
+	## @var _lock
+	# Lock protecting the records.
+	## @var _acting
+	# Layer and agent acting when the solver was cloned, used for the solves of the clone in other threads.
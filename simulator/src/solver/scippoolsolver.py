@@ -0,0 +1,211 @@
+#@package scippoolsolver
+#Class to solve a model using a pool of persistent SCIP processes.
+#@version 1.0
+
+import subprocess, threading, atexit, os, queue, time
+
+from .solver import Solver
+from .scipsolver import ScipSolver
+
+## Interactive SCIP process kept alive between the solves and fed with commands through its standard input.
+class ScipWorker:
+    ## Prefix of the file name read to detect the end of a batch of commands.
+    # SCIP answers "file <...> not found" when all the previous commands are completed.
+    sentinel='scipworker-sentinel-'
+    ## Command reading a missing file, the answer of the process naming the file.
+    sentinelCommand='read %s'
+    ## Margin in seconds added to the time limit of SCIP before a worker is considered stuck.
+    timeoutMargin=60
+
+    ## Constructor.
+    # @param scipBin Path to the SCIP binary.
+    # @param cwd Working directory of the process.
+    # @param timeLimit Time limit in seconds.
+    def __init__(self,scipBin,cwd="",timeLimit=0):
+        self._batches=0
+        self._process=subprocess.Popen([scipBin],stdin=subprocess.PIPE,stdout=subprocess.PIPE,stderr=subprocess.STDOUT,
+                                       cwd=cwd if cwd != "" else None,universal_newlines=True,bufsize=1)
+        self._lines=queue.Queue()
+        self._reader=threading.Thread(target=self._read,daemon=True)
+        self._reader.start()
+        if timeLimit > 0:
+            self.execute(['set limits time %s'%timeLimit],ScipWorker.timeoutMargin)
+
+    ## Check if the process is still running.
+    # @return True if the process is alive.
+    def isAlive(self):
+        return self._process.poll() is None
+
+    ## Execute a list of commands and wait for their completion.
+    # @param commands List of SCIP interactive shell commands.
+    # @param timeout Maximum time in seconds to wait for the completion, None to wait without limit.
+    # @return List of output lines, None if the process died or did not complete the commands in time.
+    def execute(self,commands,timeout=None):
+        self._batches+=1
+        token='%s%s'%(ScipWorker.sentinel,self._batches)
+        try:
+            self._process.stdin.write('\n'.join(commands+[self.sentinelCommand%token])+'\n')
+            self._process.stdin.flush()
+        except (IOError,OSError):
+            return None
+
+        output=[]
+        deadline=time.time()+timeout if timeout is not None else None
+        while True:
+            try:
+                line=self._lines.get(timeout=max(0,deadline-time.time()) if deadline is not None else None)
+            except queue.Empty:
+                return None
+            if line is None:
+                return None
+            if token in line:
+                return output
+            output.append(line)
+
+    ## Read the output of the process line by line, None marking its end.
+    def _read(self):
+        for line in iter(self._process.stdout.readline,''):
+            self._lines.put(line)
+        self._lines.put(None)
+
+    ## Stop the process.
+    def terminate(self):
+        if self.isAlive():
+            try:
+                self._process.stdin.write('quit\n')
+                self._process.stdin.flush()
+                self._process.wait(5)
+            except (IOError,OSError,subprocess.TimeoutExpired):
+                self._process.kill()
+                self._process.wait()
+        try:
+            self._process.stdin.close()
+        except (IOError,OSError):
+            pass
+        self._reader.join(5)
+        self._process.stdout.close()
+
+    ## @var _batches
+    # Number of batches of commands sent to the process.
+    ## @var _process
+    # SCIP process.
+    ## @var _lines
+    # Queue of the output lines of the process, None once the output is closed.
+    ## @var _reader
+    # Thread filling the queue of the output lines.
+
+## Solver using a pool of long-lived SCIP processes instead of one process per solve.
+# All the workers run in the working directory of the pool and the problems are given by the paths of their files,
+# such that any idle worker solves the problems of any folder.
+class ScipPoolSolver(ScipSolver):
+    ## Constructor.
+    # @param scipBin Path to the SCIP binary.
+    # @param lp Binary equal to True if the solver writes the LP problem file.
+    # @param timeLimit Time limit in seconds
+    # @param maxTrials Maximum calling trials of the solver.
+    # @param maxWorkers Maximum number of SCIP processes alive at the same time.
+    def __init__(self,scipBin='../scip',lp=False,timeLimit=5*60,maxTrials=2,maxWorkers=1):
+        ScipSolver.__init__(self,scipBin,lp,timeLimit,maxTrials)
+        self.maxWorkers=max(1,maxWorkers)
+        self._idleWorkers=[]
+        self._workersCount=0
+        self._condition=threading.Condition()
+        self._cwd=os.getcwd()
+        atexit.register(self.close)
+
+    def solve(self,model,solution,cwd=""):
+        Solver.solve(self,model,solution)
+        start=self._warmStartFile(solution,cwd)
+        self._removeOutputs(solution,cwd)
+
+        # Call a worker with the absolute paths of the files
+        folder=os.path.abspath(cwd if cwd != "" else ".")
+        self.lastOutput=self._execute(self._problemCommands(model,solution,start,folder),self._cwd,model)
+        self._readSolution(model,solution,cwd,start is not None)
+
+    ## Execute SCIP commands with a worker of the pool.
+    # A worker which does not complete the commands within the time limit of each solve plus a margin is stopped.
+    # @param commands List of commands.
+    # @param cwd Working directory, always the one of the pool.
+    # @param model Description of the models solved for the error messages.
+    # @return Output of SCIP.
+    def _execute(self,commands,cwd,model):
+        commands=['set presolving maxrounds %s'%(0 if self.noPresolve else -1)]+commands+['free']
+        self.debugInfo="\tCommands: %s\n"%'; '.join(commands)
+        timeout=None
+        if self.timeLimit > 0:
+            timeout=(self.timeLimit+ScipWorker.timeoutMargin)*max(1,commands.count('opt'))
+
+        output=None
+        trial=0
+        while output is None and trial<self.maxTrials:
+            worker=self._acquire()
+            output=worker.execute(commands,timeout)
+            self._release(worker,output is not None)
+            trial+=1
+
+        # Check return
+        if output is None:
+            raise Exception('Error calling SCIP with the model \"'+ model + '\".\n\tCommands : '+ '; '.join(commands))
+        return ''.join(output)
+
+    def _commonFolder(self,folders):
+        return self._cwd
+
+    ## Terminate all the idle workers.
+    def close(self):
+        with self._condition:
+            for w in self._idleWorkers:
+                w.terminate()
+            self._workersCount-=len(self._idleWorkers)
+            self._idleWorkers=[]
+            self._condition.notify_all()
+
+    ## Get an idle worker, starting one or waiting for one if the pool is full.
+    # @return Worker.
+    def _acquire(self):
+        with self._condition:
+            while True:
+                # Reuse an idle worker
+                if len(self._idleWorkers) > 0:
+                    w=self._idleWorkers.pop()
+                    if w.isAlive():
+                        return w
+                    w.terminate()
+                    self._workersCount-=1
+                elif self._workersCount < self.maxWorkers:
+                    self._workersCount+=1
+                    break
+                else:
+                    self._condition.wait()
+
+        try:
+            return ScipWorker(self._scip,self._cwd,self.timeLimit)
+        except Exception:
+            with self._condition:
+                self._workersCount-=1
+                self._condition.notify()
+            raise
+
+    ## Give back a worker to the pool.
+    # @param worker Worker.
+    # @param healthy False if the worker failed and must be stopped.
+    def _release(self,worker,healthy=True):
+        with self._condition:
+            if healthy and worker.isAlive():
+                self._idleWorkers.append(worker)
+            else:
+                worker.terminate()
+                self._workersCount-=1
+            self._condition.notify()
+
+    ## @var maxWorkers
+    # Maximum number of SCIP processes alive at the same time.
+    ## @var _idleWorkers
+    # List of workers waiting for a problem.
+    ## @var _workersCount
+    # Number of workers alive, idle or busy.
+    ## @var _condition
+    # Condition protecting the pool.
+    ## @var _cwd
+    # Working directory of the workers.
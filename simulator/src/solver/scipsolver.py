@@ -2,105 +2,242 @@
 #Class to solve a model using SCIP and ZIMPL.
 #@version 1.0
 
-import re, os
+import re, os, threading
 
 from .solver import Solver
+from .solution import Solution
 
 class ScipSolver(Solver):
+    ## Regular expression matching the number of branch-and-bound nodes in the SCIP output.
+    nodesRegex=re.compile(r'^\s*Solving Nodes\s*:\s*(\d+)',re.M)
+    ## Regular expression matching the start of the output of a problem read by SCIP.
+    problemRegex=re.compile(r'^(?=read problem <)',re.M)
+    ## Regular expressions matching the statistics of the SCIP output, the last one being the number of LP iterations.
+    statisticsRegex={
+        'solving time':re.compile(r'^\s*Solving Time \(sec\)\s*:\s*([\d.]+)',re.M),
+        'presolving time':re.compile(r'^\s*Presolving Time\s*:\s*([\d.]+)',re.M),
+        'gap':re.compile(r'^\s*Gap\s*:\s*([\d.]+|infinite)',re.M)
+    }
+    ## Regular expression matching the number of iterations of the LP algorithms in the statistics displayed by SCIP.
+    lpIterationsRegex=re.compile(r'^\s*(?:primal|dual|barrier) LP\s*:\s*\S+\s+\d+\s+(\d+)',re.M)
+
     ## Constructor.
     # @param scipBin Path to the SCIP binary.
     # @param lp Binary equal to True if the solver writes the LP problem file.
     # @param timeLimit Time limit in seconds
     # @param maxTrials Maximum calling trials of the solver.
     def __init__(self,scipBin='../scip',lp=False,timeLimit=5*60,maxTrials=2):
-        self._sol={}
+        self._sol=Solution()
         self.lp=lp
         self._scip=scipBin
         self.timeLimit=timeLimit
         self.maxTrials=max(1,maxTrials)
         self.noPresolve=False
+        self.warmStart=False
+        self.statistics=False
+        self.lastOutput=""
+        self._nodesStatistics={}
+        self._lock=threading.Lock()
 
     def solve(self,model,solution,cwd=""):
         Solver.solve(self,model,solution)
+        start=self._warmStartFile(solution,cwd)
+        self._removeOutputs(solution,cwd)
+
+        # Call the solver
+        self.lastOutput=self._execute(self._problemCommands(model,solution,start),cwd,model)
+        self._readSolution(model,solution,cwd,start is not None)
+
+    ## Solve independent problems in sequence within a single SCIP process.
+    # SCIP changes to the folder of a ZIMPL model before reading it, such that the problems may be in different folders.
+    def solveMany(self,problems):
+        if len(problems) == 0:
+            return []
+        folders=[os.path.abspath(cwd if cwd != "" else ".") for model,solution,cwd in problems]
+        base=self._commonFolder(folders)
+
+        # Create the commands to solve the problems in sequence
+        solvers=[]
+        starts=[]
+        commands=[]
+        for (model,solution,cwd),folder in zip(problems,folders):
+            solver=self.clone()
+            Solver.solve(solver,model,solution)
+            start=solver._warmStartFile(solution,cwd)
+            solver._removeOutputs(solution,cwd)
+            commands.extend(solver._problemCommands(model,solution,start,os.path.relpath(folder,base))+['free'])
+            solvers.append(solver)
+            starts.append(start)
+
+        # Call the solver and split its output per problem
+        self.lastOutput=self._execute(commands,base,', '.join(model for model,solution,cwd in problems))
+        outputs=ScipSolver.problemRegex.split(self.lastOutput)[1:]
+        if len(outputs) != len(problems):
+            outputs=[self.lastOutput]*len(problems)
+
+        for solver,(model,solution,cwd),start,output in zip(solvers,problems,starts,outputs):
+            solver.debugInfo=self.debugInfo
+            solver.lastOutput=output
+            solver._readSolution(model,solution,cwd,start is not None)
+        return solvers
+
+    def isFeasible(self):
+        return self._sol.feasible
+
+    def isOptimal(self):
+        optimal=(self._sol.status.find("optimal") >=0)
+        if not optimal:
+            self.debugInfo+="\tSolution status: %s\n"%self._sol.status
+        return optimal
+
+    def objectiveValue(self):
+        return self._sol.objective
+
+    def variableValue(self,variableName='x'):
+        return self._sol.value(variableName)
+
+    def variableVectorValue(self,maxIndex,variablePrefix='x#',minIndex=0,variableSuffix=''):
+        values=self._sol.vector(maxIndex,variablePrefix,minIndex,variableSuffix)
+        if values is None:
+            values=Solver.variableVectorValue(self,maxIndex,variablePrefix,minIndex,variableSuffix)
+        return values
+
+    def variableMatrixValue(self,rows,maxIndex,variablePrefix='x#',minIndex=0):
+        values=self._sol.matrix(rows,maxIndex,variablePrefix,minIndex)
+        if values is None:
+            values=Solver.variableMatrixValue(self,rows,maxIndex,variablePrefix,minIndex)
+        return values
+
+    def lastStatistics(self):
+        statistics={}
+        for key,regex in ScipSolver.statisticsRegex.items():
+            match=regex.search(self.lastOutput)
+            if match:
+                statistics[key]=float('inf') if match.group(1) == 'infinite' else float(match.group(1))
+        match=ScipSolver.nodesRegex.search(self.lastOutput)
+        if match:
+            statistics['nodes']=int(match.group(1))
+        iterations=ScipSolver.lpIterationsRegex.findall(self.lastOutput)
+        if len(iterations) > 0:
+            statistics['lp iterations']=sum(map(int,iterations))
+        return statistics
+
+    def report(self):
+        if not self.warmStart:
+            return ""
 
-        # Create the cmd to solve the problem
+        text="Warm start branch-and-bound nodes:"
+        with self._lock:
+            nodesStatistics=dict((model,list(statistics)) for model,statistics in self._nodesStatistics.items())
+        for model in sorted(nodesStatistics):
+            coldSolves,coldNodes,warmSolves,warmNodes=nodesStatistics[model]
+            text+="\n\t%s: %s cold solve(s) with %.1f nodes on average, %s warm solve(s) with %.1f nodes on average" % (model,
+                coldSolves,coldNodes/max(1,coldSolves),warmSolves,warmNodes/max(1,warmSolves))
+        return text
+
+    ## Get the SCIP commands solving a problem.
+    # @param model Model file.
+    # @param solution Target solution file.
+    # @param start Start solution file, None if there is no warm start.
+    # @param folder Folder of the files relatively to the working directory of SCIP.
+    # @return List of commands.
+    def _problemCommands(self,model,solution,start=None,folder=""):
+        commands=['read %s'%os.path.join(folder,model)]
+        if start is not None:
+            commands.append('read %s'%os.path.join(folder,start))
+        if self.lp:
+            commands.append('write problem %s'%os.path.join(folder,solution+".lp"))
+        commands.append('opt')
+        if self.statistics:
+            commands.append('display statistics')
+        commands.append('write solution %s'%os.path.join(folder,solution))
+        return commands
+
+    ## Get the working directory of SCIP for problems in several folders.
+    # @param folders List of the absolute paths of the folders.
+    # @return Absolute path of the working directory.
+    def _commonFolder(self,folders):
+        return os.path.commonpath(folders)
+
+    ## Execute SCIP commands in a new SCIP process.
+    # @param commands List of commands.
+    # @param cwd Working directory.
+    # @param model Description of the models solved for the error messages.
+    # @return Output of SCIP.
+    def _execute(self,commands,cwd,model):
         scipCmd = self._scip
         if self.timeLimit > 0:
             scipCmd += ' -c "set limits time %s"'%self.timeLimit
         if self.noPresolve:
             scipCmd += ' -c "set presolving maxrounds 0"'
-        scipCmd+=' -c "read %s"'%model
-
-        if self.lp:
-            lpFile=solution+".lp"
-            scipCmd+=' -c "write problem %s"' % lpFile
-            if os.path.exists('%s/%s'%(cwd,lpFile)):
-                os.remove('%s/%s'%(cwd,lpFile))
-        scipCmd+=' -c "opt" -c "write solution %s" -c "q"'%solution
-
-        # Call the solver
-        solutionFile='%s/%s'%(cwd,solution)
-        if os.path.exists(solutionFile):
-            os.remove(solutionFile)
+        scipCmd+=''.join(' -c "%s"'%c for c in commands)+' -c "q"'
         self.debugInfo="\tCommand: %s\n"%scipCmd
 
         retCode=-1
+        output=""
         trial=0
         while retCode!=0 and trial<self.maxTrials:
-            retCode=Solver.silentCall(self,scipCmd,cwd)
+            retCode,output=Solver.outputCall(self,scipCmd,cwd)
             trial+=1
 
         # Check return
         if retCode != 0:
             raise Exception('Error calling SCIP with the model \"'+ model + '\".\n\tCommand : '+ scipCmd)
-        if not os.path.isfile('%s/%s'%(cwd,solution)):
-            raise Exception('Error when generating \"'+solution+'"\".\n\tCommand : '+ scipCmd)
-
-        # Parse the solution
-        self._sol=self._parseSolution(solutionFile)
+        return output
 
-    def isFeasible(self):
-        return self._sol['#$!feasible']
+    ## Remove the solution and problem files of a previous solve.
+    # @param solution Solution file.
+    # @param cwd Working directory.
+    def _removeOutputs(self,solution,cwd):
+        for file in [solution]+([solution+".lp"] if self.lp else []):
+            if os.path.exists('%s/%s'%(cwd,file)):
+                os.remove('%s/%s'%(cwd,file))
 
-    def isOptimal(self):
-        optimal=(self._sol['#$!status'].find("optimal") >=0)
-        if not optimal:
-            self.debugInfo+="\tSolution status: %s\n"%self._sol['#$!status']
-        return optimal
+    ## Parse the solution of a problem once SCIP completed.
+    # @param model Model file.
+    # @param solution Solution file.
+    # @param cwd Working directory.
+    # @param warm True if the solve was warm started.
+    def _readSolution(self,model,solution,cwd,warm):
+        solutionFile='%s/%s'%(cwd,solution)
+        if not os.path.isfile(solutionFile):
+            raise Exception('Error when generating \"'+solution+'"\".\n'+self.debugInfo)
+        self._sol=self._parseSolution(solutionFile)
+        self._recordNodes(model,warm)
 
-    def objectiveValue(self):
-        return self._sol['#$!obj']
+    ## Move the previous solution of a problem to a start solution file if the warm start is active.
+    # @param solution Solution file of the problem.
+    # @param cwd Working directory.
+    # @return Name of the start solution file, None if there is no warm start.
+    def _warmStartFile(self,solution,cwd):
+        solutionFile='%s/%s'%(cwd,solution)
+        if not self.warmStart or not os.path.isfile(solutionFile):
+            return None
+        start=os.path.splitext(solution)[0]+'.start.sol'
+        os.replace(solutionFile,'%s/%s'%(cwd,start))
+        return start
 
-    def variableValue(self,variableName='x'):
-        v=0.0
-        try:
-            v=float(self._sol[variableName])
-        finally:
-            return v
+    ## Record the number of branch-and-bound nodes of the last solve from its output.
+    # @param model Model file.
+    # @param warm True if the solve was warm started.
+    def _recordNodes(self,model,warm):
+        match=ScipSolver.nodesRegex.search(self.lastOutput)
+        if match is None:
+            return
+        offset=2 if warm else 0
+        with self._lock:
+            statistics=self._nodesStatistics.setdefault(model,[0,0,0,0])
+            statistics[offset]+=1
+            statistics[offset+1]+=int(match.group(1))
 
     ## Parse the solution file.
     #@param filePath Path to the solution file.
+    #@return Solution.
     def _parseSolution(self,filePath):
-        dict={}
-        dict['#$!feasible']=False
-
-        with open(filePath, 'r') as file:
-            varRegex = re.compile('^(\S+)\s+(\S+)\s+\(.+\)')
-            statusRegex = re.compile('^solution status:\s+(\S+)\s+')
-            objRegex = re.compile('^objective value:\s+(\S+)\s+')
-            for line in file:
-                matchVar=varRegex.match(line)
-                if matchVar:
-                    dict[matchVar.group(1)]=matchVar.group(2)
-                elif statusRegex.match(line):
-                    dict['#$!status']=statusRegex.match(line).group(1)
-                elif objRegex.match(line):
-                    dict['#$!obj']=float(objRegex.match(line).group(1))
-                    dict['#$!feasible']=True
-        return dict
+        return Solution.parseScip(filePath)
 
     ## @var _sol
-    # Solution dictionary.
+    # Parsed solution.
     ## @var lp
     # Boolean, True if the solver writes the LP problem file.
     ## @var _scip
@@ -111,3 +248,13 @@ class ScipSolver(Solver):
     # Maximum calling trials of the solver.
     ## @var noPresolve
     # Boolean, True if deactivate the presolve.
+    ## @var warmStart
+    # Boolean, True if the previous solution of a problem is given to SCIP as a starting solution.
+    ## @var statistics
+    # Boolean, True if SCIP displays its statistics after each solve, giving the number of LP iterations.
+    ## @var lastOutput
+    # Output of SCIP during the last solve.
+    ## @var _nodesStatistics
+    # Dictionary "model - [cold solves, cold nodes, warm solves, warm nodes]", shared by the clones.
+    ## @var _lock
+    # Lock protecting the statistics shared by the clones.
@@ -0,0 +1,202 @@
+##@package solution
+#@author Sebastien MATHIEU
+
+import re
+
+import numpy
+
+## Values of the variables of a solution, indexed by prefix.
+# The ZIMPL variables are named as "prefix#index#index...". Their values are stored in one NumPy array
+# per prefix and number of indices such that the vectors and matrices of values are obtained as slices.
+# The variables absent from the solution files have a value of 0.
+class Solution:
+	## Maximum ratio between the size of an array and its number of values stored in the solution file.
+	maxDensity=64
+	## Regular expression splitting a variable name in its prefix and its integer indices.
+	nameRegex=re.compile(r'(.+?)((?:#(?:0|[1-9][0-9]*))+)$')
+	## Regular expression matching the variables of a SCIP solution file as (prefix, indices, value).
+	lineRegex=re.compile(r'^(\S+?)((?:#(?:0|[1-9][0-9]*))*)[ \t]+(\S+)[ \t]+\(',re.M)
+	## Regular expression matching the status of a SCIP solution file.
+	statusRegex=re.compile(r'^solution status:\s+(\S+)',re.M)
+	## Regular expression matching the objective value of a SCIP solution file.
+	objectiveRegex=re.compile(r'^objective value:\s+(\S+)',re.M)
+
+	## Constructor.
+	# @param status Solution status.
+	# @param feasible True if the solution is feasible.
+	# @param objective Objective value.
+	def __init__(self,status='not parsed',feasible=False,objective=0.0):
+		self.status=status
+		self.feasible=feasible
+		self.objective=objective
+		self._arrays={}
+		self._others={}
+
+	## Store the values of the variables.
+	# @param names Names of the variables.
+	# @param values Values of the variables.
+	def setValues(self,names,values):
+		entries=[]
+		for name,value in zip(names,values):
+			match=Solution.nameRegex.match(name)
+			entries.append(match.groups()+(value,) if match else (name,'',value))
+		self._store(entries)
+
+	## Get the value of a variable.
+	# @param name Name of the variable.
+	# @return Value, 0 if not found.
+	def value(self,name):
+		key,indices=Solution._split(name)
+		if key is None:
+			return self._others.get(name,0.0)
+		array=self._arrays.get(key)
+		if array is None:
+			return self._others.get(name,0.0)
+		if any(i >= s for i,s in zip(indices,array.shape)):
+			return 0.0
+		return float(array[indices])
+
+	## Get a vector of values.
+	# @param maxIndex Maximum index.
+	# @param prefix Prefix of the variables. For instance : 'x#' becomes 'x#0','x#1',...
+	# @param minIndex Minimum index.
+	# @param suffix Suffix of the variables appended after the index number.
+	# @return List of values, None if the variables are not stored in an array.
+	def vector(self,maxIndex,prefix='x#',minIndex=0,suffix=''):
+		key,indices=Solution._split(prefix+'0'+suffix)
+		if key is None or minIndex < 0:
+			return None
+		position=prefix.count('#')-key[0].count('#')-1
+		if position < 0:
+			return None
+		array=self._arrays.get(key)
+		if array is None:
+			return None if len(self._others) > 0 else [0.0]*max(0,maxIndex-minIndex+1)
+
+		values=numpy.zeros(max(0,maxIndex-minIndex+1))
+		if all(i < s for p,(i,s) in enumerate(zip(indices,array.shape)) if p != position):
+			index=list(indices)
+			index[position]=slice(minIndex,maxIndex+1)
+			column=array[tuple(index)]
+			values[:len(column)]=column
+		return values.tolist()
+
+	## Get a matrix of values.
+	# @param rows List of row indices.
+	# @param maxIndex Maximum column index.
+	# @param prefix Prefix of the variables. For instance : 'x#' becomes 'x#0#0','x#0#1',...
+	# @param minIndex Minimum column index.
+	# @return List of the lists of values of each row, None if the variables are not stored in an array.
+	def matrix(self,rows,maxIndex,prefix='x#',minIndex=0):
+		key,indices=Solution._split(prefix+'0#0')
+		rows=numpy.asarray(list(rows))
+		if len(rows) == 0:
+			return []
+		if key is None or minIndex < 0 or rows.dtype.kind not in 'iu':
+			return None
+		array=self._arrays.get(key)
+		if array is None and len(self._others) > 0:
+			return None
+
+		values=numpy.zeros((len(rows),max(0,maxIndex-minIndex+1)))
+		if array is not None and all(i < s for i,s in zip(indices[:-2],array.shape)):
+			array=array[indices[:-2]]
+			valid=(rows >= 0) & (rows < array.shape[0])
+			block=array[rows[valid],minIndex:maxIndex+1]
+			values[valid,:block.shape[1]]=block
+		return values.tolist()
+
+	## Get the array of the values of the variables with the given prefix.
+	# @param prefix Prefix of the variables, without '#'.
+	# @param dimension Number of indices of the variables.
+	# @return NumPy array, empty if there is no such variable.
+	def array(self,prefix,dimension=1):
+		return self._arrays.get((prefix,dimension),numpy.zeros((0,)*dimension))
+
+	## Get the values of all the variables.
+	# @return List of pairs (name, value) of the nonzero variables.
+	def items(self):
+		items=list(self._others.items())
+		for (prefix,dimension),array in self._arrays.items():
+			for indices in zip(*numpy.nonzero(array)):
+				items.append(('#'.join([prefix]+[str(i) for i in indices]),float(array[indices])))
+		return items
+
+	## Store the values of the variables.
+	# @param entries List of tuples (prefix, indices, value) where the indices are given as "#i#j...", empty if none.
+	def _store(self,entries):
+		indexed={}
+		lastKey=None
+		for prefix,indices,value in entries:
+			if indices == '':
+				self._others[prefix]=float(value)
+				continue
+			key=(prefix,indices.count('#'))
+			if key != lastKey:
+				group=indexed.setdefault(key,([],[]))
+				lastKey=key
+			group[0].append(indices)
+			group[1].append(value)
+
+		for key,(indices,values) in indexed.items():
+			positions=numpy.array(''.join(indices).split('#')[1:],dtype=numpy.intp).reshape(len(values),key[1])
+			shape=tuple(positions.max(axis=0)+1)
+			if numpy.prod(shape,dtype=float) > Solution.maxDensity*len(values)+1024:
+				# Too sparse to be stored densely
+				for i,value in zip(indices,values):
+					self._others[key[0]+i]=float(value)
+				continue
+			array=numpy.zeros(shape)
+			array[tuple(positions.T)]=numpy.array(values,dtype=float)
+			self._arrays[key]=array
+
+	## Write the solution in the SCIP format, the variables with a value of 0 being omitted.
+	# @param filePath Path to the solution file.
+	def writeScip(self,filePath):
+		with open(filePath,'w') as file:
+			file.write('solution status: %s\n'%self.status)
+			if self.feasible:
+				file.write('objective value: %s\n'%self.objective)
+			for name,value in self.items():
+				if value != 0:
+					file.write('%s %s (obj:0)\n'%(name,value))
+
+	## Split a variable name in a key and its indices.
+	# @param name Name of the variable.
+	# @return Tuple (key, indices) with the key (prefix, number of indices), None if the name has no integer indices.
+	@staticmethod
+	def _split(name):
+		match=Solution.nameRegex.match(name)
+		if match is None:
+			return None,None
+		indices=tuple(int(i) for i in match.group(2).split('#')[1:])
+		return (match.group(1),len(indices)),indices
+
+	## Parse a SCIP solution file.
+	# @param filePath Path to the solution file.
+	# @return Solution.
+	@staticmethod
+	def parseScip(filePath):
+		solution=Solution('unknown')
+		with open(filePath, 'r') as file:
+			content=file.read()
+		match=Solution.statusRegex.search(content)
+		if match:
+			solution.status=match.group(1)
+		match=Solution.objectiveRegex.search(content)
+		if match:
+			solution.objective=float(match.group(1))
+			solution.feasible=True
+		solution._store(Solution.lineRegex.findall(content))
+		return solution
+
+	## @var status
+	# Solution status.
+	## @var feasible
+	# True if the solution is feasible.
+	## @var objective
+	# Objective value.
+	## @var _arrays
+	# Dictionary "(prefix, number of indices) - NumPy array of the values".
+	## @var _others
+	# Dictionary "name - value" of the variables not named with integer indices or too sparse to be stored in an array.
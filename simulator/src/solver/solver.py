@@ -1,7 +1,7 @@
 ##@package solver
 #@author Sebastien MATHIEU
 
-import subprocess, os
+import subprocess, os, copy
 
 ## Skeleton of a solver interface.
 class Solver(object):
@@ -17,6 +17,17 @@ class Solver(object):
 		self.lastModel=model
 		self.lastSolution=solution
 
+	## Solve independent problems.
+	# @param problems List of tuples (model file, target solution file, working directory).
+	# @return List of solvers, clones of this one, with the solution of each problem.
+	def solveMany(self,problems):
+		solvers=[]
+		for model,solution,cwd in problems:
+			solver=self.clone()
+			solver.solve(model,solution,cwd=cwd)
+			solvers.append(solver)
+		return solvers
+
 	## Raise an exception if method isOptimal returns false.
 	def checkOptimal(self):
 		if not self.isOptimal():
@@ -59,7 +70,37 @@ class Solver(object):
 		for i in range(minIndex,maxIndex+1):
 			l[i-minIndex]=self.variableValue(variablePrefix+str(i)+variableSuffix)
 		return l	
+
+	##Get a matrix of variable values.
+	#@param rows List of row indices.
+	#@param maxIndex Maximum column index.
+	#@param variablePrefix Prefix of the variables to get. For instance : 'x#' becomes 'x#0#0','x#0#1',...
+	#@param minIndex Minimum column index.
+	#@return List of the vectors of values of each row.
+	def variableMatrixValue(self,rows,maxIndex,variablePrefix='x#',minIndex=0):
+		return [self.variableVectorValue(maxIndex,'%s%s#'%(variablePrefix,r),minIndex) for r in rows]
 	
+	## Get a solver able to solve a problem concurrently with this one.
+	# The clone shares the configuration and the resources of the solver but has its own solution.
+	# The statistics shared by the clones are updated under a lock since the clones may solve concurrently.
+	#@return Solver.
+	def clone(self):
+		return copy.copy(self)
+
+	## Release the resources held by the solver.
+	def close(self):
+		pass
+
+	## Get the statistics of the last solve reported by the solver.
+	#@return Dictionary with the available entries among "solving time", "presolving time", "nodes", "gap" and "lp iterations".
+	def lastStatistics(self):
+		return {}
+
+	## Get a report on the solves performed.
+	#@return Text of the report, empty if there is nothing to report.
+	def report(self):
+		return ""
+
 	##Call a commend without display.
 	#@param command Command to execute
 	#@param cwd Working directory.
@@ -71,6 +112,15 @@ class Solver(object):
 			#retCode=subprocess.call(command, shell=True, cwd=cwd)
 		return retCode
 
+	##Call a command and capture its output.
+	#@param command Command to execute
+	#@param cwd Working directory.
+	#@return Tuple with the return status of the command and its output.
+	def outputCall(self,command,cwd=""):
+		process=subprocess.run(command,stdout=subprocess.PIPE,stderr=subprocess.STDOUT,shell=True,cwd=cwd if cwd != "" else None,
+							universal_newlines=True,errors='replace')
+		return process.returncode,process.stdout
+
 	## @var lastModel
 	# Last model used by the solve method.
 	## @var lastSolution
@@ -0,0 +1,187 @@
+##@package templates
+# Model templates: the structure of a Python formulation is compiled once and only its data-dependent values are updated per solve.
+#@author Sebastien MATHIEU
+
+import copy, threading
+
+import numpy
+
+from . import formulations
+
+## Value of a formulation parameter, i.e. a number read from the data files which changes between the solves.
+# The parameter is tracked through the negation and the multiplication by a constant such that the compiled program
+# knows which of its bounds, right-hand sides, costs and coefficients are equal to factor*parameter.
+# Any other arithmetic operation raises an exception since its result could not be updated.
+class Parameter(float):
+	## Constructor.
+	# @param value Value.
+	# @param key Key of the parameter.
+	# @param factor Factor applied to the parameter.
+	def __new__(cls,value,key,factor=1.0):
+		parameter=float.__new__(cls,value)
+		parameter.key=key
+		parameter.factor=factor
+		return parameter
+
+	def __neg__(self):
+		return Parameter(-float(self),self.key,-self.factor)
+
+	def __mul__(self,other):
+		if isinstance(other,Parameter) or not isinstance(other,(int,float)):
+			return NotImplemented
+		return Parameter(float(self)*other,self.key,self.factor*other)
+
+	__rmul__=__mul__
+
+	def _untracked(self,*args):
+		raise Exception('Parameter %s used in an operation which cannot be tracked by a model template.'%(self.key,))
+
+	__add__=__radd__=__sub__=__rsub__=__truediv__=__rtruediv__=__abs__=_untracked
+
+	## @var key
+	# Key of the parameter.
+	## @var factor
+	# Factor applied to the parameter.
+
+## Linear program compiled in NumPy arrays with the constraints matrix in the compressed sparse row format.
+class CompiledProgram:
+	## Arrays of the values which may depend on the parameters.
+	targets=['lower','upper','costs','rowLower','rowUpper','data']
+
+	## Constructor.
+	# @param lp Linear program, the values depending on the parameters being Parameter instances.
+	def __init__(self,lp):
+		self.maximize=lp.maximize
+		self.names=lp.names
+		self.integrality=numpy.array(lp.integrality)
+		self.lower=numpy.array(lp.lower,dtype=float)
+		self.upper=numpy.array(lp.upper,dtype=float)
+		self.costs=numpy.array(lp.costs,dtype=float)
+		self.rowLower=numpy.array(lp.rowLower,dtype=float)
+		self.rowUpper=numpy.array(lp.rowUpper,dtype=float)
+
+		# Sort the triplets by row and column
+		rows=numpy.array(lp.rows,dtype=numpy.intp)
+		columns=numpy.array(lp.columns,dtype=numpy.intp)
+		order=numpy.lexsort((columns,rows))
+		self.indptr=numpy.zeros(lp.constraintsCount()+1,dtype=numpy.intp)
+		numpy.cumsum(numpy.bincount(rows,minlength=lp.constraintsCount()),out=self.indptr[1:])
+		self.indices=columns[order]
+		self.data=numpy.array(lp.coefficients,dtype=float)[order]
+		positions=numpy.empty(len(order),dtype=numpy.intp)
+		positions[order]=numpy.arange(len(order))
+
+		# Values depending on the parameters
+		self.parameterKeys=[]
+		self.marks={}
+		keyIndex={}
+		for target,values in zip(CompiledProgram.targets,[lp.lower,lp.upper,lp.costs,lp.rowLower,lp.rowUpper,lp.coefficients]):
+			marked=[(i,keyIndex.setdefault(v.key,len(keyIndex)),v.factor) for i,v in enumerate(values) if isinstance(v,Parameter)]
+			if len(marked) > 0:
+				indices,keys,factors=zip(*marked)
+				indices=numpy.array(indices,dtype=numpy.intp)
+				self.marks[target]=(positions[indices] if target == 'data' else indices,numpy.array(keys,dtype=numpy.intp),numpy.array(factors,dtype=float))
+		self.parameterKeys=sorted(keyIndex,key=keyIndex.get)
+
+	## Get the number of variables.
+	# @return Number of variables.
+	def variablesCount(self):
+		return len(self.names)
+
+	## Get the number of constraints.
+	# @return Number of constraints.
+	def constraintsCount(self):
+		return len(self.rowLower)
+
+	## Get the program for the given values of the parameters.
+	# The structure is shared with the compiled program, only the arrays depending on the parameters are copied.
+	# @param parameters Dictionary "parameter key - value".
+	# @return Compiled program.
+	def instantiate(self,parameters):
+		values=numpy.array([parameters[k] for k in self.parameterKeys],dtype=float)
+		program=copy.copy(self)
+		for target,(positions,keys,factors) in self.marks.items():
+			array=getattr(self,target).copy()
+			array[positions]=factors*values[keys]
+			setattr(program,target,array)
+		return program
+
+	## @var maximize
+	# True if the objective is maximized.
+	## @var names
+	# Name of each variable.
+	## @var integrality
+	# 1 for each integer variable, 0 otherwise.
+	## @var lower
+	# Lower bound of each variable.
+	## @var upper
+	# Upper bound of each variable.
+	## @var costs
+	# Objective coefficient of each variable.
+	## @var rowLower
+	# Lower bound of each constraint.
+	## @var rowUpper
+	# Upper bound of each constraint.
+	## @var indptr
+	# Index in CompiledProgram.indices of the first coefficient of each row, followed by the number of coefficients.
+	## @var indices
+	# Column index of each nonzero coefficient.
+	## @var data
+	# Value of each nonzero coefficient.
+	## @var parameterKeys
+	# Keys of the parameters.
+	## @var marks
+	# Dictionary "target array - (positions, parameter indices, factors)" of the values equal to factor*parameter.
+
+## Template of a model: its structure is compiled once per distinct structure data.
+class ModelTemplate:
+	## Maximum number of compiled structures kept per template.
+	maxPrograms=8
+
+	## Constructor.
+	# @param read Function reading an operation folder, returning a tuple (structure, parameters) where the parameters
+	# are a dictionary "key - value" of the numbers which change between the solves.
+	# @param build Function building the linear program from the structure and the parameters.
+	def __init__(self,read,build):
+		self.read=read
+		self.build=build
+		self.statistics={'compilations':0,'instantiations':0}
+		self._programs={}
+		self._lock=threading.Lock()
+
+	## Get the program of an operation folder, compiling its structure if not already done.
+	# @param cwd Operation folder.
+	# @return Compiled program.
+	def instantiate(self,cwd):
+		structure,parameters=self.read(cwd)
+		key=repr(structure)
+		with self._lock:
+			program=self._programs.get(key)
+			self.statistics['instantiations']+=1
+		if program is None:
+			program=CompiledProgram(self.build(structure,{k:Parameter(v,k) for k,v in parameters.items()}))
+			with self._lock:
+				self.statistics['compilations']+=1
+				if len(self._programs) >= ModelTemplate.maxPrograms:
+					self._programs.pop(next(iter(self._programs)))
+				self._programs[key]=program
+		return program.instantiate(parameters)
+
+	## @var read
+	# Function reading the structure and the parameters of an operation folder.
+	## @var build
+	# Function building the linear program from the structure and the parameters.
+	## @var statistics
+	# Dictionary with the number of compilations and instantiations.
+	## @var _programs
+	# Dictionary "structure representation - compiled program".
+	## @var _lock
+	# Lock protecting the compiled programs.
+
+## Templates indexed by the name of the corresponding ZIMPL model.
+# The models of the balance responsible parties are not templated since their bounds are obtained with min and max of the data.
+TEMPLATES={
+	'DSO-capaNeeds.zpl':ModelTemplate(formulations.readDsoCapaNeeds,formulations.buildDsoCapaNeeds),
+	'DSO-capaNeeds-multiperiod.zpl':ModelTemplate(formulations.readBaselinesFull,formulations.buildDsoCapaNeedsMultiperiod),
+	'DSO-operation.zpl':ModelTemplate(formulations.readBaselinesFull,formulations.buildDsoOperation)
+}
@@ -32,6 +32,9 @@ class SPBidRequest(BidRequest):
 # Sign convention is positive for production.
 # The reference is 0: min <= 0 <= max.
 class SPBid(Bid):
+    ## True for the obligation bids.
+    obligation=False
+    
     ## Constructor.
     # @param t Period.
     # @param id Identification number of the bid.
@@ -63,6 +66,9 @@ class SPBid(Bid):
     
 ## Single period obligation bid.
 class SPObligationBid(SPBid):
+    ## True for the obligation bids.
+    obligation=True
+    
     ## Constructor.
     # @param t Period.
     # @param id Identification number of the bid.
@@ -0,0 +1,134 @@
+##@package staging
+# Placement of the input files of the solver in the operation folder, skipping the copies and writes which would not change the files.
+#@author Sebastien MATHIEU
+
+import os, io, shutil, hashlib, threading
+from contextlib import contextmanager
+
+## Manager of the files placed in the operation folder.
+# The manager remembers the content hash and the status of each file it placed.
+# A file is placed again only if its content changes or if it has been modified or removed by someone else.
+class StagingManager:
+	## Constructor.
+	def __init__(self):
+		self.placed=0
+		self.skipped=0
+		self._files={}
+		self._sources={}
+		self._lock=threading.Lock()
+
+	## Place an immutable input file, by hard link if possible, by copy otherwise.
+	# @param src Source file.
+	# @param dst Destination file.
+	def stage(self,src,dst):
+		digest=self._sourceDigest(src)
+		if self._isUnchanged(dst,digest):
+			return
+
+		if os.path.lexists(dst):
+			os.remove(dst)
+		try:
+			os.link(src,dst)
+		except OSError:
+			shutil.copy2(src,dst)
+		if not os.path.isfile(dst):
+			raise Exception("Unable to copy %s to %s." % (src,dst))
+		self._record(dst,digest)
+
+	## Context manager giving a text buffer written to a file only if its content changed.
+	# Usage: with manager.write('file.dat') as file:
+	# @param path Path to the file.
+	@contextmanager
+	def write(self,path):
+		buffer=io.StringIO()
+		yield buffer
+		self.writeContent(path,buffer.getvalue())
+
+	## Write a text to a file if the file content differs.
+	# @param path Path to the file.
+	# @param content Text.
+	def writeContent(self,path,content):
+		digest=hashlib.sha1(content.encode()).hexdigest()
+		if self._isUnchanged(path,digest):
+			return
+
+		# Never write through a hard link to a source file
+		if os.path.isfile(path) and os.stat(path).st_nlink > 1:
+			os.remove(path)
+		with open(path,'w') as file:
+			file.write(content)
+		self._record(path,digest)
+
+	## Forget all the placed files.
+	def clear(self):
+		with self._lock:
+			self._files={}
+			self._sources={}
+
+	## Check if a file placed earlier still has the given content.
+	# Counts the skipped operation if so.
+	# @param path Path to the file.
+	# @param digest Content hash.
+	# @return True if the file is unchanged.
+	def _isUnchanged(self,path,digest):
+		with self._lock:
+			record=self._files.get(path)
+		if record is None or record[0] != digest or StagingManager._status(path) != record[1]:
+			return False
+		with self._lock:
+			self.skipped+=1
+		return True
+
+	## Record a placed file.
+	# @param path Path to the file.
+	# @param digest Content hash.
+	def _record(self,path,digest):
+		status=StagingManager._status(path)
+		with self._lock:
+			self._files[path]=(digest,status)
+			self.placed+=1
+
+	## Get the content hash of a source file, hashed again only if its status changed.
+	# @param src Source file.
+	# @return Content hash.
+	def _sourceDigest(self,src):
+		status=StagingManager._status(src)
+		if status is None:
+			raise Exception("Unable to copy %s, the file does not exist." % src)
+		with self._lock:
+			source=self._sources.get(src)
+		if source is not None and source[1] == status:
+			return source[0]
+
+		h=hashlib.sha1()
+		with open(src,'rb') as file:
+			h.update(file.read())
+		digest=h.hexdigest()
+		with self._lock:
+			self._sources[src]=(digest,status)
+		return digest
+
+	## Get the status of a file used to detect its modifications.
+	# @param path Path to the file.
+	# @return Tuple (size, modification time, inode), None if the file does not exist.
+	@staticmethod
+	def _status(path):
+		try:
+			s=os.stat(path)
+		except OSError:
+			return None
+		return (s.st_size,s.st_mtime_ns,s.st_ino)
+
+	## @var placed
+	# Number of files copied, linked or written.
+	## @var skipped
+	# Number of copies and writes skipped.
+	## @var _files
+	# Dictionary "path - (content hash, status)" of the placed files.
+	## @var _sources
+	# Dictionary "path - (content hash, status)" of the source files.
+	## @var _lock
+	# Lock protecting the dictionaries and the counters.
+
+## Staging manager of the simulator.
+manager=StagingManager()
@@ -6,6 +6,7 @@ import glob,os.path,shutil,csv,time,datetime
 from .agent.stateSystem import StateSystem
 from .agent.layer import Layer
 from .ephemerallayer import EphemeralLayer
+from .parallellayer import ParallelLayer
 from .dso import DSO
 from .tso import TSO
 from .retailer import Retailer
@@ -13,9 +14,13 @@ from .producer import Producer
 from .flexibilityplatform import FlexibilityPlatform
 from .interactionmodel import InteractionModel
 from .quantitativecriteria import QuantitativeCriteria
-from . import options,tools,xmlsolution
+from . import options,tools,staging,xmlsolution
 from .solver.scipsolver import ScipSolver
 from .solver.cplexsolver import CplexSolver
+from .solver.scippoolsolver import ScipPoolSolver
+from .solver.highssolver import HighsSolver
+from .solver.cachedsolver import CachedSolver
+from .solver.profilingsolver import ProfilingSolver
 
 ## Class that generates the system from a data folder.
 # The system class defines the following global data:
@@ -40,7 +45,7 @@ class System(StateSystem):
 	def __init__(self,dataFolder, maximumIterations=1000,outputSolutionFile="data.xml",convergenceTolerance=None):
 		if convergenceTolerance is None:
 			convergenceTolerance=options.EPS
-		StateSystem.__init__(self,maximumIterations=maximumIterations,accuracy=convergenceTolerance)
+		StateSystem.__init__(self,maximumIterations=maximumIterations,accuracy=convergenceTolerance,fullTrace=options.FULL_TRACE)
 		
 		self._dataFolder=dataFolder
 		self._outputSolutionFile=outputSolutionFile
@@ -50,14 +55,28 @@ class System(StateSystem):
 	def generate(self):
 		self._readGeneralData()
 		
-		# Instantiate solver
+		# Instantiate solver, the SCIP binary being next to the operation folder also for the solves in its subfolders
+		scipBin=os.path.abspath(options.SCIP_BIN if options.SCIP_BIN is not None else options.FOLDER+'/../scip')
 		if options.SOLVER == 'cplex':
-			self.data.general['solver']=CplexSolver(lp=options.DEBUG)
+			self.data.general['solver']=CplexSolver(scipBin=scipBin,lp=options.DEBUG,persistent=options.CPLEX_PERSISTENT)
 
 			if options.DEBUG:
 				tools.log("Solve using CPLEX.", options.LOG, options.PRINT_TO_SCREEN)
+		elif options.SOLVER == 'scippool':
+			self.data.general['solver']=ScipPoolSolver(scipBin,lp=options.DEBUG,maxWorkers=max(1,options.DSO_WORKERS,options.AGENT_WORKERS))
+		elif options.SOLVER == 'highs':
+			self.data.general['solver']=HighsSolver(scipBin,lp=options.DEBUG)
 		else:
-			self.data.general['solver']=ScipSolver(lp=options.DEBUG)
+			self.data.general['solver']=ScipSolver(scipBin,lp=options.DEBUG)
+		if isinstance(self.data.general['solver'],ScipSolver):
+			self.data.general['solver'].warmStart=options.WARM_START
+			self.data.general['solver'].statistics=options.PROFILING
+
+		if options.CACHE_FOLDER is not None:
+			self.data.general['solver']=CachedSolver(self.data.general['solver'],options.CACHE_FOLDER,options.CACHE_SIZE*1024*1024)
+
+		if options.PROFILING:
+			self.data.general['solver']=ProfilingSolver(self.data.general['solver'])
 
 		# Create the quantifier
 		quantifier=QuantitativeCriteria()
@@ -118,17 +137,17 @@ class System(StateSystem):
 		
 		# Optimization of the baselines
 		if self.data.general['interaction model'].accessRestriction.lower() == "dynamicbaseline":
-			self.layerList.append(Layer(self._retailers+self._producers, name="Baseline proposal"))
+			self.layerList.append(self._brpLayer("Baseline proposal"))
 			self.layerList.append(Layer([self._dso], name="Dynamic ranges computation"))
-			self.layerList.append(Layer(self._retailers+self._producers, name="Baseline optimization"))
+			self.layerList.append(self._brpLayer("Baseline optimization"))
 		else:
-			self.layerList.append(Layer(self._retailers+self._producers, name="Baseline optimization"))
+			self.layerList.append(self._brpLayer("Baseline optimization"))
 
 		# Determination of the flexibility needs
 		self.layerList.append(Layer([self._dso,self._tso], name="Flexibility needs"))
 		
 		# Flexibility offers
-		self.layerList.append(Layer(self._retailers+self._producers, name="Flexibility optimization"))
+		self.layerList.append(self._brpLayer("Flexibility optimization"))
 		
 		# Flexibility platform clearing
 		self.layerList.append(Layer([flexibilityPlatform],name="Flexibility platform clearing"))
@@ -137,7 +156,7 @@ class System(StateSystem):
 		self.layerList.append(Layer([self._dso,self._tso]+self._producers+self._retailers, name="Flexibility activation requesting"))
 		
 		# Create the second optimization layer
-		self.layerList.append(Layer(self._retailers+self._producers, name="Imbalance optimization")) 
+		self.layerList.append(self._brpLayer("Imbalance optimization")) 
 		
 		# Create the operation layer
 		self.layerList.append(Layer([self._dso], name="Operation"))
@@ -153,24 +172,55 @@ class System(StateSystem):
 		tic=time.time()
 		
 		tools.clearFolder(options.FOLDER)
+		staging.manager.clear()
 		self._prepareOperationFolder()
-		tools.safeCopy(self._dataFolder+System.pricesFile,options.FOLDER+'/'+System.pricesFile)
-		runningResult=StateSystem.run(self)
+		staging.manager.stage(self._dataFolder+System.pricesFile,options.FOLDER+'/'+System.pricesFile)
+		if options.PROFILING:
+			self.data.general['solver'].setIteration(0)
+		try:
+			runningResult=StateSystem.run(self)
+		finally:
+			self.data.general['solver'].close()
+		report=self.data.general['solver'].report()
+		if report != "":
+			tools.log(report, options.LOG, options.PRINT_TO_SCREEN)
+		if options.DEBUG:
+			tools.log("Staging: %s file(s) placed, %s copies or writes skipped." % (staging.manager.placed,staging.manager.skipped), options.LOG, options.PRINT_TO_SCREEN)
 		
 		self.data.general['time']=time.time()-tic
 		self.data.general['iterations']=self.iterations
 		
-		xmlsolution.export(self._outputSolutionFile,self.data,[self._dso,self._tso]+self._producers+self._retailers)
+		profiling=None
+		if options.PROFILING:
+			profiling=self.data.general['solver'].summary()
+			if options.PROFILING_CSV is not None:
+				self.data.general['solver'].writeCsv(options.PROFILING_CSV)
+		xmlsolution.export(self._outputSolutionFile,self.data,[self._dso,self._tso]+self._producers+self._retailers,profiling)
 		
 		return runningResult
 	
 	def hasConverged(self):
 		returnValue=StateSystem.hasConverged(self)
 		tools.log("\tMaximum difference : %s" % (self._maxDifference), options.LOG, options.PRINT_TO_SCREEN)
+		if options.DEBUG:
+			# Status variables preventing the convergence
+			for (actor,var),difference in sorted(self.contributions.items(),key=lambda c: -c[1]):
+				if difference > self.eps:
+					tools.log("\t\t%s of %s : %s" % (var,actor if actor is not None else "system",difference), options.LOG, options.PRINT_TO_SCREEN)
 		if returnValue == None:
 			tools.log("Iteration %s" % (self.iterations+1), options.LOG, options.PRINT_TO_SCREEN)
+			if options.PROFILING:
+				self.data.general['solver'].setIteration(self.iterations+1)
 		return returnValue
 	
+	## Create a layer of the retailers and producers, acting concurrently if options.AGENT_WORKERS is positive.
+	# @param name Name of the layer.
+	# @return Layer.
+	def _brpLayer(self,name):
+		if options.AGENT_WORKERS > 0:
+			return ParallelLayer(self._retailers+self._producers,name=name,workers=options.AGENT_WORKERS)
+		return Layer(self._retailers+self._producers,name=name)
+
 	## Prepare the operation folder.
 	# Creates it if needed and copy the models into it.
 	def _prepareOperationFolder(self):
@@ -182,7 +232,7 @@ class System(StateSystem):
 		for filename in os.listdir(MODEL_FOLDER):
 			file='%s/%s'%(MODEL_FOLDER,filename)
 			if os.path.isfile(file):
-				tools.safeCopy(file,'%s/%s'%(options.FOLDER,filename))
+				staging.manager.stage(file,'%s/%s'%(options.FOLDER,filename))
 			
 	## Read general data of the system. 
 	def _readGeneralData(self):
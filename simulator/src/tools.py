@@ -6,7 +6,7 @@
 #TODO clean with only necessary functions.
 
 import csv, glob
-import subprocess, os, errno, sys, shutil
+import subprocess, os, errno, sys, shutil, tempfile, atexit, signal
 from contextlib import contextmanager
 
 ## Locking mechanism.
@@ -106,7 +106,10 @@ def clearFolder(path, ext=""):
 	
 	# Remove the files
 	for f in fileList:
-		os.remove(f)
+		if os.path.isdir(f):
+			shutil.rmtree(f)
+		else:
+			os.remove(f)
 
 ##	Copy a file and check if the copy succeeded.
 # @param src Source.
@@ -127,3 +130,49 @@ def safeCopy(src,dst,maxChecks=3):
 	
 	# Maximum checks reached, raise error.
 	raise Exception("Unable to copy %s to %s." % (src,dst))
+
+## Create a private folder in a memory-backed file system, removed when the program exits.
+# The folders and files left by the processes which did not exit normally are removed as well.
+# @param root Folder of the memory-backed file system. If it does not exist, the temporary folder of the system is used.
+# @param prefix Prefix of the folder name, followed by the process id.
+# @return Path to the folder.
+def memoryFolder(root="/dev/shm", prefix="dsima-"):
+	if not os.path.isdir(root):
+		root=tempfile.gettempdir()
+
+	# Remove the folders and files of the dead processes
+	for path in glob.glob('%s/%s*'%(root,prefix)):
+		try:
+			pid=int(os.path.basename(path)[len(prefix):].split('-')[0].split('.')[0])
+		except ValueError:
+			continue
+		if processExists(pid):
+			continue
+		if os.path.isdir(path):
+			shutil.rmtree(path,True)
+		else:
+			try:
+				os.remove(path)
+			except FileNotFoundError:
+				pass # Removed by another process
+
+	# Create the folder and remove it at exit, also when terminated
+	folder=tempfile.mkdtemp(prefix='%s%s-'%(prefix,os.getpid()),dir=root)
+	atexit.register(shutil.rmtree,folder,True)
+	if signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+		signal.signal(signal.SIGTERM,lambda signum,frame: sys.exit(128+signum))
+	return folder
+
+## Check if a process is running.
+# @param pid Process id.
+# @return True if the process exists or if it cannot be checked.
+def processExists(pid):
+	if os.name != 'posix':
+		return True
+	try:
+		os.kill(pid,0)
+	except ProcessLookupError:
+		return False
+	except OSError:
+		pass # Process of another user
+	return True
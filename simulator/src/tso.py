@@ -5,7 +5,7 @@ import os,shutil, csv
 
 from .agent.stateAgent import StateAgent
 from .fsu import FSU
-from . import tools,options,xmlsolution
+from . import options,staging,xmlsolution
 
 ## Transmission system operator
 class TSO(StateAgent, FSU):
@@ -77,7 +77,7 @@ class TSO(StateAgent, FSU):
 			
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/'+TSO.needsFile)
+			staging.manager.stage(self._dataFile,options.FOLDER+'/'+TSO.needsFile)
 		else: # Rename instead of copy if debug
 			os.rename(self._dataFile,options.FOLDER+'/'+TSO.needsFile)
 		
@@ -97,7 +97,7 @@ class TSO(StateAgent, FSU):
 	def flexibilityEvaluation(self,data):
 		# Move the data file to the operation folder
 		if options.COPY:
-			tools.safeCopy(self._dataFile,options.FOLDER+'/'+TSO.needsFile)
+			staging.manager.stage(self._dataFile,options.FOLDER+'/'+TSO.needsFile)
 		else: # Rename instead of copy if debug
 			os.rename(self._dataFile,options.FOLDER+'/'+TSO.needsFile)
 		
@@ -112,11 +112,9 @@ class TSO(StateAgent, FSU):
 	## Define the flexibility needs.
 	# @param data Data.
 	def _flexibilityNeeds(self,data):
-		T=data.general['T']
 		for n in self.nodes:
-			for t in range(T):
-				data.general['R+'][n][t]+=data.personal[self.name]['R+'][t]
-				data.general['R-'][n][t]+=data.personal[self.name]['R-'][t]
+			data.general['R+'][n]+=data.personal[self.name]['R+']
+			data.general['R-'][n]+=data.personal[self.name]['R-']
 
 	## Get the data to display.
 	# @param data Data.
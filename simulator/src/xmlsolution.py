@@ -2,6 +2,7 @@
 #@author Sebastien MATHIEU
 
 import time,re,zlib,zipfile,decimal
+from xml.sax.saxutils import quoteattr
 from . import options
 
 ## Get the maximum value of an index.
@@ -53,18 +54,36 @@ def translate(symbol):
 		pass
 	return symbol
 
+## Convert the profiling summary of the solves to XML.
+# @param profiling List of dictionaries given by ProfilingSolver.summary.
+# @return String with the profiling section.
+def profiling2xml(profiling):
+	xmlContent='<profiling>\n'
+	for group in profiling:
+		xmlContent+='\t<solves agent=%s layer=%s model=%s>\n'%(quoteattr(group['agent']),quoteattr(group['layer']),quoteattr(group['model']))
+		xmlContent+='\t\t<data id="Solves">%s</data>\n' % group['solves']
+		for attr,title in [('wall time','Wall time'),('solving time','Solving time'),('presolving time','Presolving time'),('gap','Max. gap')]:
+			if group[attr] is not None:
+				xmlContent+='\t\t<data id="%s">%.5f</data>\n' % (title,group[attr])
+		for attr,title in [('nodes','Nodes'),('lp iterations','LP iterations')]:
+			if group[attr] is not None:
+				xmlContent+='\t\t<data id="%s">%s</data>\n' % (title,group[attr])
+		xmlContent+='\t</solves>\n'
+	xmlContent+='</profiling>\n'
+	return xmlContent
+
 ## Export the solution to a XML file.
 # @param xmlPath Path to the XML file.
 # @param data Data.
 # @param externs List of externs to the image which needs to output data. 
 # The externs should implement a method "xmlData" which takes the data structure as argument and returns a string with the data.
-def export(xmlPath,data,externs=[]):
+# @param profiling Profiling summary of the solves given by ProfilingSolver.summary, None to omit the profiling section.
+def export(xmlPath,data,externs=[],profiling=None):
 	#Fist create the xmlContent
 	xmlContent='<?xml version="1.0" encoding="ISO-8859-1" ?>\n<xml>\n'
 	
 	# Periods
 	T=data.general['T']
-	N=data.general['N']
 	xmlContent+='<periods>%s</periods>\n'%T	 
 	
 	# External elements
@@ -104,13 +123,7 @@ def export(xmlPath,data,externs=[]):
 	
 	# List of general time depedent attributes to aggregate from nodal data
 	for attr in ['R+','R-','S+','S-','A+','A-','U+','U-']:
-		values=[]
-		for t in range(T):
-			v=0.0
-			for n in range(N):
-				v+=data.general[attr][n][t]
-			values.append(v)			
-		xmlContent+='\t<timedata id="%s">%st</timedata>\n'%(translate(attr),floats2str(values))
+		xmlContent+='\t<timedata id="%s">%st</timedata>\n'%(translate(attr),floats2str(data.general[attr].total()))
 	
 	# Time graphs
 	# Prices
@@ -127,13 +140,7 @@ def export(xmlPath,data,externs=[]):
 	# Flexibility graph
 	xmlContent+='\t<timegraph id="fs" title="" ylabel="Power [MW]">\n'
 	for attr in ['R+','R-','S+','S-','A+','A-','U+','U-']:
-		values=[]
-		for t in range(T):
-			v=0.0
-			for n in range(N):
-				v+=data.general[attr][n][t]
-			values.append(v)
-		xmlContent+='\t\t<timegraphdata id="%s">%s</timegraphdata>\n'%(translate(attr),floats2str(values))
+		xmlContent+='\t\t<timegraphdata id="%s">%s</timegraphdata>\n'%(translate(attr),floats2str(data.general[attr].total()))
 	xmlContent+='\t</timegraph>\n'
 
 	xmlContent+='</general>\n'   
@@ -316,6 +323,10 @@ def export(xmlPath,data,externs=[]):
 		xmlContent+='\t</element>\n'
 
 	xmlContent+='</elements>\n'
+
+	# Profiling
+	if profiling is not None:
+		xmlContent+=profiling2xml(profiling)
 	
 	xmlContent+='</xml>'
 	